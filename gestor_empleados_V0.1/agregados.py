@@ -0,0 +1,105 @@
+# ==========================================================
+# Agregados por departamento mantenidos de forma incremental
+# ==========================================================
+# En vez de recorrer todos los empleados cada vez que se pide un informe,
+# se guardan por departamento: plantilla, suma de edades, recuento por
+# edad (para sacar mínimo, máximo e histograma) y recuento por tramos.
+# Cada alta, baja o modificación del repositorio los actualiza en O(1).
+from collections import Counter
+
+ANCHO_TRAMO = 10  # años por barra del histograma de edades
+
+
+def tramo_de(edad):
+    """Tramo de edad al que pertenece una edad (0-9 -> 0, 10-19 -> 10, ...)."""
+    return (edad // ANCHO_TRAMO) * ANCHO_TRAMO
+
+
+class AgregadoDepartamento:
+    """Estadísticas de un departamento."""
+    __slots__ = ("plantilla", "suma_edad", "edades", "tramos")
+
+    def __init__(self):
+        self.plantilla = 0
+        self.suma_edad = 0
+        self.edades = Counter()  # edad -> número de empleados
+        self.tramos = Counter()  # tramo -> número de empleados
+
+    @property
+    def edad_media(self):
+        return self.suma_edad / self.plantilla if self.plantilla else 0
+
+    # El número de edades distintas está acotado (~100), así que min/max son O(1)
+    @property
+    def edad_minima(self):
+        return min(self.edades) if self.edades else None
+
+    @property
+    def edad_maxima(self):
+        return max(self.edades) if self.edades else None
+
+    def sumar(self, edad, signo):
+        self.plantilla += signo
+        self.suma_edad += signo * edad
+        for contador, clave in ((self.edades, edad), (self.tramos, tramo_de(edad))):
+            contador[clave] += signo
+            if not contador[clave]:
+                del contador[clave]
+
+
+class AgregadosDepartamentos:
+    """
+    Agregados de todos los departamentos. Se suscribe a un
+    EmpleadoRepository y se mantiene al día con cada cambio.
+    """
+
+    def __init__(self, repositorio=None):
+        self._por_departamento = {}  # departamento -> AgregadoDepartamento
+        if repositorio is not None:
+            self.aplicar([(None, fila) for fila in repositorio.filas()])
+            repositorio.suscribir(self.aplicar)
+
+    def aplicar(self, cambios):
+        """Aplica una lista de cambios (anterior, nuevo) del repositorio."""
+        for anterior, nuevo in cambios:
+            if anterior is not None:
+                self._sumar(anterior, -1)
+            if nuevo is not None:
+                self._sumar(nuevo, +1)
+
+    def _sumar(self, fila, signo):
+        departamento, edad = fila[5], fila[3]
+        agregado = self._por_departamento.get(departamento)
+        if agregado is None:
+            agregado = self._por_departamento[departamento] = AgregadoDepartamento()
+        agregado.sumar(edad, signo)
+        if not agregado.plantilla:
+            del self._por_departamento[departamento]
+
+    # ---------- consultas (coste proporcional al número de departamentos) ----------
+    def __getitem__(self, departamento):
+        return self._por_departamento.get(departamento, AgregadoDepartamento())
+
+    def departamentos(self):
+        return list(self._por_departamento)
+
+    def plantilla_por_departamento(self):
+        """Número de empleados de cada departamento."""
+        return {dep: a.plantilla for dep, a in self._por_departamento.items()}
+
+    def total(self):
+        return sum(a.plantilla for a in self._por_departamento.values())
+
+    def recuento_edades(self):
+        """Número de empleados por edad, sumando todos los departamentos."""
+        total = Counter()
+        for agregado in self._por_departamento.values():
+            total.update(agregado.edades)
+        return total
+
+    def histograma_tramos(self):
+        """Número de empleados por tramo de edad, sumando todos los departamentos."""
+        total = Counter()
+        for agregado in self._por_departamento.values():
+            total.update(agregado.tramos)
+        return dict(sorted(total.items()))
@@ -0,0 +1,240 @@
+# ==========================================================
+# Almacén columnar de empleados (NumPy / pandas)
+# ==========================================================
+# En lugar de un objeto Python por empleado, cada campo se guarda en
+# una columna (array de NumPy). El departamento se guarda como código
+# entero de una categoría, igual que un pd.Categorical.
+#
+# Las filas ocupadas son siempre las primeras 'n': al borrar, la última
+# fila se mueve al hueco. Así los informes pueden leer las columnas
+# directamente (vistas [:n]) sin copiarlas.
+#
+# pandas solo se importa en las operaciones masivas (agregar_columnas y
+# dataframe), para no pagarlo al arrancar la aplicación.
+import numpy as np
+
+CAMPOS = ("id", "nombre", "apellidos", "edad", "correo", "departamento")
+CAMPOS_TEXTO = ("nombre", "apellidos", "correo")
+
+
+class FilaEmpleado:
+    """
+    Vista ligera de un empleado dentro del almacén.
+    Solo guarda el almacén y el id; el resto de campos se leen de las columnas.
+    Tiene los mismos atributos que Empleado, así el formulario la usa igual.
+    """
+    __slots__ = ("_almacen", "id")
+
+    def __init__(self, almacen, emp_id):
+        self._almacen = almacen
+        self.id = emp_id
+
+    nombre = property(lambda self: self._almacen.valor(self.id, "nombre"))
+    apellidos = property(lambda self: self._almacen.valor(self.id, "apellidos"))
+    edad = property(lambda self: self._almacen.valor(self.id, "edad"))
+    correo = property(lambda self: self._almacen.valor(self.id, "correo"))
+    departamento = property(lambda self: self._almacen.valor(self.id, "departamento"))
+
+    def valores(self):
+        """Tupla (id, nombre, apellidos, edad, correo, departamento)."""
+        return self._almacen.fila(self.id)
+
+    def __repr__(self):
+        return f"FilaEmpleado{self.valores()}"
+
+
+class AlmacenColumnar:
+    """Columnas de empleados con acceso O(1) por id."""
+
+    def __init__(self, capacidad=1024):
+        self._n = 0
+        self._ids = np.empty(capacidad, dtype=np.int64)
+        self._edades = np.empty(capacidad, dtype=np.int32)
+        self._codigos = np.empty(capacidad, dtype=np.int32)
+        self._textos = {campo: np.empty(capacidad, dtype=object) for campo in CAMPOS_TEXTO}
+        self.categorias = []   # código -> nombre de departamento
+        self._codigo_de = {}   # nombre de departamento -> código
+        self._fila_de = {}     # id -> posición en las columnas
+
+    # ---------- consultas ----------
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, emp_id):
+        return emp_id in self._fila_de
+
+    def ids(self):
+        """Ids en el orden de las columnas."""
+        return self._ids[:self._n].tolist()
+
+    def ids_entre(self, inicio, fin):
+        """Ids de las posiciones [inicio, fin) de las columnas."""
+        return self._ids[inicio:min(fin, self._n)].tolist()
+
+    def valor(self, emp_id, campo):
+        fila = self._fila_de[emp_id]
+        if campo == "id":
+            return emp_id
+        if campo == "edad":
+            return int(self._edades[fila])
+        if campo == "departamento":
+            return self.categorias[self._codigos[fila]]
+        return self._textos[campo][fila]
+
+    def fila(self, emp_id):
+        """Todos los campos de un empleado, en el orden de CAMPOS."""
+        return tuple(self.valor(emp_id, campo) for campo in CAMPOS)
+
+    def filas(self):
+        """Recorre todas las filas como tuplas, leyendo las columnas de golpe."""
+        n = self._n
+        departamentos = [self.categorias[c] for c in self._codigos[:n].tolist()]
+        return zip(self._ids[:n].tolist(), self._textos["nombre"][:n], self._textos["apellidos"][:n],
+                   self._edades[:n].tolist(), self._textos["correo"][:n], departamentos)
+
+    def codigo(self, departamento):
+        """Código de la categoría de un departamento (la crea si no existe)."""
+        codigo = self._codigo_de.get(departamento)
+        if codigo is None:
+            codigo = len(self.categorias)
+            self.categorias.append(departamento)
+            self._codigo_de[departamento] = codigo
+        return codigo
+
+    # ---------- altas, bajas y cambios ----------
+    def agregar(self, emp_id, nombre, apellidos, edad, correo, departamento):
+        self._asegurar_capacidad(1)
+        fila = self._n
+        self._ids[fila] = emp_id
+        self._edades[fila] = edad
+        self._codigos[fila] = self.codigo(departamento)
+        self._textos["nombre"][fila] = nombre
+        self._textos["apellidos"][fila] = apellidos
+        self._textos["correo"][fila] = correo
+        self._fila_de[emp_id] = fila
+        self._n += 1
+
+    def agregar_columnas(self, ids, nombres, apellidos, edades, correos, departamentos):
+        """Añade muchos empleados de golpe a partir de columnas (arrays o Series)."""
+        import pandas as pd
+
+        ids = np.asarray(ids, dtype=np.int64)
+        k = len(ids)
+        self._asegurar_capacidad(k)
+        inicio, fin = self._n, self._n + k
+
+        # Los departamentos se convierten a códigos con una sola pasada
+        codigos, unicos = pd.factorize(pd.Series(departamentos), sort=False)
+        traduccion = np.array([self.codigo(d) for d in unicos], dtype=np.int32)
+
+        self._ids[inicio:fin] = ids
+        self._edades[inicio:fin] = np.asarray(edades, dtype=np.int32)
+        self._codigos[inicio:fin] = traduccion[codigos] if k else codigos
+        self._textos["nombre"][inicio:fin] = np.asarray(nombres, dtype=object)
+        self._textos["apellidos"][inicio:fin] = np.asarray(apellidos, dtype=object)
+        self._textos["correo"][inicio:fin] = np.asarray(correos, dtype=object)
+        self._fila_de.update(zip(ids.tolist(), range(inicio, fin)))
+        self._n = fin
+
+    def escribir(self, emp_id, campo, valor):
+        fila = self._fila_de[emp_id]
+        if campo == "edad":
+            self._edades[fila] = valor
+        elif campo == "departamento":
+            self._codigos[fila] = self.codigo(valor)
+        else:
+            self._textos[campo][fila] = valor
+
+    def cambiar_id(self, emp_id, nuevo_id):
+        fila = self._fila_de.pop(emp_id)
+        self._ids[fila] = nuevo_id
+        self._fila_de[nuevo_id] = fila
+
+    def eliminar(self, emp_id):
+        """Quita un empleado moviendo la última fila a su hueco (O(1))."""
+        fila = self._fila_de.pop(emp_id)
+        ultima = self._n - 1
+        if fila != ultima:
+            self._ids[fila] = self._ids[ultima]
+            self._edades[fila] = self._edades[ultima]
+            self._codigos[fila] = self._codigos[ultima]
+            for columna in self._textos.values():
+                columna[fila] = columna[ultima]
+            self._fila_de[int(self._ids[fila])] = fila
+        for columna in self._textos.values():
+            columna[ultima] = None
+        self._n = ultima
+
+    def vaciar(self):
+        for columna in self._textos.values():
+            columna[:self._n] = None
+        self._n = 0
+        self._fila_de.clear()
+
+    def _asegurar_capacidad(self, extra):
+        necesaria = self._n + extra
+        capacidad = len(self._ids)
+        if necesaria <= capacidad:
+            return
+        while capacidad < necesaria:
+            capacidad *= 2
+        self._ids = self._ampliar(self._ids, capacidad)
+        self._edades = self._ampliar(self._edades, capacidad)
+        self._codigos = self._ampliar(self._codigos, capacidad)
+        self._textos = {campo: self._ampliar(col, capacidad) for campo, col in self._textos.items()}
+
+    def _ampliar(self, columna, capacidad):
+        nueva = np.empty(capacidad, dtype=columna.dtype)
+        nueva[:self._n] = columna[:self._n]
+        return nueva
+
+    # ---------- lectura para informes ----------
+    def columnas(self):
+        """
+        Vistas de solo lectura de las columnas ocupadas (no se copian).
+        Escribir en ellas no cambiaría los índices del repositorio ni
+        avisaría a nadie, así que numpy lo impide.
+        """
+        n = self._n
+        vistas = {
+            "id": self._ids[:n],
+            "nombre": self._textos["nombre"][:n],
+            "apellidos": self._textos["apellidos"][:n],
+            "edad": self._edades[:n],
+            "correo": self._textos["correo"][:n],
+            "departamento_codigo": self._codigos[:n],
+        }
+        for vista in vistas.values():
+            vista.flags.writeable = False
+        return vistas
+
+    def foto(self):
+        """
+        Copia de las columnas ocupadas y de las categorías para leerla desde
+        otro hilo mientras el almacén sigue cambiando. numpy copia cada
+        columna de golpe (sin crear una tupla por fila); devuelve
+        (columnas como las de columnas(), lista de categorías).
+        """
+        return {campo: vista.copy() for campo, vista in self.columnas().items()}, list(self.categorias)
+
+    def dataframe(self):
+        """
+        DataFrame de solo lectura montado sobre las columnas.
+        El departamento es un pd.Categorical construido a partir de los códigos
+        (lo único que se copia, porque pandas ajusta el tipo de los códigos).
+
+        Es una foto que solo vale hasta el siguiente cambio del almacén: un
+        alta puede reservar columnas nuevas (el DataFrame sigue viendo las
+        viejas) y una baja mueve la última fila al hueco, así que esa fila
+        se vería a medias. Hay que usarlo y soltarlo sin cambiar nada entre
+        medias, o hacer df.copy().
+        """
+        import pandas as pd
+
+        cols = self.columnas()
+        codigos = cols.pop("departamento_codigo")
+        for campo in CAMPOS_TEXTO:
+            # dtype=object evita que pandas convierta (y copie) los textos
+            cols[campo] = pd.Series(cols[campo], dtype=object, copy=False)
+        cols["departamento"] = pd.Categorical.from_codes(codigos, categories=pd.Index(self.categorias, dtype=object))
+        return pd.DataFrame(cols, copy=False)
@@ -0,0 +1,366 @@
+# ==========================================================
+# Persistencia en SQLite para el gestor de empleados
+# ==========================================================
+# Base de datos local con las mismas operaciones CRUD que las pestañas
+# de empleados y departamentos:
+#   - modo WAL (lecturas y escrituras no se bloquean entre sí)
+#   - sentencias SQL fijas con parámetros (sqlite3 las guarda preparadas)
+#   - cambios en lote dentro de una única transacción (executemany)
+#   - índices por id, departamento y correo
+#   - un número de versión por registro que sube con cada UPDATE
+#     (concurrencia optimista del servicio, ver servicio_api.py)
+# Se puede importar/exportar a los CSV de siempre y los informes se
+# calculan con agregados SQL sin traer los empleados a Python.
+import csv
+import os
+import sqlite3
+
+import pandas as pd
+
+from departamento import Departamento
+from cargador_csv import ruta_csv, leer_tabla, COLUMNAS_EMPLEADOS, COLUMNAS_DEPARTAMENTOS
+from validacion import ESQUEMA_EMPLEADO, ESQUEMA_DEPARTAMENTO
+
+CAMPOS_EMPLEADO = tuple(COLUMNAS_EMPLEADOS)
+CAMPOS_DEPARTAMENTO = tuple(COLUMNAS_DEPARTAMENTOS)
+TAMANO_LOTE = 10_000  # filas por executemany al importar
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS empleados (
+    id           INTEGER PRIMARY KEY,
+    nombre       TEXT NOT NULL,
+    apellidos    TEXT NOT NULL,
+    edad         INTEGER NOT NULL,
+    correo       TEXT NOT NULL,
+    departamento TEXT NOT NULL,
+    version      INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_empleados_departamento ON empleados (departamento);
+CREATE INDEX IF NOT EXISTS idx_empleados_correo ON empleados (correo COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS departamentos (
+    id                   INTEGER PRIMARY KEY,
+    nombre               TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    empleados_necesarios INTEGER NOT NULL,
+    presupuesto          REAL NOT NULL,
+    horas_disponibles    REAL NOT NULL,
+    version              INTEGER NOT NULL DEFAULT 1
+);
+
+-- Marca de ids (ver ids.py): el siguiente al mayor id que ha tenido cada
+-- tabla. Los disparadores la suben al borrar un registro o cambiarle el
+-- id, así que el id de un registro borrado no se vuelve a dar.
+CREATE TABLE IF NOT EXISTS contadores (
+    tabla     TEXT PRIMARY KEY,
+    siguiente INTEGER NOT NULL
+);
+"""
+# Un disparador por tabla y por operación que deja libre un id
+DISPARADOR_MARCA = """
+CREATE TRIGGER IF NOT EXISTS marca_{tabla}_{operacion} AFTER {suceso} ON {tabla}{condicion}
+BEGIN
+    INSERT OR IGNORE INTO contadores (tabla, siguiente) VALUES ('{tabla}', 0);
+    UPDATE contadores SET siguiente = MAX(siguiente, OLD.id + 1) WHERE tabla = '{tabla}';
+END;
+"""
+
+# Sentencias fijas: sqlite3 las compila una vez y las reutiliza
+SQL_INSERTAR_EMPLEADO = (
+    "INSERT INTO empleados (id, nombre, apellidos, edad, correo, departamento) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_ACTUALIZAR_EMPLEADO = (
+    "UPDATE empleados SET id = ?, nombre = ?, apellidos = ?, edad = ?, correo = ?, departamento = ?, "
+    "version = version + 1 WHERE id = ?"
+)
+SQL_ELIMINAR_EMPLEADO = "DELETE FROM empleados WHERE id = ?"
+SQL_INSERTAR_DEPARTAMENTO = (
+    "INSERT INTO departamentos (id, nombre, empleados_necesarios, presupuesto, horas_disponibles) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+SQL_ACTUALIZAR_DEPARTAMENTO = (
+    "UPDATE departamentos SET id = ?, nombre = ?, empleados_necesarios = ?, presupuesto = ?, "
+    "horas_disponibles = ?, version = version + 1 WHERE id = ?"
+)
+SQL_ELIMINAR_DEPARTAMENTO = "DELETE FROM departamentos WHERE id = ?"
+# Campos de cada tabla (los nombres de tabla y columna del SQL salen solo de aquí)
+TABLAS = {"empleados": CAMPOS_EMPLEADO, "departamentos": CAMPOS_DEPARTAMENTO}
+
+
+class ConflictoVersion(Exception):
+    """El registro ha cambiado desde la versión que se leyó."""
+
+    def __init__(self, tabla, registro_id, actual):
+        super().__init__(f"El registro {registro_id} de {tabla} va por la versión {actual}")
+        self.actual = actual
+
+
+class AlmacenSQLite:
+    """Base de datos SQLite con los empleados y los departamentos."""
+
+    def __init__(self, ruta="gestor.db"):
+        self.ruta = ruta_csv(ruta)
+        self.conexion = sqlite3.connect(self.ruta, cached_statements=64)
+        self.conexion.execute("PRAGMA journal_mode = WAL")
+        self.conexion.execute("PRAGMA synchronous = NORMAL")
+        self.conexion.executescript(ESQUEMA)
+        for tabla in TABLAS:
+            self.conexion.executescript(
+                DISPARADOR_MARCA.format(tabla=tabla, operacion="borrar", suceso="DELETE", condicion="") +
+                DISPARADOR_MARCA.format(tabla=tabla, operacion="cambiar_id", suceso="UPDATE OF id",
+                                        condicion=" WHEN NEW.id != OLD.id"))
+        self._anadir_versiones()
+
+    def _anadir_versiones(self):
+        """Las bases de datos creadas antes de las versiones no tienen la columna."""
+        for tabla in TABLAS:
+            columnas = [fila[1] for fila in self.conexion.execute(f"PRAGMA table_info({tabla})")]
+            if "version" not in columnas:
+                with self.conexion:
+                    self.conexion.execute(f"ALTER TABLE {tabla} ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def marca_ids(self, tabla):
+        """Id siguiente al mayor que ha tenido 'tabla' (para AsignadorIds.avanzar)."""
+        return self.conexion.execute(
+            f"SELECT MAX(COALESCE((SELECT siguiente FROM contadores WHERE tabla = ?), 1), "
+            f"COALESCE((SELECT MAX(id) FROM {tabla}), 0) + 1)", (tabla,)).fetchone()[0]
+
+    def esta_vacia(self):
+        return self.contar_empleados() == 0 and self.contar_departamentos() == 0
+
+    # ---------- CRUD de empleados ----------
+    def insertar_empleado(self, emp):
+        with self.conexion:
+            self.conexion.execute(SQL_INSERTAR_EMPLEADO, _fila(emp, CAMPOS_EMPLEADO))
+
+    def actualizar_empleado(self, emp_id, emp):
+        with self.conexion:
+            self.conexion.execute(SQL_ACTUALIZAR_EMPLEADO, _fila(emp, CAMPOS_EMPLEADO) + (emp_id,))
+
+    def eliminar_empleado(self, emp_id):
+        with self.conexion:
+            self.conexion.execute(SQL_ELIMINAR_EMPLEADO, (emp_id,))
+
+    def obtener_empleado(self, emp_id):
+        return self.conexion.execute(
+            "SELECT id, nombre, apellidos, edad, correo, departamento FROM empleados WHERE id = ?",
+            (emp_id,)
+        ).fetchone()
+
+    def empleados_de(self, departamento):
+        return self.conexion.execute(
+            "SELECT id, nombre, apellidos, edad, correo, departamento FROM empleados "
+            "WHERE departamento = ? ORDER BY id", (departamento,)
+        ).fetchall()
+
+    def empleado_por_correo(self, correo):
+        return self.conexion.execute(
+            "SELECT id, nombre, apellidos, edad, correo, departamento FROM empleados "
+            "WHERE correo = ? COLLATE NOCASE", (correo.strip(),)
+        ).fetchall()
+
+    def contar_empleados(self):
+        return self.conexion.execute("SELECT COUNT(*) FROM empleados").fetchone()[0]
+
+    def leer_empleados(self):
+        """DataFrame con todos los empleados (para EmpleadoRepository.cargar_dataframe)."""
+        return pd.read_sql_query(
+            "SELECT id, nombre, apellidos, edad, correo, departamento FROM empleados ORDER BY rowid",
+            self.conexion
+        )
+
+    # ---------- CRUD de departamentos ----------
+    def insertar_departamento(self, dep):
+        with self.conexion:
+            self.conexion.execute(SQL_INSERTAR_DEPARTAMENTO, _fila(dep, CAMPOS_DEPARTAMENTO))
+
+    def actualizar_departamento(self, dep_id, dep):
+        with self.conexion:
+            self.conexion.execute(SQL_ACTUALIZAR_DEPARTAMENTO, _fila(dep, CAMPOS_DEPARTAMENTO) + (dep_id,))
+
+    def eliminar_departamento(self, dep_id):
+        with self.conexion:
+            self.conexion.execute(SQL_ELIMINAR_DEPARTAMENTO, (dep_id,))
+
+    def contar_departamentos(self):
+        return self.conexion.execute("SELECT COUNT(*) FROM departamentos").fetchone()[0]
+
+    def leer_departamentos(self):
+        """Lista de objetos Departamento."""
+        cursor = self.conexion.execute(
+            "SELECT id, nombre, empleados_necesarios, presupuesto, horas_disponibles "
+            "FROM departamentos ORDER BY rowid"
+        )
+        return [Departamento(*fila) for fila in cursor]
+
+    # ---------- cambios en lote (oyentes de los repositorios) ----------
+    def aplicar_cambios_empleados(self, cambios):
+        """
+        Aplica una lista de cambios (anterior, nuevo) de EmpleadoRepository
+        en una sola transacción.
+        """
+        self._aplicar(cambios, SQL_INSERTAR_EMPLEADO, SQL_ACTUALIZAR_EMPLEADO, SQL_ELIMINAR_EMPLEADO)
+
+    def aplicar_cambios_departamentos(self, cambios):
+        """Igual que aplicar_cambios_empleados, para RegistroDepartamentos."""
+        self._aplicar(cambios, SQL_INSERTAR_DEPARTAMENTO, SQL_ACTUALIZAR_DEPARTAMENTO, SQL_ELIMINAR_DEPARTAMENTO)
+
+    def _aplicar(self, cambios, sql_insertar, sql_actualizar, sql_eliminar):
+        # Se agrupan por tipo conservando el orden: así cada tramo es un executemany
+        with self.conexion:
+            tramo, sql_tramo = [], None
+            for anterior, nuevo in cambios:
+                if anterior is None:
+                    sql, parametros = sql_insertar, tuple(nuevo)
+                elif nuevo is None:
+                    sql, parametros = sql_eliminar, (anterior[0],)
+                else:
+                    sql, parametros = sql_actualizar, tuple(nuevo) + (anterior[0],)
+                if sql is not sql_tramo and tramo:
+                    self.conexion.executemany(sql_tramo, tramo)
+                    tramo = []
+                sql_tramo = sql
+                tramo.append(parametros)
+            if tramo:
+                self.conexion.executemany(sql_tramo, tramo)
+
+    # ---------- concurrencia optimista (servicio_api.py) ----------
+    def leer_registro(self, tabla, registro_id):
+        """Diccionario con los campos y la versión de un registro, o None."""
+        campos = TABLAS[tabla] + ("version",)
+        fila = self.conexion.execute(
+            f"SELECT {', '.join(campos)} FROM {tabla} WHERE id = ?", (registro_id,)
+        ).fetchone()
+        return dict(zip(campos, fila)) if fila is not None else None
+
+    def listar(self, tabla, desde=0, limite=100, **filtros):
+        """
+        Registros con id mayor que 'desde', por orden de id, como diccionarios.
+        filtros: {campo: valor} que tienen que coincidir (departamento="IT").
+        Para la página siguiente se pasa como 'desde' el último id recibido.
+        """
+        campos = TABLAS[tabla] + ("version",)
+        condiciones = ["id > ?"] + [f"{campo} = ?" for campo in filtros if campo in TABLAS[tabla]]
+        parametros = [desde] + [valor for campo, valor in filtros.items() if campo in TABLAS[tabla]]
+        cursor = self.conexion.execute(
+            f"SELECT {', '.join(campos)} FROM {tabla} WHERE {' AND '.join(condiciones)} "
+            f"ORDER BY id LIMIT ?", parametros + [limite])
+        return [dict(zip(campos, fila)) for fila in cursor]
+
+    def insertar(self, tabla, valores):
+        """
+        Inserta un registro (diccionario con todos sus campos, id incluido:
+        lo da un AsignadorIds) y lo devuelve con su versión.
+        Lanza sqlite3.IntegrityError si el id o el nombre ya existen.
+        """
+        campos = TABLAS[tabla]
+        with self.conexion:
+            self.conexion.execute(
+                f"INSERT INTO {tabla} ({', '.join(campos)}) VALUES ({', '.join('?' * len(campos))})",
+                [valores[campo] for campo in campos])
+        return self.leer_registro(tabla, valores["id"])
+
+    def actualizar_si_version(self, tabla, registro_id, valores, version):
+        """
+        Cambia los campos de 'valores' solo si el registro sigue en 'version'
+        y devuelve el registro actualizado. Lanza KeyError si no existe y
+        ConflictoVersion si otro lo ha cambiado antes.
+        """
+        campos = [campo for campo in TABLAS[tabla] if campo in valores]
+        asignaciones = "".join(f"{campo} = ?, " for campo in campos)
+        with self.conexion:
+            cursor = self.conexion.execute(
+                f"UPDATE {tabla} SET {asignaciones}version = version + 1 WHERE id = ? AND version = ?",
+                [valores[campo] for campo in campos] + [registro_id, version])
+            if cursor.rowcount == 0:
+                self._comprobar_version(tabla, registro_id)
+        return self.leer_registro(tabla, valores.get("id", registro_id))
+
+    def eliminar_si_version(self, tabla, registro_id, version):
+        """Borra el registro solo si sigue en 'version' (mismos errores que actualizar_si_version)."""
+        with self.conexion:
+            cursor = self.conexion.execute(f"DELETE FROM {tabla} WHERE id = ? AND version = ?",
+                                           (registro_id, version))
+            if cursor.rowcount == 0:
+                self._comprobar_version(tabla, registro_id)
+
+    def _comprobar_version(self, tabla, registro_id):
+        fila = self.conexion.execute(f"SELECT version FROM {tabla} WHERE id = ?", (registro_id,)).fetchone()
+        if fila is None:
+            raise KeyError(f"No existe el registro {registro_id} en {tabla}")
+        raise ConflictoVersion(tabla, registro_id, fila[0])
+
+    # ---------- importar / exportar CSV ----------
+    def importar_csv(self, empleados_csv="empleados.csv", departamentos_csv="departamentos.csv"):
+        """Carga los CSV en la base de datos (sustituye lo que hubiera)."""
+        with self.conexion:
+            self.conexion.execute("DELETE FROM departamentos")
+            self.conexion.execute("DELETE FROM empleados")
+            for csv_filename, esquema, sql in (
+                    (departamentos_csv, ESQUEMA_DEPARTAMENTO, SQL_INSERTAR_DEPARTAMENTO),
+                    (empleados_csv, ESQUEMA_EMPLEADO, SQL_INSERTAR_EMPLEADO)):
+                if not os.path.exists(ruta_csv(csv_filename)):
+                    continue
+                df = leer_tabla(ruta_csv(csv_filename), esquema)
+                filas = list(zip(*(df[c].tolist() for c in esquema.columnas)))
+                for inicio in range(0, len(filas), TAMANO_LOTE):
+                    self.conexion.executemany(sql, filas[inicio:inicio + TAMANO_LOTE])
+
+    def exportar_csv(self, empleados_csv="empleados.csv", departamentos_csv="departamentos.csv"):
+        """Escribe el contenido de la base de datos en los CSV."""
+        for csv_filename, tabla, campos in ((empleados_csv, "empleados", CAMPOS_EMPLEADO),
+                                            (departamentos_csv, "departamentos", CAMPOS_DEPARTAMENTO)):
+            cursor = self.conexion.execute(f"SELECT {', '.join(campos)} FROM {tabla} ORDER BY rowid")
+            with open(ruta_csv(csv_filename), "w", newline="", encoding="utf-8") as f:
+                escritor = csv.writer(f)
+                escritor.writerow(campos)
+                while True:
+                    filas = cursor.fetchmany(TAMANO_LOTE)
+                    if not filas:
+                        break
+                    escritor.writerows(filas)
+
+    # ---------- informes con agregados SQL ----------
+    def plantilla_por_departamento(self):
+        """{departamento: número de empleados}"""
+        return dict(self.conexion.execute(
+            "SELECT departamento, COUNT(*) FROM empleados GROUP BY departamento ORDER BY COUNT(*) DESC"
+        ))
+
+    def recuento_edades(self):
+        """{edad: número de empleados}"""
+        return dict(self.conexion.execute("SELECT edad, COUNT(*) FROM empleados GROUP BY edad"))
+
+    def necesarios_vs_reales(self):
+        """Lista de (departamento, necesarios, reales) ordenada por id de departamento."""
+        return self.conexion.execute(
+            "SELECT d.nombre, d.empleados_necesarios, COUNT(e.id) "
+            "FROM departamentos d LEFT JOIN empleados e ON e.departamento = d.nombre "
+            "GROUP BY d.id ORDER BY d.rowid"
+        ).fetchall()
+
+
+def _fila(obj, campos):
+    return tuple(getattr(obj, campo) for campo in campos)
+
+
+def conectar_repositorios(almacen, empleados, departamentos, ids=None):
+    """
+    Usa la base de datos como almacenamiento de los repositorios:
+      1) si está vacía, importa los CSV
+      2) carga empleados y departamentos desde SQLite
+      3) cada cambio posterior se escribe en la base de datos
+    ids: AsignadorIds de (empleados, departamentos), que continúan desde
+    la marca guardada en la base de datos.
+    """
+    if almacen.esta_vacia():
+        almacen.importar_csv()
+    for tabla, asignador in zip(("empleados", "departamentos"), ids or ()):
+        asignador.avanzar(almacen.marca_ids(tabla))
+    departamentos.reemplazar(almacen.leer_departamentos())
+    empleados.cargar_dataframe(almacen.leer_empleados())
+    empleados.suscribir(almacen.aplicar_cambios_empleados)
+    departamentos.suscribir(almacen.aplicar_cambios_departamentos)
@@ -0,0 +1,72 @@
+# ==========================================================
+# Benchmark: tiempo hasta la primera ventana
+# ==========================================================
+# Uso:  python benchmark_arranque.py [repeticiones]
+#
+# Cada medida se hace en un proceso nuevo (como cuando se abre la app)
+# y compara:
+#   - todo al arrancar: pandas, matplotlib y las cuatro pestañas
+#     construidas antes de mostrar la ventana (como antes)
+#   - perezoso: solo la pestaña de inicio; el resto al abrirlas
+# Si hay pantalla se mide hasta el primer root.update(); si no, solo el
+# coste de las importaciones (lo que más pesa).
+import os
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_IMPORTAR = {
+    "todo al arrancar": "import main, pandas, pestana_informes",
+    "perezoso": "import main",
+}
+
+_VENTANA = {
+    "todo al arrancar": (
+        "main.init_empleado(p); main.init_departamentos(p); "
+        "pestana_informes.init_informes(p)"
+    ),
+    "perezoso": "main.construir_al_abrir(p)",
+}
+
+_PLANTILLA = """
+import time
+inicio = time.perf_counter()
+{importar}
+if {con_ventana}:
+    import tkinter as tk
+    root = tk.Tk()
+    root.geometry("1280x720")
+    p = main.crear_pestanas(root)
+    main.init_inicio(p)
+    {ventana}
+    root.update()
+print(time.perf_counter() - inicio)
+"""
+
+
+def hay_pantalla():
+    resultado = subprocess.run([sys.executable, "-c", "import tkinter; tkinter.Tk().destroy()"],
+                               capture_output=True)
+    return resultado.returncode == 0
+
+
+def medir(modo, con_ventana):
+    codigo = _PLANTILLA.format(importar=_IMPORTAR[modo], con_ventana=con_ventana, ventana=_VENTANA[modo])
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=BASE_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    return float(salida.strip().splitlines()[-1])
+
+
+def main(repeticiones):
+    con_ventana = hay_pantalla()
+    print("Medida:", "hasta la primera ventana" if con_ventana else "solo importaciones (no hay pantalla)")
+    print(f"{'Modo':<20}{'Mediana (ms)':>14}{'Mínimo (ms)':>14}")
+    for modo in _IMPORTAR:
+        tiempos = [medir(modo, con_ventana) for _ in range(repeticiones)]
+        print(f"{modo:<20}{statistics.median(tiempos) * 1000:>14.1f}{min(tiempos) * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
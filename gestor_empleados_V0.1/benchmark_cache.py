@@ -0,0 +1,68 @@
+# ==========================================================
+# Benchmark: leer los empleados del CSV o de la caché binaria
+# ==========================================================
+# Uso:  python benchmark_cache.py [num_filas]
+#
+# Crea un CSV de prueba en una carpeta temporal (la caché se apunta allí
+# también, así no se toca la de la aplicación) y compara:
+#   - analizar el CSV con pandas (lo que hace un arranque en frío)
+#   - leer la caché de cache_columnar.py (un arranque en caliente)
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import cache_columnar
+from cargador_csv import leer_csv, COLUMNAS_EMPLEADOS
+from validacion import ESQUEMA_EMPLEADO
+
+
+def _crear_csv(ruta, n):
+    import pandas as pd
+    i = np.arange(1, n + 1)
+    pd.DataFrame({
+        "id": i,
+        "nombre": [f"Nombre{k % 500}" for k in range(n)],
+        "apellidos": [f"Apellido{k % 900} Pérez" for k in range(n)],
+        "edad": 18 + i % 50,
+        "correo": [f"empleado{k}@empresa.com" for k in range(n)],
+        "departamento": [("Ventas", "IT", "RRHH", "Marketing")[k % 4] for k in range(n)],
+    }).to_csv(ruta, index=False)
+
+
+def _medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - inicio
+
+
+def main(n=1_000_000):
+    carpeta = tempfile.mkdtemp()
+    cache_columnar.BASE_DIR = carpeta
+    cache_columnar.CARPETA = os.path.join(carpeta, "cache_columnar")
+    try:
+        ruta = os.path.join(carpeta, "empleados.csv")
+        _crear_csv(ruta, n)
+        df, t_csv = _medir(lambda: leer_csv(ruta, ESQUEMA_EMPLEADO))
+        _, t_guardar = _medir(lambda: cache_columnar.guardar(
+            ruta, df, COLUMNAS_EMPLEADOS, cache_columnar.huella(ruta)))
+        cacheado, t_cache = _medir(lambda: cache_columnar.leer(ruta, COLUMNAS_EMPLEADOS))
+        assert cacheado is not None and cacheado.equals(df.astype(cacheado.dtypes.to_dict()))
+        os.utime(ruta)  # misma longitud, otra fecha: se comprueba el hash
+        _, t_hash = _medir(lambda: cache_columnar.leer(ruta, COLUMNAS_EMPLEADOS))
+
+        print(f"Empleados: {n}  (CSV de {os.path.getsize(ruta) / 1e6:.1f} MB)")
+        for nombre, segundos in (("Analizar el CSV (frío)", t_csv),
+                                 ("Guardar la caché", t_guardar),
+                                 ("Leer la caché (caliente)", t_cache),
+                                 ("Leer la caché tras tocar el CSV (hash)", t_hash)):
+            print(f"{nombre:<42}{segundos * 1000:>10.1f} ms")
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,73 @@
+# ==========================================================
+# Benchmark: buscar personas repetidas en una importación grande
+# ==========================================================
+# Uso:  python benchmark_duplicados.py [num_filas]
+#
+# Genera empleados con nombres al azar y repite un 1 % con otro id y
+# alguna variante (sin tildes, apellidos al revés, correo en mayúsculas).
+# Mide buscar_duplicados() y cuántos de los repetidos encuentra.
+import random
+import sys
+import time
+
+import pandas as pd
+
+from duplicados import buscar_duplicados
+
+NOMBRES = ["Ana", "José", "María", "Íñigo", "Lucía", "Raúl", "Sofía", "Martín", "Elena", "Andrés",
+           "Carmen", "Óscar", "Julia", "Tomás", "Irene", "Ramón", "Nuria", "Jesús", "Sara", "Adrián"]
+APELLIDOS = ["García", "Pérez", "López", "Martínez", "Sánchez", "Gómez", "Fernández", "Díaz", "Álvarez",
+             "Muñoz", "Romero", "Navarro", "Gutiérrez", "Ruiz", "Jiménez", "Hernández", "Domínguez",
+             "Vázquez", "Ramos", "Castillo"]
+DEPARTAMENTOS = ["Ventas", "IT", "Marketing", "Finanzas", "Operaciones"]
+PROPORCION_REPETIDOS = 0.01
+
+
+def _sin_tildes(texto):
+    return texto.translate(str.maketrans("áéíóúÁÉÍÓÚñÑ", "aeiouAEIOUnN"))
+
+
+def _variante(fila, azar):
+    emp_id, nombre, apellidos, edad, correo, departamento = fila
+    cambio = azar.randrange(3)
+    if cambio == 0:
+        nombre, apellidos = _sin_tildes(nombre), _sin_tildes(apellidos)
+    elif cambio == 1:
+        apellidos = " ".join(reversed(apellidos.split()))
+    else:
+        correo = correo.upper()
+    return (emp_id, nombre, apellidos, edad, correo, departamento)
+
+
+def generar(n, azar):
+    filas = []
+    for k in range(n):
+        nombre = azar.choice(NOMBRES)
+        # Sufijo numérico: como en una plantilla real, casi todos los nombres completos son distintos
+        apellidos = f"{azar.choice(APELLIDOS)} {azar.choice(APELLIDOS)}{k % 997}"
+        filas.append((k + 1, nombre, apellidos, azar.randint(20, 65),
+                      f"empleado{k}@empresa.com", azar.choice(DEPARTAMENTOS)))
+    repetidos = azar.sample(range(n), int(n * PROPORCION_REPETIDOS))
+    esperados = set()
+    for posicion, original in enumerate(repetidos):
+        nuevo_id = n + posicion + 1
+        filas.append(_variante((nuevo_id, *filas[original][1:]), azar))
+        esperados.add((original + 1, nuevo_id))
+    return pd.DataFrame(filas, columns=["id", "nombre", "apellidos", "edad", "correo", "departamento"]), esperados
+
+
+def main(n=1_000_000):
+    df, esperados = generar(n, random.Random(1))
+    inicio = time.perf_counter()
+    sugerencias, omitidos = buscar_duplicados(df)
+    segundos = time.perf_counter() - inicio
+    encontrados = set(zip(sugerencias["conservar"].tolist(), sugerencias["sobra"].tolist()))
+    print(f"Empleados: {len(df)}  (repetidos a propósito: {len(esperados)})")
+    print(f"buscar_duplicados: {segundos:.2f} s, {len(sugerencias)} propuestas, {omitidos} bloques sin comparar")
+    print(f"Repetidos encontrados: {len(esperados & encontrados)} de {len(esperados)}")
+    print(f"Propuestas que no eran repetidos: {len(encontrados - esperados)}")
+    print(sugerencias.head(5).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,54 @@
+# ==========================================================
+# Benchmark: propuesta de traslados con muchos empleados
+# ==========================================================
+# Uso:  python benchmark_optimizador.py [num_empleados] [num_departamentos]
+#
+# Reparte los empleados al azar entre departamentos con necesidades,
+# presupuesto y horas distintos y mide proponer_traslados() con todos
+# los traslados al mismo coste y con un coste distinto para cada par
+# de departamentos.
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from optimizador import proponer_traslados
+
+
+def generar(n, d, azar):
+    necesarios = azar.integers(n // (2 * d), 3 * n // (2 * d) + 1, d)
+    departamentos = pd.DataFrame({
+        "id": np.arange(1, d + 1),
+        "nombre": [f"Departamento {k}" for k in range(d)],
+        "empleados_necesarios": necesarios,
+        "presupuesto": necesarios * azar.uniform(12_000, 20_000, d),
+        "horas_disponibles": necesarios * azar.uniform(200, 300, d),
+    })
+    empleados = pd.DataFrame({
+        "id": np.arange(1, n + 1),
+        "nombre": "Nombre",
+        "apellidos": "Apellidos",
+        "departamento": azar.choice(departamentos["nombre"].to_numpy(), n),
+    })
+    return empleados, departamentos
+
+
+def main(n=100_000, d=500):
+    azar = np.random.default_rng(1)
+    empleados, departamentos = generar(n, d, azar)
+    nombres = departamentos["nombre"].tolist()
+    costes = {(a, b): int(c) for a, fila in zip(nombres, azar.integers(1, 6, (d, d)))
+              for b, c in zip(nombres, fila)}
+    print(f"Empleados: {n}  Departamentos: {d}")
+    for texto, pares in (("mismo coste", None), (f"{len(costes)} costes por par", costes)):
+        inicio = time.perf_counter()
+        traslados, resumen = proponer_traslados(empleados, departamentos, costes=pares)
+        segundos = time.perf_counter() - inicio
+        faltan_antes = (resumen["necesarios"] - resumen["antes"]).clip(lower=0).sum()
+        print(f"{texto}: {segundos:.2f} s, {len(traslados)} traslados, "
+              f"faltan {faltan_antes} -> {resumen['faltan'].sum()}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
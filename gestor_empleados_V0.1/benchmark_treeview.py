@@ -0,0 +1,162 @@
+# ==========================================================
+# Benchmark: coste en llamadas a Tk del refresco de la tabla
+# ==========================================================
+# Uso:  python benchmark_treeview.py [num_filas]
+#
+# Se usa un Treeview "falso" que cuenta las llamadas que recibiría Tk,
+# así el benchmark se puede lanzar sin pantalla. Compara:
+#   - el refresco antiguo (borrar todo y volver a insertar)
+#   - la edición de un solo registro con tabla_incremental
+#   - desplazarse por la tabla virtual (tabla_virtual.py), que solo tiene
+#     en Tk las filas que se ven
+import sys
+import time
+
+from empleado import Empleado
+from tabla_incremental import (iid_de, insertar_fila, actualizar_fila, borrar_fila,
+                               sincronizar_treeview, olvidar_treeview)
+from tabla_virtual import TablaVirtual, VistaPerezosa
+
+
+class TreeviewContador:
+    """Imita la parte de ttk.Treeview que usamos y cuenta las llamadas a Tk."""
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.llamadas = 0
+        self.filas = {}
+
+    def __str__(self):
+        return self.nombre
+
+    def get_children(self):
+        self.llamadas += 1
+        return tuple(self.filas)
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.llamadas += 1
+        iid = iid if iid is not None else f"I{len(self.filas)}"
+        self.filas[iid] = values
+        return iid
+
+    def item(self, iid, values=None):
+        self.llamadas += 1
+        self.filas[iid] = values
+
+    def delete(self, *iids):
+        self.llamadas += 1
+        for iid in iids:
+            del self.filas[iid]
+
+    def index(self, iid):
+        self.llamadas += 1
+        return list(self.filas).index(iid)
+
+    # ---------- lo que usa además la tabla virtual ----------
+    def set_children(self, parent, *iids):
+        self.llamadas += 1
+        self.filas = {iid: self.filas[iid] for iid in iids}
+
+    def selection(self):
+        return ()
+
+    def selection_set(self, iids):
+        self.llamadas += 1
+
+    def yview_moveto(self, fraccion):
+        self.llamadas += 1
+
+    def configure(self, **opciones):
+        pass
+
+    def bind(self, evento, funcion, add=None):
+        pass
+
+
+class BarraContador:
+    """Barra de desplazamiento falsa (no cuenta: es una llamada por refresco)."""
+
+    def set(self, primero, ultimo):
+        pass
+
+
+def _valores(emp):
+    return (emp.id, emp.nombre, emp.apellidos, emp.edad, emp.correo, emp.departamento)
+
+
+def _crear_empleados(n):
+    return [Empleado(i, f"Nombre{i}", f"Apellido{i}", 20 + i % 40,
+                     f"emp{i}@empresa.com", "Ventas") for i in range(1, n + 1)]
+
+
+def _medir(tree, funcion):
+    tree.llamadas = 0
+    inicio = time.perf_counter()
+    funcion()
+    return tree.llamadas, time.perf_counter() - inicio
+
+
+def main(n=100_000):
+    empleados = _crear_empleados(n)
+
+    # 1) Refresco antiguo: se borra todo y se vuelve a insertar
+    antiguo = TreeviewContador("antiguo")
+    for emp in empleados:
+        antiguo.insert("", "end", values=_valores(emp))
+
+    def refresco_completo():
+        for item in antiguo.get_children():
+            antiguo.delete(item)
+        for emp in empleados:
+            antiguo.insert("", "end", values=_valores(emp))
+
+    # 2) Refresco incremental
+    tree = TreeviewContador("incremental")
+    olvidar_treeview(tree)
+    carga = _medir(tree, lambda: sincronizar_treeview(
+        tree, ((iid_de(e.id), _valores(e)) for e in empleados)))
+
+    emp = empleados[n // 2]
+    emp.edad += 1
+    nuevo = Empleado(n + 1, "Nuevo", "Empleado", 30, "nuevo@empresa.com", "IT")
+
+    resultados = [
+        ("Antiguo: editar 1 empleado", _medir(antiguo, refresco_completo)),
+        ("Incremental: carga inicial", carga),
+        ("Incremental: editar 1 empleado", _medir(
+            tree, lambda: actualizar_fila(tree, iid_de(emp.id), _valores(emp)))),
+        ("Incremental: añadir 1 empleado", _medir(
+            tree, lambda: insertar_fila(tree, iid_de(nuevo.id), _valores(nuevo)))),
+        ("Incremental: borrar 1 empleado", _medir(
+            tree, lambda: borrar_fila(tree, iid_de(emp.id)))),
+        ("Incremental: sincronizar sin cambios", _medir(
+            tree, lambda: sincronizar_treeview(
+                tree, ((iid_de(e.id), _valores(e))
+                       for e in empleados + [nuevo] if e is not emp)))),
+    ]
+
+    # 3) Tabla virtual sobre 50 veces más filas, pintando sin esperar a after_idle()
+    total = n * 50
+    virtual = TreeviewContador("virtual")
+    vista = VistaPerezosa(lambda: total, lambda inicio, fin: range(inicio, min(fin, total)))
+    tabla = TablaVirtual(virtual, BarraContador(), lambda: vista, lambda i: (i, f"Nombre{i}", "", 30, "", ""))
+
+    def ir(posicion):
+        tabla.primera = posicion
+        tabla.pintar()
+
+    resultados += [
+        (f"Virtual ({total} filas): primera ventana", _medir(virtual, lambda: ir(0))),
+        ("Virtual: saltar a la mitad", _medir(virtual, lambda: ir(total // 2))),
+        ("Virtual: bajar 1 fila", _medir(virtual, lambda: ir(total // 2 + 1))),
+        ("Virtual: saltar al final", _medir(virtual, lambda: ir(total))),
+    ]
+
+    print(f"Filas en la tabla: {n}")
+    print(f"{'Operación':<44}{'Llamadas Tk':>14}{'Tiempo (ms)':>14}")
+    for nombre, (llamadas, segundos) in resultados:
+        print(f"{nombre:<44}{llamadas:>14}{segundos * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
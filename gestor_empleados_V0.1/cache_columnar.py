@@ -0,0 +1,157 @@
+# ==========================================================
+# Caché binaria por columnas de los CSV (arranques en caliente)
+# ==========================================================
+# Leer un CSV grande es lo más lento del arranque: pandas tiene que
+# analizar todo el texto. Después de importar un CSV se guardan sus
+# filas ya validadas en una carpeta junto a los CSV:
+#
+#   cache_columnar/empleados/
+#       meta.json              tamaño, fecha y hash del CSV de origen
+#       id.npy, edad.npy       columnas numéricas tal cual
+#       nombre.codigos.npy     columnas de texto como diccionario:
+#       nombre.valores.npy     código por fila + valores distintos
+#
+# y en el siguiente arranque se abren con np.load(mmap_mode="r"), sin
+# analizar nada. Los textos se guardan como diccionario porque nombres,
+# apellidos y departamentos se repiten mucho: solo se crea un str por
+# valor distinto.
+#
+# La caché vale si el CSV tiene el mismo tamaño y fecha de modificación
+# que cuando se creó. Si solo cambia la fecha (se ha copiado o tocado el
+# fichero), se compara el hash del contenido. Si no vale, se vuelve a
+# leer el CSV y la caché se rehace.
+import hashlib
+import json
+import os
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CARPETA = os.path.join(BASE_DIR, "cache_columnar")
+VERSION = 1
+BLOQUE_HASH = 1 << 20  # bytes leídos de cada vez al calcular el hash
+
+
+def _carpeta(csv_path):
+    """Carpeta de la caché de un CSV; None si el CSV no está junto a la aplicación."""
+    csv_path = os.path.abspath(csv_path)
+    if os.path.dirname(csv_path) != BASE_DIR:
+        return None  # un CSV importado de otro sitio se lee una vez: no merece caché
+    return os.path.join(CARPETA, os.path.splitext(os.path.basename(csv_path))[0])
+
+
+def huella(csv_path):
+    """(tamaño, fecha de modificación en ns) del CSV, o None si no existe."""
+    try:
+        st = os.stat(csv_path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def hash_contenido(csv_path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(csv_path, "rb") as f:
+        for bloque in iter(lambda: f.read(BLOQUE_HASH), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _leer_meta(carpeta):
+    try:
+        with open(os.path.join(carpeta, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _escribir_meta(carpeta, meta):
+    ruta = os.path.join(carpeta, "meta.json")
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(temporal, ruta)
+
+
+def vigente(csv_path, columnas):
+    """True si hay caché del CSV y corresponde a su contenido actual."""
+    carpeta = _carpeta(csv_path)
+    if carpeta is None:
+        return False
+    meta = _leer_meta(carpeta)
+    actual = huella(csv_path)
+    if meta is None or actual is None or meta.get("version") != VERSION \
+            or meta.get("columnas") != list(columnas) or meta["tamano"] != actual[0]:
+        return False
+    if meta["mtime_ns"] == actual[1]:
+        return True
+    # Misma longitud y otra fecha: decide el contenido
+    if hash_contenido(csv_path) != meta["hash"]:
+        return False
+    meta["mtime_ns"] = actual[1]
+    _escribir_meta(carpeta, meta)
+    return True
+
+
+def leer(csv_path, columnas):
+    """
+    DataFrame con las columnas de la caché si está vigente, o None.
+    Las columnas numéricas se leen con mmap; las de texto se montan a
+    partir de sus valores distintos.
+    """
+    if not vigente(csv_path, columnas):
+        return None
+    import pandas as pd
+
+    carpeta = _carpeta(csv_path)
+    datos = {}
+    try:
+        for columna, tipo in columnas.items():
+            if tipo is str:
+                codigos = np.load(os.path.join(carpeta, f"{columna}.codigos.npy"), mmap_mode="r")
+                valores = np.load(os.path.join(carpeta, f"{columna}.valores.npy")).astype(object)
+                datos[columna] = pd.Series(valores[codigos], dtype=object, copy=False)
+            else:
+                datos[columna] = np.load(os.path.join(carpeta, f"{columna}.npy"), mmap_mode="r")
+    except (OSError, ValueError) as e:
+        print(f"Caché de {os.path.basename(csv_path)} dañada, se lee el CSV: {e}")
+        return None
+    return pd.DataFrame(datos, copy=False)
+
+
+def guardar(csv_path, df, columnas, huella_leida):
+    """
+    Guarda las columnas de df como caché del CSV.
+    huella_leida es huella(csv_path) de antes de leer el CSV: si el fichero
+    ha cambiado desde entonces, df ya no le corresponde y no se guarda nada.
+    """
+    import pandas as pd
+
+    carpeta = _carpeta(csv_path)
+    if carpeta is None or huella_leida is None:
+        return False
+    contenido = hash_contenido(csv_path)
+    if huella(csv_path) != huella_leida:
+        return False
+    os.makedirs(carpeta, exist_ok=True)
+    # Sin meta.json la caché no vale: así una escritura a medias nunca se usa
+    try:
+        os.remove(os.path.join(carpeta, "meta.json"))
+    except FileNotFoundError:
+        pass
+    for columna, tipo in columnas.items():
+        if tipo is str:
+            codigos, valores = pd.factorize(df[columna], sort=False)
+            np.save(os.path.join(carpeta, f"{columna}.codigos.npy"), codigos.astype(np.int32))
+            np.save(os.path.join(carpeta, f"{columna}.valores.npy"), np.asarray(valores, dtype=str))
+        else:
+            np.save(os.path.join(carpeta, f"{columna}.npy"), df[columna].to_numpy(dtype=tipo))
+    _escribir_meta(carpeta, {
+        "version": VERSION,
+        "columnas": list(columnas),
+        "filas": len(df),
+        "tamano": huella_leida[0],
+        "mtime_ns": huella_leida[1],
+        "hash": contenido,
+    })
+    return True
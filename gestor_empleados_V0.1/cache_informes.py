@@ -0,0 +1,96 @@
+# ==========================================================
+# Caché de resultados de informes por versión de los datos
+# ==========================================================
+# Cada repositorio tiene un contador de versión que sube con cada alta,
+# baja o modificación (Versiones se suscribe a ellos). Un resultado se
+# guarda con la clave (informe, versiones de los datos que usa): mientras
+# esos datos no cambien, volver a pedir el informe no recalcula nada.
+# Al cambiar los datos la clave deja de coincidir y la entrada vieja
+# acaba saliendo por LRU.
+#
+# La caché tiene un tope de entradas y otro de memoria (estimada con
+# memory_usage/nbytes); al pasarse se quitan las menos usadas.
+#
+# pestana_informes.py usa dos: una con los resultados y otra con las
+# imágenes ya pintadas de cada resultado (arrays RGBA, por tamaño).
+import sys
+from collections import OrderedDict
+
+MAX_ENTRADAS = 32
+MAX_BYTES = 64 * 1024 * 1024
+
+
+class Versiones:
+    """Contador de versión por fuente de datos ("empleados", "departamentos"...)."""
+
+    def __init__(self):
+        self._version = {}
+
+    def seguir(self, nombre, repositorio):
+        """Sube la versión de 'nombre' con cada aviso del repositorio."""
+        self._version[nombre] = 0
+
+        def subir(cambios):
+            if cambios:
+                self._version[nombre] += 1
+        repositorio.suscribir(subir)
+
+    def de(self, nombres):
+        """Tupla con la versión actual de cada fuente de 'nombres'."""
+        return tuple(self._version.get(nombre, 0) for nombre in nombres)
+
+
+def tamano(valor):
+    """Bytes aproximados de un resultado (DataFrame, Series, arrays, tuplas...)."""
+    if hasattr(valor, "memory_usage"):
+        uso = valor.memory_usage(deep=True)
+        return int(uso.sum()) if hasattr(uso, "sum") else int(uso)
+    if hasattr(valor, "nbytes"):
+        return int(valor.nbytes)
+    if isinstance(valor, (tuple, list)):
+        return sys.getsizeof(valor) + sum(tamano(v) for v in valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamano(k) + tamano(v) for k, v in valor.items())
+    return sys.getsizeof(valor)
+
+
+class CacheLRU:
+    """Diccionario clave -> valor que olvida lo menos usado al pasarse de tamaño."""
+
+    def __init__(self, max_entradas=MAX_ENTRADAS, max_bytes=MAX_BYTES):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._datos = OrderedDict()  # clave -> (valor, bytes), de menos a más reciente
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self._datos)
+
+    def obtener(self, clave):
+        """Valor guardado para 'clave' o None."""
+        entrada = self._datos.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self._datos.move_to_end(clave)
+        self.aciertos += 1
+        return entrada[0]
+
+    def guardar(self, clave, valor):
+        bytes_valor = tamano(valor)
+        if bytes_valor > self.max_bytes:
+            return  # no cabe ni sola: no se guarda
+        anterior = self._datos.pop(clave, None)
+        if anterior is not None:
+            self.bytes -= anterior[1]
+        self._datos[clave] = (valor, bytes_valor)
+        self.bytes += bytes_valor
+        while len(self._datos) > self.max_entradas or self.bytes > self.max_bytes:
+            _, (_, liberados) = self._datos.popitem(last=False)
+            self.bytes -= liberados
+
+    def vaciar(self):
+        self._datos.clear()
+        self.bytes = 0
@@ -0,0 +1,66 @@
+# ==========================================================
+# Carga masiva de empleados y departamentos desde CSV
+# ==========================================================
+# En lugar de recorrer el DataFrame fila a fila con iterrows(), se lee
+# el CSV como texto y se valida y convierte en una sola pasada sobre las
+# columnas (validacion.py). La tabla se pinta una única vez al final (lo
+# hace quien llama). Al arrancar, los CSV se leen por bloques en segundo
+# plano (importador.py) con los mismos esquemas; leer_tabla y leer_csv
+# leen un fichero entero de una vez (SQLite, informes por lotes).
+import os
+
+import perfilado
+import cache_columnar
+from validacion import ESQUEMA_EMPLEADO, ESQUEMA_DEPARTAMENTO, resumen_errores
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Columnas y tipos de cada CSV (salen de los esquemas de validación)
+COLUMNAS_EMPLEADOS = ESQUEMA_EMPLEADO.columnas
+COLUMNAS_DEPARTAMENTOS = ESQUEMA_DEPARTAMENTO.columnas
+
+
+def ruta_csv(csv_filename):
+    """Ruta absoluta de un CSV que está junto a los .py del gestor."""
+    return csv_filename if os.path.isabs(csv_filename) else os.path.join(BASE_DIR, csv_filename)
+
+
+def leer_csv(csv_path, esquema, **conjuntos):
+    """
+    Lee un CSV y lo valida con su esquema (ver validacion.py).
+
+    Los nombres de columna se normalizan (sin espacios y en minúsculas)
+    y se comprueba que estén todas las obligatorias. Las filas inválidas
+    se descartan y se imprime un resumen de sus errores.
+    """
+    import pandas as pd  # se importa al leer, no al arrancar la aplicación
+
+    # Leemos solo la cabecera para saber cómo se llaman de verdad las columnas
+    cabecera = pd.read_csv(csv_path, nrows=0).columns
+    reales = {c.strip().lower(): c for c in cabecera}
+
+    columnas = esquema.columnas
+    faltan = [c for c in columnas if c not in reales]
+    if faltan:
+        raise ValueError(f"Faltan columnas en {os.path.basename(csv_path)}: {', '.join(faltan)}")
+
+    with perfilado.tramo(f"leer {os.path.basename(csv_path)}"):
+        df = pd.read_csv(
+            csv_path,
+            usecols=[reales[c] for c in columnas],
+            dtype=str,
+            keep_default_na=False,
+        )
+    df.columns = df.columns.str.strip().str.lower()
+    with perfilado.tramo(f"validar {os.path.basename(csv_path)}"):
+        validacion = esquema.validar(df[list(columnas)], **conjuntos)
+    if not validacion.errores.empty:
+        print(f"{os.path.basename(csv_path)}: {resumen_errores(validacion.errores)}")
+    return validacion.validos.reset_index(drop=True)
+
+
+def leer_tabla(csv_path, esquema, **conjuntos):
+    """Como leer_csv, pero desde la caché binaria (cache_columnar.py) si está vigente."""
+    with perfilado.tramo(f"leer caché {os.path.basename(csv_path)}"):
+        df = cache_columnar.leer(csv_path, esquema.columnas)
+    return df if df is not None else leer_csv(csv_path, esquema, **conjuntos)
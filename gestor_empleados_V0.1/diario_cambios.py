@@ -0,0 +1,384 @@
+# ==========================================================
+# Diario de cambios (journal) con compactación periódica
+# ==========================================================
+# Guardar reescribiendo empleados.csv en cada clic costaría O(n) de
+# disco. En su lugar:
+#   - cada alta/baja/modificación se AÑADE al final de un diario
+#     (una línea JSON por cambio) y el fsync se hace por lotes
+#   - al arrancar se importa la última instantánea en segundo plano y
+#     se reaplican encima los cambios del diario, bloque a bloque
+#   - cada cierto número de cambios, un hilo en segundo plano escribe
+#     una instantánea nueva (instantanea_*.csv) y descarta el diario ya
+#     incluido. Los CSV del usuario solo se leen hasta la primera
+#     compactación y nunca se sobrescriben.
+#   - en el hilo de Tk solo se copian las columnas de empleados con numpy
+#     (AlmacenColumnar.foto) y se rota el diario; las filas y el CSV se
+#     montan en el hilo de la compactación
+#   - si la compactación falla, el segmento rotado (cambios.journal.1) se
+#     queda en disco, se avisa con al_fallar y la siguiente compactación
+#     le añade el diario actual en lugar de sustituirlo
+#
+# Cada línea lleva un número de secuencia. instantanea.json guarda el
+# último número incluido en la instantánea, y al reaplicar solo se usan
+# los posteriores. También guarda la marca de ids de cada entidad (ver
+# ids.py): con ella y los ids que aparecen en el diario, el id de un
+# registro borrado no se vuelve a dar después de reiniciar. Los cambios se reaplican como "dejar este registro así"
+# (upsert/borrado por id), por lo que repetir alguno ya incluido en la
+# instantánea no altera el resultado.
+import csv
+import json
+from contextlib import contextmanager
+import os
+import threading
+import time
+
+from cargador_csv import ruta_csv, COLUMNAS_EMPLEADOS, COLUMNAS_DEPARTAMENTOS
+import cache_columnar
+from registro_departamentos import valores_de
+
+LOTE_FSYNC = 64                  # cambios pendientes que fuerzan un fsync
+INTERVALO_FSYNC = 0.5            # segundos máximos sin fsync si hay pendientes
+UMBRAL_COMPACTACION = 10_000     # cambios en el diario que lanzan una compactación
+
+
+class DiarioCambios:
+    """Diario de cambios de empleados y departamentos sobre los CSV."""
+
+    def __init__(self, ruta_diario="cambios.journal", empleados_csv="empleados.csv",
+                 departamentos_csv="departamentos.csv", ruta_meta="instantanea.json",
+                 instantanea_empleados="instantanea_empleados.csv",
+                 instantanea_departamentos="instantanea_departamentos.csv", al_fallar=None):
+        """
+        al_fallar(error): se llama en el hilo que hace los cambios (el de Tk)
+        cuando una compactación ha fallado; los cambios siguen en el diario.
+        """
+        self.ruta = ruta_csv(ruta_diario)
+        self.ruta_anterior = self.ruta + ".1"  # segmento que se está compactando
+        self.empleados_csv = ruta_csv(empleados_csv)
+        self.departamentos_csv = ruta_csv(departamentos_csv)
+        self.ruta_meta = ruta_csv(ruta_meta)
+        # La compactación escribe aparte: los CSV del usuario no se pisan
+        # (conservan, por ejemplo, las filas que la validación rechazó)
+        self.instantanea_empleados = ruta_csv(instantanea_empleados)
+        self.instantanea_departamentos = ruta_csv(instantanea_departamentos)
+
+        meta = self._leer_meta()
+        self.seq = meta.get("seq", 0)  # último número de secuencia usado
+        self._marcas = meta.get("ids", {})  # {entidad: marca de ids} de la instantánea
+        self._asignadores = {}        # {entidad: AsignadorIds} cuya marca se guarda
+        self._en_diario = 0           # cambios escritos desde la última instantánea
+        self._pendientes = 0          # cambios escritos sin fsync
+        self._candado = threading.Lock()
+        self._archivo = None
+        self._compactando = None      # hilo de compactación en marcha
+        self._fallo = None            # error de la última compactación, aún sin avisar
+        self.al_fallar = al_fallar or (lambda error: print(f"No se pudo compactar el diario: {error}"))
+        self._cerrado = threading.Event()
+        self._hilo_fsync = None
+        self._repositorios = None
+        self._silenciado = 0          # >0 mientras se cargan datos que ya están en la instantánea
+        self._cargado = False         # no se compacta hasta tener la instantánea entera en memoria
+        # {entidad: {id: fila final o None si se borró}} del diario aún sin aplicar
+        self._por_reaplicar = {"empleados": {}, "departamentos": {}}
+
+    # ---------- arranque: instantánea + reaplicar el diario ----------
+    def fuentes(self):
+        """
+        CSV de la instantánea a importar (empleados, departamentos): los
+        que escribió la última compactación o, si aún no hay ninguna, los
+        del usuario.
+        """
+        if os.path.exists(self.ruta_meta) and os.path.exists(self.instantanea_empleados) \
+                and os.path.exists(self.instantanea_departamentos):
+            return self.instantanea_empleados, self.instantanea_departamentos
+        return self.empleados_csv, self.departamentos_csv
+
+    def conectar(self, empleados, departamentos, ids=None):
+        """
+        Empieza a registrar los cambios de los repositorios sin cargar nada.
+        La instantánea se importa en segundo plano: cada bloque pasa por
+        corregir() dentro de sin_registrar(), y al acabar se llama a
+        reaplicar_restantes() y a marcar_cargado().
+        ids: AsignadorIds de (empleados, departamentos); continúan desde la
+        marca guardada y desde los ids del diario, y su marca se guarda en
+        cada compactación.
+        """
+        self._unir_segmentos()
+        entradas = self._leer_entradas()
+        if entradas:
+            self.seq = max(self.seq, entradas[-1]["seq"])
+            self._en_diario = len(entradas)
+        self._por_reaplicar = _plegar(entradas)
+        self._asignadores = dict(zip(("empleados", "departamentos"), ids or ()))
+        for entidad, asignador in self._asignadores.items():
+            asignador.avanzar(self._marcas.get(entidad))
+        for entrada in entradas:
+            asignador = self._asignadores.get(entrada["e"])
+            for fila in (entrada["a"], entrada["n"]):
+                if asignador is not None and fila is not None and isinstance(fila[0], int):
+                    asignador.avanzar(fila[0] + 1)
+        self._abrir()
+        self._repositorios = (empleados, departamentos)
+        empleados.suscribir(lambda cambios: self.registrar("empleados", cambios))
+        departamentos.suscribir(lambda cambios: self.registrar("departamentos", cambios))
+
+    def corregir(self, entidad, df):
+        """
+        Aplica el diario a un bloque de la instantánea antes de añadirlo:
+        quita los registros borrados después y pone el estado final de los
+        modificados. Solo cuesta algo en los bloques que tienen alguno.
+        """
+        pendientes = self._por_reaplicar[entidad]
+        if not pendientes or df.empty:
+            return df
+        tocados = df["id"].isin(pendientes.keys())
+        if not tocados.any():
+            return df
+        import pandas as pd
+
+        columnas = list(df.columns)
+        filas = []
+        for fila, tocado in zip(zip(*(df[c].tolist() for c in columnas)), tocados.tolist()):
+            if tocado:
+                fila = pendientes.pop(fila[0], fila)
+                if fila is None:
+                    continue
+            filas.append(fila)
+        return pd.DataFrame(filas, columns=columnas).astype(df.dtypes.to_dict())
+
+    def reaplicar_restantes(self):
+        """
+        Añade los registros del diario que no estaban en la instantánea
+        (altas, o cambios de id) y devuelve cuántos entraron. Se llama al
+        terminar la importación; no se vuelven a escribir en el diario.
+        """
+        hechos = 0
+        with self.sin_registrar():
+            for entidad, repositorio in zip(("empleados", "departamentos"), self._repositorios):
+                pendientes = self._por_reaplicar[entidad]
+                hechos += repositorio.aplicar_cambios(
+                    [(None, fila) for fila in pendientes.values() if fila is not None])
+                pendientes.clear()
+        return hechos
+
+    @contextmanager
+    def sin_registrar(self):
+        """Los cambios hechos dentro del bloque no se escriben en el diario."""
+        self._silenciado += 1
+        try:
+            yield
+        finally:
+            self._silenciado -= 1
+
+    def marcar_cargado(self):
+        """La instantánea está entera en memoria: ya se puede compactar."""
+        self._cargado = True
+
+    def _leer_meta(self):
+        try:
+            with open(self.ruta_meta, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _leer_entradas(self):
+        """Entradas posteriores a la instantánea, del segmento antiguo y del actual."""
+        entradas = []
+        for ruta in (self.ruta_anterior, self.ruta):
+            if not os.path.exists(ruta):
+                continue
+            with open(ruta, encoding="utf-8") as f:
+                for linea in f:
+                    try:
+                        entrada = json.loads(linea)
+                    except ValueError:
+                        break  # última línea a medio escribir tras un corte: se descarta
+                    if entrada["seq"] > self.seq:
+                        entradas.append(entrada)
+        return entradas
+
+    def _unir_segmentos(self):
+        """
+        Si una compactación se cortó a medias, su segmento antiguo sigue en
+        disco: se une con el actual para que la próxima rotación no lo pise.
+        """
+        if not os.path.exists(self.ruta_anterior):
+            return
+        _reparar_cola(self.ruta_anterior)
+        if os.path.exists(self.ruta):
+            _reparar_cola(self.ruta)
+            _anadir_segmento(self.ruta, self.ruta_anterior)
+        os.replace(self.ruta_anterior, self.ruta)
+
+    # ---------- escritura ----------
+    def _abrir(self):
+        if os.path.exists(self.ruta):
+            _reparar_cola(self.ruta)
+        self._archivo = open(self.ruta, "a", encoding="utf-8")
+        self._hilo_fsync = threading.Thread(target=self._fsync_periodico, daemon=True)
+        self._hilo_fsync.start()
+
+    def registrar(self, entidad, cambios):
+        """Añade una lista de cambios (anterior, nuevo) al diario."""
+        if self._silenciado:
+            return
+        if self._fallo is not None:
+            self._avisar_fallo()
+        with self._candado:
+            for anterior, nuevo in cambios:
+                self.seq += 1
+                self._archivo.write(json.dumps(
+                    {"seq": self.seq, "e": entidad, "a": anterior, "n": nuevo}, ensure_ascii=False) + "\n")
+            self._pendientes += len(cambios)
+            self._en_diario += len(cambios)
+            if self._pendientes >= LOTE_FSYNC:
+                self._fsync()
+        if self._en_diario >= UMBRAL_COMPACTACION:
+            self.compactar()
+
+    def _fsync(self):
+        # Se llama con el candado cogido
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
+        self._pendientes = 0
+
+    def _fsync_periodico(self):
+        while not self._cerrado.wait(INTERVALO_FSYNC):
+            with self._candado:
+                if self._pendientes and self._archivo is not None:
+                    self._fsync()
+
+    def cerrar(self):
+        """Vuelca lo pendiente y espera a que termine la compactación en curso."""
+        self._cerrado.set()
+        if self._compactando is not None:
+            self._compactando.join()
+        if self._fallo is not None:
+            self._avisar_fallo()
+        with self._candado:
+            if self._archivo is not None:
+                self._fsync()
+                self._archivo.close()
+                self._archivo = None
+
+    # ---------- compactación ----------
+    def compactar(self):
+        """
+        Escribe una instantánea nueva en segundo plano.
+        Aquí (en el hilo que hace los cambios) solo se copian las columnas
+        y se rota el diario, así se puede seguir escribiendo mientras tanto.
+        Si la importación inicial no ha terminado (o se canceló) no se
+        hace nada: la instantánea perdería las filas que faltan.
+        """
+        if not self._cargado or self._repositorios is None or (self._compactando is not None and self._compactando.is_alive()):
+            return
+        if self._fallo is not None:
+            self._avisar_fallo()
+        empleados, departamentos = self._repositorios
+        foto_emp = empleados.foto()
+        filas_dep = [valores_de(d) for d in departamentos]
+        marcas = {entidad: asignador.marca() for entidad, asignador in self._asignadores.items()}
+
+        with self._candado:
+            self._fsync()
+            self._archivo.close()
+            if os.path.exists(self.ruta_anterior):
+                # La compactación anterior falló: su segmento no está en
+                # ninguna instantánea y no se puede pisar
+                _anadir_segmento(self.ruta, self.ruta_anterior)
+                os.remove(self.ruta)
+            else:
+                os.replace(self.ruta, self.ruta_anterior)
+            self._archivo = open(self.ruta, "a", encoding="utf-8")
+            seq = self.seq
+            self._en_diario = 0
+
+        self._compactando = threading.Thread(
+            target=self._escribir_instantanea, args=(foto_emp, filas_dep, seq, marcas), daemon=True)
+        self._compactando.start()
+
+    def _escribir_instantanea(self, foto_emp, filas_dep, seq, marcas):
+        try:
+            inicio = time.perf_counter()
+            filas_emp = _filas_de_foto(*foto_emp)
+            for ruta, columnas, filas in ((self.instantanea_empleados, COLUMNAS_EMPLEADOS, filas_emp),
+                                          (self.instantanea_departamentos, COLUMNAS_DEPARTAMENTOS, filas_dep)):
+                _escribir_csv_atomico(ruta, list(columnas), filas)
+                _guardar_cache(ruta, columnas, filas)
+            _escribir_atomico(self.ruta_meta, lambda f: json.dump({"seq": seq, "ids": marcas}, f))
+            # El segmento antiguo ya está dentro de la instantánea
+            os.remove(self.ruta_anterior)
+            print(f"Compactación hasta el cambio {seq} en {time.perf_counter() - inicio:.3f} s")
+        except Exception as e:  # disco lleno, permisos...: se avisa desde el hilo de Tk
+            self._fallo = e
+
+    def _avisar_fallo(self):
+        fallo, self._fallo = self._fallo, None
+        self.al_fallar(fallo)
+
+
+def _filas_de_foto(columnas, categorias):
+    """Tuplas (id, nombre, apellidos, edad, correo, departamento) de una foto del almacén."""
+    departamentos = [categorias[c] for c in columnas["departamento_codigo"].tolist()]
+    return list(zip(columnas["id"].tolist(), columnas["nombre"].tolist(), columnas["apellidos"].tolist(),
+                    columnas["edad"].tolist(), columnas["correo"].tolist(), departamentos))
+
+
+def _plegar(entradas):
+    """
+    Resume las entradas del diario en el estado final de cada registro:
+    {entidad: {id: fila o None si se borró}}.
+    """
+    tablas = {"empleados": {}, "departamentos": {}}
+    for entrada in entradas:
+        tabla = tablas[entrada["e"]]
+        anterior, nuevo = entrada["a"], entrada["n"]
+        if anterior is not None and (nuevo is None or anterior[0] != nuevo[0]):
+            tabla[anterior[0]] = None
+        if nuevo is not None:
+            tabla[nuevo[0]] = tuple(nuevo)
+    return tablas
+
+
+def _guardar_cache(ruta, columnas, filas):
+    """La caché binaria del CSV recién escrito (así el siguiente arranque no lo analiza)."""
+    import pandas as pd
+    try:
+        df = pd.DataFrame(filas, columns=list(columnas))
+        cache_columnar.guardar(ruta, df, columnas, cache_columnar.huella(ruta))
+    except (OSError, ValueError) as e:
+        print(f"No se pudo guardar la caché de {os.path.basename(ruta)}: {e}")
+
+
+def _reparar_cola(ruta):
+    """Quita una última línea a medio escribir (por un corte) antes de seguir añadiendo."""
+    with open(ruta, "rb+") as f:
+        datos = f.read()
+        if datos and not datos.endswith(b"\n"):
+            f.truncate(datos.rfind(b"\n") + 1)
+
+
+def _anadir_segmento(origen, destino):
+    """Añade el diario 'origen' al final de 'destino' (con fsync)."""
+    with open(destino, "a", encoding="utf-8") as f, open(origen, encoding="utf-8") as o:
+        f.write(o.read())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _escribir_atomico(ruta, escribir):
+    """Escribe en un temporal, hace fsync y lo renombra encima del original."""
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", newline="", encoding="utf-8") as f:
+        escribir(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+
+def _escribir_csv_atomico(ruta, cabecera, filas):
+    def escribir(f):
+        escritor = csv.writer(f)
+        escritor.writerow(cabecera)
+        escritor.writerows(filas)
+    _escribir_atomico(ruta, escribir)
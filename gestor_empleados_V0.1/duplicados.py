@@ -0,0 +1,246 @@
+# ==========================================================
+# Detección de personas repetidas (con otro id)
+# ==========================================================
+# La misma persona puede entrar dos veces con ids distintos: con y sin
+# tilde, con los apellidos en otro orden o con el correo en mayúsculas.
+# Comparar cada empleado con todos los demás es cuadrático, así que se
+# agrupan por claves normalizadas ("bloques") y solo se comparan los
+# empleados de un mismo bloque:
+#   - persona: palabras de nombre y apellidos sin tildes, en minúsculas
+#     y ordenadas ("Pérez García, Ana" y "Ana Garcia Perez" -> "ana garcia perez")
+#   - correo: sin espacios y en minúsculas
+# Cada pareja candidata se puntúa (PESOS) y las que llegan a UMBRAL se
+# proponen para fusionar: se conserva el primero y sobra el otro.
+#
+# IndiceDuplicados mantiene los bloques al día con los avisos del
+# repositorio (para avisar al dar de alta un empleado) y
+# buscar_duplicados() revisa un DataFrame entero de una vez.
+import numpy as np
+
+from indice_busqueda import palabras_de
+from repositorio_empleados import normalizar_correo
+
+# Lo que suma cada coincidencia a la puntuación (máximo 1)
+PESOS = {"nombre": 0.55, "correo": 0.3, "edad": 0.1, "departamento": 0.05}
+UMBRAL = 0.65
+# Un bloque con más empleados que esto se parte también por edad (nombres
+# muy comunes); si aun así es mayor, no se compara (y se cuenta)
+MAX_BLOQUE = 50
+
+
+def clave_persona(nombre, apellidos):
+    return " ".join(sorted(palabras_de(nombre) + palabras_de(apellidos)))
+
+
+def parecido_nombre(clave_a, clave_b):
+    """1 si las claves son iguales; si no, proporción de palabras en común (Jaccard)."""
+    if clave_a == clave_b:
+        return 1.0
+    a, b = set(clave_a.split()), set(clave_b.split())
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def puntuar(fila_a, fila_b, claves_a=None, claves_b=None):
+    """
+    Puntuación (0-1) y motivos de que dos filas (id, nombre, apellidos,
+    edad, correo, departamento) sean la misma persona.
+    """
+    claves_a = claves_a or _claves(fila_a)
+    claves_b = claves_b or _claves(fila_b)
+    nombre = parecido_nombre(claves_a[0], claves_b[0])
+    motivos = []
+    if nombre == 1.0:
+        motivos.append("mismo nombre")
+    elif nombre > 0:
+        motivos.append("nombre parecido")
+    coincide = {"correo": claves_a[1] == claves_b[1] != "",
+                "edad": fila_a[3] == fila_b[3],
+                "departamento": fila_a[5] == fila_b[5]}
+    motivos += [f"mismo {campo}" if campo != "edad" else "misma edad" for campo, si in coincide.items() if si]
+    puntuacion = PESOS["nombre"] * nombre + sum(PESOS[campo] for campo, si in coincide.items() if si)
+    return round(puntuacion, 3), motivos
+
+
+def _claves(fila):
+    return clave_persona(fila[1], fila[2]), normalizar_correo(fila[4])
+
+
+# ==========================================================
+# Índice incremental (altas desde el formulario)
+# ==========================================================
+class IndiceDuplicados:
+    """
+    Bloques por persona y por correo de los empleados de un repositorio.
+    Se construye la primera vez que se usa (con un millón de empleados
+    cuesta unos segundos) y a partir de ahí sigue los avisos del repositorio.
+    """
+
+    def __init__(self, repositorio):
+        self.repositorio = repositorio
+        self._por_persona = {}  # clave -> {id: None}
+        self._por_correo = {}   # clave -> {id: None}
+        self._claves = {}       # id -> (clave persona, clave correo)
+        self.listo = False
+        repositorio.suscribir(self.aplicar)
+
+    def _construir(self):
+        df = self.repositorio.dataframe()
+        personas = claves_persona(df["nombre"], df["apellidos"])
+        correos = df["correo"].str.strip().str.lower().tolist()
+        for emp_id, persona, correo in zip(df["id"].tolist(), personas.tolist(), correos):
+            self._poner(emp_id, persona, correo)
+        self.listo = True
+
+    def aplicar(self, cambios):
+        """Actualiza los bloques con una lista de cambios (anterior, nuevo) del repositorio."""
+        if not self.listo:
+            return  # se leerá todo al construirlo
+        for anterior, nuevo in cambios:
+            if anterior is not None:
+                self._quitar(anterior[0])
+            if nuevo is not None:
+                self._poner(nuevo[0], *_claves(nuevo))
+
+    def _poner(self, emp_id, persona, correo):
+        self._claves[emp_id] = (persona, correo)
+        self._por_persona.setdefault(persona, {})[emp_id] = None
+        if correo:
+            self._por_correo.setdefault(correo, {})[emp_id] = None
+
+    def _quitar(self, emp_id):
+        claves = self._claves.pop(emp_id, None)
+        if claves is None:
+            return
+        for indice, clave in zip((self._por_persona, self._por_correo), claves):
+            grupo = indice.get(clave)
+            if grupo is not None:
+                grupo.pop(emp_id, None)
+                if not grupo:
+                    del indice[clave]
+
+    def candidatos(self, fila, excepto=None):
+        """
+        Empleados que pueden ser la misma persona que 'fila' (tupla con los
+        campos del empleado), como [(puntuación, id, motivos)] de más a menos
+        parecido. excepto: id que no se cuenta (el propio empleado al editarlo).
+        """
+        if not self.listo:
+            self._construir()
+        claves = _claves(fila)
+        ids = dict.fromkeys(self._por_persona.get(claves[0], ()))
+        ids.update(dict.fromkeys(self._por_correo.get(claves[1], ()) if claves[1] else ()))
+        ids.pop(excepto, None)
+        resultado = []
+        for emp_id in ids:
+            otro = self.repositorio.obtener(emp_id).valores()
+            puntuacion, motivos = puntuar(fila, otro, claves, self._claves[emp_id])
+            if puntuacion >= UMBRAL:
+                resultado.append((puntuacion, emp_id, motivos))
+        return sorted(resultado, key=lambda c: -c[0])
+
+
+# ==========================================================
+# Revisión de un DataFrame entero
+# ==========================================================
+def claves_persona(nombres, apellidos):
+    """Array con la clave de persona de cada fila (se calcula una vez por pareja distinta)."""
+    import pandas as pd
+    codigos_n, nombres_u = pd.factorize(nombres)
+    codigos_a, apellidos_u = pd.factorize(apellidos)
+    ancho = max(len(apellidos_u), 1)
+    parejas, unicas = pd.factorize(codigos_n.astype(np.int64) * ancho + codigos_a)
+    palabras_n = _palabras_columna(nombres_u)
+    palabras_a = _palabras_columna(apellidos_u)
+    claves = np.array([" ".join(sorted(palabras_n[p // ancho] + palabras_a[p % ancho])) for p in unicas.tolist()],
+                      dtype=object)
+    return claves[parejas]
+
+
+def _palabras_columna(textos):
+    """
+    palabras_de() de cada texto distinto. Es la misma normalización que la
+    del buscador y la del índice incremental, así que las tres agrupan igual.
+    """
+    return [palabras_de(texto) for texto in textos]
+
+
+def _parejas_en_bloques(codigos, edades):
+    """
+    Posiciones (i, j), i < j, de las filas con el mismo código. Los bloques
+    de más de MAX_BLOQUE se parten por edad. Devuelve (i, j, bloques sin comparar).
+    """
+    orden = np.argsort(codigos, kind="stable")
+    ordenados = codigos[orden]
+    cortes = np.flatnonzero(np.diff(ordenados)) + 1
+    inicios = np.concatenate(([0], cortes))
+    finales = np.concatenate((cortes, [len(codigos)]))
+    tamanos = finales - inicios
+    # Los bloques de dos (casi todos) se emparejan de golpe
+    dos = inicios[tamanos == 2]
+    izquierda = [np.minimum(orden[dos], orden[dos + 1])]
+    derecha = [np.maximum(orden[dos], orden[dos + 1])]
+    omitidos = 0
+    for inicio, fin in zip(inicios[tamanos > 2].tolist(), finales[tamanos > 2].tolist()):
+        grupos = [orden[inicio:fin]]
+        if fin - inicio > MAX_BLOQUE:
+            bloque = orden[inicio:fin]
+            grupos = [bloque[edades[bloque] == edad] for edad in np.unique(edades[bloque])]
+        for grupo in grupos:
+            k = len(grupo)
+            if k < 2:
+                continue
+            if k > MAX_BLOQUE:
+                omitidos += 1
+                continue
+            i, j = np.triu_indices(k, 1)
+            izquierda.append(np.minimum(grupo[i], grupo[j]))
+            derecha.append(np.maximum(grupo[i], grupo[j]))
+    return np.concatenate(izquierda), np.concatenate(derecha), omitidos
+
+
+def buscar_duplicados(df):
+    """
+    Propuestas de fusión para los empleados de df (columnas de CAMPOS).
+    Devuelve (DataFrame con conservar, sobra, puntuacion y motivos, de más
+    a menos parecido; número de bloques demasiado grandes que no se han
+    comparado).
+    """
+    import pandas as pd
+
+    n = len(df)
+    personas = claves_persona(df["nombre"], df["apellidos"])
+    correos = df["correo"].astype(str).str.strip().str.lower().to_numpy(dtype=object)
+    edades = df["edad"].to_numpy()
+    departamentos = df["departamento"].to_numpy(dtype=object)
+
+    # Parejas de los dos bloqueos (sin repetir)
+    codigos_p = pd.factorize(personas)[0]
+    codigos_c = pd.factorize(correos)[0]
+    codigos_c[correos == ""] = np.arange(n)[correos == ""] + len(correos)  # un correo vacío no agrupa
+    i_p, j_p, omitidos_p = _parejas_en_bloques(codigos_p, edades)
+    i_c, j_c, omitidos_c = _parejas_en_bloques(codigos_c, edades)
+    parejas = np.unique(np.concatenate((i_p * n + j_p, i_c * n + j_c)))
+    i, j = parejas // n, parejas % n
+
+    # Puntuación vectorizada; el parecido de nombre solo se calcula si las claves no coinciden
+    mismo_nombre = personas[i] == personas[j]
+    nombre = mismo_nombre.astype(float)
+    distintos = np.flatnonzero(~mismo_nombre)
+    nombre[distintos] = [parecido_nombre(personas[a], personas[b]) for a, b in zip(i[distintos], j[distintos])]
+    coincide = {"correo": (correos[i] == correos[j]) & (correos[i] != ""),
+                "edad": edades[i] == edades[j],
+                "departamento": departamentos[i] == departamentos[j]}
+    puntuacion = PESOS["nombre"] * nombre + sum(PESOS[c] * coincide[c] for c in coincide)
+    buenas = puntuacion >= UMBRAL
+
+    motivos = np.where(mismo_nombre, "mismo nombre", np.where(nombre > 0, "nombre parecido", "")).astype(object)
+    for campo, texto in (("correo", "mismo correo"), ("edad", "misma edad"), ("departamento", "mismo departamento")):
+        motivos = np.where(coincide[campo], motivos + ", " + texto, motivos)
+    ids = df["id"].to_numpy()
+    sugerencias = pd.DataFrame({
+        "conservar": ids[i[buenas]],
+        "sobra": ids[j[buenas]],
+        "puntuacion": puntuacion[buenas].round(3),
+        "motivos": [m.lstrip(", ") for m in motivos[buenas]],
+    }).sort_values("puntuacion", ascending=False, kind="stable", ignore_index=True)
+    return sugerencias, omitidos_p + omitidos_c
@@ -0,0 +1,184 @@
+# ==========================================================
+# Deshacer y rehacer (historial de cambios)
+# ==========================================================
+# En lugar de guardar una copia de los datos por cada paso, el historial
+# guarda los cambios (anterior, nuevo) que ya avisan los repositorios.
+# Son las mismas tuplas que reciben la tabla, el diario y los índices,
+# así que no se copia nada: un paso ocupa lo que ocupa su cambio, no lo
+# que ocupan los datos (borrar 3 empleados de un millón guarda 3 tuplas).
+#
+# Deshacer un paso es aplicar sus cambios al revés y en orden inverso,
+# (nuevo, anterior), con aplicar_cambios() del repositorio; rehacer es
+# volver a aplicarlos tal cual. Como pasa por el repositorio, la tabla,
+# el diario o SQLite y los informes se enteran como de cualquier otro
+# cambio.
+#
+# Lo que se carga o se importa (instantánea, CSV, SQLite) se hace dentro
+# de sin_registrar(): no es algo que se quiera deshacer y llenaría el
+# historial. Los pasos más viejos se olvidan al pasar de MAX_PASOS o de
+# MAX_CAMBIOS cambios guardados entre deshacer y rehacer.
+import time
+from collections import deque
+from contextlib import contextmanager
+
+MAX_PASOS = 500
+MAX_CAMBIOS = 2_000_000  # tuplas guardadas en total (un paso enorme no se guarda)
+
+_VERBOS = (("Añadir", "alta"), ("Eliminar", "baja"), ("Modificar", "cambio"))
+
+
+class Paso:
+    """Un cambio hecho de una vez en un repositorio (un clic, una operación en bloque)."""
+
+    def __init__(self, fecha, nombre, cambios):
+        self.fecha = fecha      # time.time() del cambio original
+        self.nombre = nombre    # "empleados" o "departamentos"
+        self.cambios = cambios  # lista de (anterior, nuevo)
+
+    def inverso(self):
+        """Los cambios que lo deshacen."""
+        return [(nuevo, anterior) for anterior, nuevo in reversed(self.cambios)]
+
+    def __repr__(self):
+        return f"Paso({describir(self)!r})"
+
+
+def describir(paso):
+    """Texto para el usuario: "Eliminar 3 empleados", "Modificar 1 departamento"..."""
+    cuenta = {"alta": 0, "baja": 0, "cambio": 0}
+    for anterior, nuevo in paso.cambios:
+        cuenta["alta" if anterior is None else "baja" if nuevo is None else "cambio"] += 1
+    singular = paso.nombre[:-1] if paso.nombre.endswith("s") else paso.nombre
+    partes = [f"{verbo} {cuenta[tipo]} {singular if cuenta[tipo] == 1 else paso.nombre}"
+              for verbo, tipo in _VERBOS if cuenta[tipo]]
+    texto = ", ".join(partes)
+    return texto[:1] + texto[1:].lower() if partes else f"Sin cambios en {paso.nombre}"
+
+
+class Historial:
+    """Pilas de deshacer y rehacer sobre uno o varios repositorios."""
+
+    def __init__(self, max_pasos=MAX_PASOS, max_cambios=MAX_CAMBIOS):
+        self.max_pasos = max_pasos
+        self.max_cambios = max_cambios
+        self._repositorios = {}     # nombre -> repositorio con aplicar_cambios()
+        self._hechos = deque()      # pasos que se pueden deshacer, del más viejo al más nuevo
+        self._deshechos = []        # pasos que se pueden rehacer, el último es el siguiente
+        self._cambios = 0           # tuplas guardadas en las dos pilas
+        self._silenciado = 0        # >0 mientras se cargan o importan datos
+        self._aplicando = None      # [(nombre, cambios)] que avisan los repositorios al deshacer/rehacer
+        self._oyentes = []
+
+    def seguir(self, nombre, repositorio):
+        """Apunta como un paso cada aviso del repositorio."""
+        self._repositorios[nombre] = repositorio
+        repositorio.suscribir(lambda cambios: self.registrar(nombre, cambios))
+
+    @contextmanager
+    def sin_registrar(self):
+        """Los cambios hechos dentro del bloque no se pueden deshacer."""
+        self._silenciado += 1
+        try:
+            yield
+        finally:
+            self._silenciado -= 1
+
+    def registrar(self, nombre, cambios):
+        if not cambios:
+            return
+        if self._aplicando is not None:
+            self._aplicando.append((nombre, cambios))
+            return
+        if self._silenciado:
+            return
+        # Un cambio nuevo descarta lo que se había deshecho
+        self._cambios -= sum(len(p.cambios) for p in self._deshechos)
+        self._deshechos.clear()
+        if len(cambios) > self.max_cambios:
+            # No cabe: se olvida todo lo anterior para no deshacer sobre datos que ya no cuadran
+            self.olvidar()
+            return
+        self._hechos.append(Paso(time.time(), nombre, cambios))
+        self._cambios += len(cambios)
+        self._recortar()
+        self._avisar()
+
+    def _recortar(self):
+        while self._hechos and (len(self._hechos) > self.max_pasos or self._cambios > self.max_cambios):
+            self._cambios -= len(self._hechos.popleft().cambios)
+
+    def olvidar(self):
+        """Vacía las dos pilas (por ejemplo, al cambiar de fuente de datos)."""
+        self._hechos.clear()
+        self._deshechos.clear()
+        self._cambios = 0
+        self._avisar()
+
+    # ---------- consultas ----------
+    def puede_deshacer(self):
+        return bool(self._hechos)
+
+    def puede_rehacer(self):
+        return bool(self._deshechos)
+
+    def ultimos(self, n=10):
+        """Los n últimos pasos que se pueden deshacer, del más nuevo al más viejo."""
+        return [self._hechos[-i] for i in range(1, min(n, len(self._hechos)) + 1)]
+
+    # ---------- deshacer y rehacer ----------
+    def _aplicar(self, nombre, cambios):
+        """Aplica cambios a un repositorio y devuelve los que de verdad se hicieron."""
+        self._aplicando = []
+        try:
+            self._repositorios[nombre].aplicar_cambios(cambios)
+            return [c for _, lote in self._aplicando for c in lote]
+        finally:
+            self._aplicando = None
+
+    def deshacer(self, n=1):
+        """Deshace los n últimos pasos y devuelve los pasos deshechos."""
+        deshechos = []
+        while self._hechos and len(deshechos) < n:
+            paso = self._hechos.pop()
+            hechos = self._aplicar(paso.nombre, paso.inverso())
+            # Se guarda lo que de verdad se deshizo, para rehacer exactamente eso
+            rehacer = Paso(paso.fecha, paso.nombre, [(nuevo, anterior) for anterior, nuevo in reversed(hechos)])
+            self._deshechos.append(rehacer)
+            self._cambios += len(rehacer.cambios) - len(paso.cambios)
+            deshechos.append(paso)
+        self._avisar()
+        return deshechos
+
+    def rehacer(self, n=1):
+        """Rehace los n últimos pasos deshechos y devuelve los pasos rehechos."""
+        rehechos = []
+        while self._deshechos and len(rehechos) < n:
+            paso = self._deshechos.pop()
+            hechos = self._aplicar(paso.nombre, paso.cambios)
+            self._hechos.append(Paso(paso.fecha, paso.nombre, hechos))
+            self._cambios += len(hechos) - len(paso.cambios)
+            rehechos.append(paso)
+        self._avisar()
+        return rehechos
+
+    def restaurar(self, fecha):
+        """
+        Deja los datos como estaban justo antes de 'fecha' (time.time())
+        deshaciendo los pasos hechos desde entonces, el de 'fecha' incluido.
+        Devuelve los pasos deshechos.
+        """
+        n = 0
+        for paso in reversed(self._hechos):
+            if paso.fecha < fecha:
+                break
+            n += 1
+        return self.deshacer(n)
+
+    # ---------- avisos ----------
+    def suscribir(self, funcion):
+        """Registra una función sin argumentos que se llama cuando cambian las pilas."""
+        self._oyentes.append(funcion)
+
+    def _avisar(self):
+        for funcion in self._oyentes:
+            funcion()
@@ -0,0 +1,136 @@
+# ==========================================================
+# Asignación de ids sin colisiones (empleados y departamentos)
+# ==========================================================
+# Antes cada pestaña sacaba un id al azar entre 1000 y 9999 sin mirar
+# si ya existía. Un AsignadorIds sigue los avisos de un repositorio y
+# sabe qué ids están ocupados:
+#   - un mapa de bits con un bit por id (ocupado o libre)
+#   - un cursor: el id siguiente al mayor que se ha usado, dado o
+#     reservado. Todo lo que está por encima del cursor está libre, así
+#     que dar un id nuevo es O(1) y nunca choca con uno que ya esté en el
+#     repositorio (aunque se haya escrito a mano o haya llegado de un CSV)
+#   - con reutilizar=True, una pila de ids que han quedado libres al
+#     borrar; el mapa de bits dice al sacarlos si se han vuelto a ocupar
+#
+# reservar(n) aparta de golpe un rango de n ids consecutivos para una
+# importación (las filas que llegan sin id, ver importador.py).
+#
+# Sin reutilizar (lo que usa la aplicación) un id borrado no se vuelve a
+# dar, tampoco después de reiniciar: el cursor se guarda como "marca" en
+# instantanea.json (diario_cambios.py) y en la tabla contadores de SQLite
+# (almacen_sqlite.py), y al arrancar se recupera con avanzar().
+import threading
+
+INICIO = 1000       # primer id que se da a empleados y departamentos
+MAX_MAPA = 1 << 26  # ids que caben en el mapa de bits (8 MB); los mayores solo mueven el cursor
+
+
+class AsignadorIds:
+    """Ids enteros libres para los registros de un repositorio."""
+
+    def __init__(self, repositorio=None, ids=(), inicio=1, reutilizar=False):
+        """
+        repositorio: EmpleadoRepository o RegistroDepartamentos a seguir
+        ids: ids que ya están ocupados (lo que hubiera antes de suscribirse)
+        inicio: primer id que se puede dar
+        reutilizar: si se vuelven a dar los ids de los registros borrados
+        """
+        self.inicio = inicio
+        self.reutilizar = reutilizar
+        self._mapa = bytearray()
+        self._cursor = inicio
+        self._libres = []
+        # Se pide desde el hilo de Tk, desde el del importador (reservar)
+        # y desde los hilos de trabajo del servicio HTTP
+        self._candado = threading.Lock()
+        for valor in ids:
+            self.ocupar(valor)
+        if repositorio is not None:
+            repositorio.suscribir(self.aplicar)
+
+    # ---------- mapa de bits ----------
+    def ocupado(self, valor):
+        if not isinstance(valor, int) or valor < 0:
+            return False
+        if valor >= MAX_MAPA:
+            return False  # no se apunta: el cursor ya está por encima
+        byte = valor >> 3
+        return byte < len(self._mapa) and bool(self._mapa[byte] & (1 << (valor & 7)))
+
+    def _poner_bit(self, valor, ocupado):
+        byte = valor >> 3
+        if byte >= len(self._mapa):
+            if not ocupado:
+                return
+            # Crece al doble: ampliar el mapa es O(1) amortizado
+            self._mapa.extend(bytes(max(byte + 1, 2 * len(self._mapa)) - len(self._mapa)))
+        if ocupado:
+            self._mapa[byte] |= 1 << (valor & 7)
+        else:
+            self._mapa[byte] &= ~(1 << (valor & 7)) & 0xFF
+
+    # ---------- seguir al repositorio ----------
+    def ocupar(self, valor):
+        """Apunta un id como usado (los que no son enteros no cuentan)."""
+        if not isinstance(valor, int) or valor < 0:
+            return
+        with self._candado:
+            if valor < MAX_MAPA:
+                self._poner_bit(valor, True)
+            if valor >= self._cursor:
+                self._cursor = valor + 1
+
+    def liberar(self, valor):
+        """Apunta un id como libre (se ha borrado su registro)."""
+        if not isinstance(valor, int) or valor < 0 or valor >= MAX_MAPA:
+            return
+        with self._candado:
+            if not self.ocupado(valor):
+                return
+            self._poner_bit(valor, False)
+            if self.reutilizar and valor >= self.inicio:
+                self._libres.append(valor)
+
+    def aplicar(self, cambios):
+        """Actualiza el mapa con una lista de cambios (anterior, nuevo) del repositorio."""
+        for anterior, nuevo in cambios:
+            if anterior is not None and (nuevo is None or nuevo[0] != anterior[0]):
+                self.liberar(anterior[0])
+            if nuevo is not None:
+                self.ocupar(nuevo[0])
+
+    # ---------- marca (persistencia entre sesiones) ----------
+    def marca(self):
+        """Id siguiente al mayor que se ha usado, dado o reservado."""
+        with self._candado:
+            return self._cursor
+
+    def avanzar(self, marca):
+        """No da ningún id por debajo de 'marca' (la guardada en otra sesión)."""
+        if not isinstance(marca, int):
+            return
+        with self._candado:
+            self._cursor = max(self._cursor, marca)
+
+    # ---------- dar ids ----------
+    def siguiente(self):
+        """Un id que no está en el repositorio ni se ha dado antes (salvo reutilizados)."""
+        with self._candado:
+            while self._libres:
+                valor = self._libres.pop()
+                if not self.ocupado(valor):
+                    # Dado: si se libera otra vez no puede salir dos veces de la pila
+                    self._poner_bit(valor, True)
+                    return valor
+            valor = self._cursor
+            self._cursor += 1
+            return valor
+
+    def reservar(self, n):
+        """Aparta n ids consecutivos que nadie más recibirá; devuelve un range."""
+        if n < 0:
+            raise ValueError("No se puede reservar un número negativo de ids")
+        with self._candado:
+            primero = self._cursor
+            self._cursor += n
+            return range(primero, primero + n)
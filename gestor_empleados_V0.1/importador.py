@@ -0,0 +1,264 @@
+# ==========================================================
+# Importación de CSV en segundo plano, por bloques
+# ==========================================================
+# pandas se importa dentro del hilo de trabajo: la ventana aparece antes
+# de pagar su coste de importación.
+#
+# Un hilo de trabajo lee el CSV con pandas en bloques (chunksize),
+# valida cada bloque y lo deja en una cola. El hilo de Tk recoge los
+# bloques con after() y se los pasa poco a poco a la aplicación, así la
+# ventana sigue respondiendo y la tabla se puede usar mientras llega el
+# final del fichero. Se puede cancelar en cualquier momento.
+#
+# Si el CSV tiene caché binaria vigente (cache_columnar.py) no se analiza:
+# se lee la caché y se entrega en trozos más grandes. Si no la tiene, al
+# terminar de leerlo se guardan sus filas válidas como caché para el
+# siguiente arranque.
+#
+# Cada bloque se valida con los esquemas de validacion.py. Los
+# departamentos se leen antes que los empleados: sus nombres sirven para
+# avisar de los empleados con un departamento que no existe. Los valores
+# de los campos únicos (el id) se recuerdan de un bloque a otro: una fila
+# que repite el id de otro bloque sale en el informe de errores como
+# cualquier otra repetida.
+#
+# Si el paso tiene un AsignadorIds (ids.py), las filas que llegan sin id
+# se apartan hasta el final del fichero y reciben un rango consecutivo de
+# reservar(n): así no chocan con ningún id del fichero, tampoco con los
+# que aparecen después. Los ids que se dan quedan fijados en la caché
+# binaria del CSV (y en la siguiente compactación del diario).
+import os
+import queue
+import threading
+import time
+
+import perfilado
+import cache_columnar
+from cargador_csv import ruta_csv
+from validacion import ESQUEMA_EMPLEADO, ESQUEMA_DEPARTAMENTO
+
+FILAS_POR_BLOQUE = 20_000   # filas que lee pandas de cada vez (hilo de trabajo)
+FILAS_POR_TICK = 2_000      # filas que se entregan a Tk en cada after()
+FILAS_POR_TICK_CACHE = 50_000  # desde la caché no hay que analizar nada: trozos más grandes
+INTERVALO_MS = 10           # pausa entre entregas para que Tk pinte y atienda eventos
+BLOQUES_EN_COLA = 4         # el lector no se adelanta más que esto (memoria acotada)
+MAX_ERRORES = 10_000        # filas del informe de errores que se guardan (el recuento es exacto)
+
+
+class PasoImportacion:
+    """Un CSV a importar: su esquema de validación y qué hacer con cada bloque."""
+
+    def __init__(self, csv_filename, esquema, al_recibir, asignador=None):
+        self.ruta = ruta_csv(csv_filename)
+        self.esquema = esquema
+        self.tipos = esquema.columnas
+        self.columnas = list(esquema.columnas)
+        # Se llama en el hilo de Tk con un DataFrame válido; puede devolver cuántas filas aceptó
+        self.al_recibir = al_recibir
+        # AsignadorIds que da id a las filas que no lo traen (None: son filas inválidas)
+        self.asignador = asignador
+
+
+def paso_empleados(csv_filename, al_recibir, asignador=None):
+    return PasoImportacion(csv_filename, ESQUEMA_EMPLEADO, al_recibir, asignador)
+
+
+def paso_departamentos(csv_filename, al_recibir, asignador=None):
+    return PasoImportacion(csv_filename, ESQUEMA_DEPARTAMENTO, al_recibir, asignador)
+
+
+# ==========================================================
+# Importación
+# ==========================================================
+class ImportacionCSV:
+    """
+    Importa uno o varios CSV (en orden) sin bloquear Tk.
+
+    al_progreso(fraccion, texto) y al_terminar(resumen) se llaman en el hilo de Tk.
+    resumen es un diccionario con filas, descartadas, cancelada, error,
+    ids_asignados (filas que llegaron sin id y lo recibieron al importar),
+    segundos (lo que ha tardado la importación entera) y errores (informe
+    de validación de validacion.py con las columnas "fichero" y "linea"
+    además, o None si no hubo ninguno).
+    """
+
+    def __init__(self, widget, pasos, al_progreso=None, al_terminar=None):
+        self.widget = widget
+        self.pasos = pasos
+        self.al_progreso = al_progreso or (lambda fraccion, texto: None)
+        self.al_terminar = al_terminar or (lambda resumen: None)
+        self._cola = queue.Queue(maxsize=BLOQUES_EN_COLA)
+        self._cancelar = threading.Event()
+        self._hilo = threading.Thread(target=self._leer, name="importador", daemon=True)
+        self._total_bytes = sum(os.path.getsize(p.ruta) for p in pasos if os.path.exists(p.ruta)) or 1
+        self._bytes_previos = 0  # bytes de los ficheros ya terminados
+        self._actual = None      # (paso, bloque pendiente de entregar, posición, bytes)
+        self.resumen = {"filas": 0, "descartadas": 0, "cancelada": False, "error": None, "errores": None,
+                        "ids_asignados": 0, "segundos": 0.0}
+        self._errores = []       # informes de validación (hilo de trabajo; se leen al terminar)
+        self._n_errores = 0
+        self._ids_asignados = 0  # (hilo de trabajo; se lee al terminar)
+
+    def iniciar(self):
+        self._inicio = time.perf_counter()
+        self._hilo.start()
+        self.widget.after(INTERVALO_MS, self._entregar)
+
+    def cancelar(self):
+        self._cancelar.set()
+
+    # ---------- hilo de trabajo ----------
+    def _leer(self):
+        try:
+            import pandas as pd
+            conjuntos = {}  # {entidad: valores} para las reglas "en" de los esquemas
+            for indice, paso in enumerate(self.pasos):
+                if not os.path.exists(paso.ruta):
+                    continue
+                nombre = os.path.basename(paso.ruta)
+                huella = cache_columnar.huella(paso.ruta)
+                with perfilado.tramo(f"leer caché {nombre}"):
+                    cacheado = cache_columnar.leer(paso.ruta, paso.tipos)
+                if cacheado is not None:
+                    leidos = [cacheado]
+                    self._poner(("cache", indice, cacheado, 0, os.path.getsize(paso.ruta)))
+                else:
+                    leidos = []
+                    sin_id = []     # filas sin id, apartadas hasta conocer todos los ids del fichero
+                    vistos = {}     # valores de los campos únicos de los bloques anteriores
+                    # Con el perfilado activo, el tiempo propio de "leer ..." es la
+                    # espera a que Tk vacíe la cola; el resto son sus tramos hijos
+                    with open(paso.ruta, "rb") as f, perfilado.tramo(f"leer {nombre}"):
+                        lector = pd.read_csv(f, dtype=str, keep_default_na=False, chunksize=FILAS_POR_BLOQUE)
+                        while True:
+                            with perfilado.tramo("analizar bloque"):
+                                bloque = next(lector, None)
+                            if bloque is None:
+                                break
+                            if self._cancelar.is_set():
+                                return
+                            bloque.columns = bloque.columns.str.strip().str.lower()
+                            faltan = [c for c in paso.columnas if c not in bloque.columns]
+                            if faltan:
+                                raise ValueError(f"Faltan columnas en {nombre}: {', '.join(faltan)}")
+                            if paso.asignador is not None:
+                                vacio = bloque["id"].str.strip() == ""
+                                if vacio.any():
+                                    sin_id.append(bloque[vacio])
+                                    bloque = bloque[~vacio]
+                            self._validar_y_poner(paso, indice, bloque, conjuntos, vistos, nombre, leidos, f.tell())
+                        if sin_id:
+                            bloque = self._dar_ids(paso, pd.concat(sin_id), leidos)
+                            self._validar_y_poner(paso, indice, bloque, conjuntos, vistos, nombre, leidos, f.tell())
+                    self._guardar_cache(paso, leidos, huella)
+                if paso.esquema.clave_conjunto is not None:
+                    conjuntos[paso.esquema.entidad] = set().union(*(paso.esquema.conjunto(df) for df in leidos))
+                self._poner(("fichero", indice, None, 0, os.path.getsize(paso.ruta)))
+        except Exception as e:  # se informa en el hilo de Tk
+            self._poner(("error", None, None, 0, e))
+        finally:
+            self._poner(("fin", None, None, 0, None))
+
+    def _validar_y_poner(self, paso, indice, bloque, conjuntos, vistos, nombre, leidos, bytes_leidos):
+        # Con 'vistos' un id repetido en otro bloque sale en el informe, no se pierde en al_recibir
+        with perfilado.tramo("validar bloque"):
+            validacion = paso.esquema.validar(bloque[paso.columnas], vistos, **conjuntos)
+        self._apuntar_errores(validacion.errores, nombre)
+        leidos.append(validacion.validos)
+        self._poner(("bloque", indice, validacion.validos, validacion.descartadas, bytes_leidos))
+
+    def _dar_ids(self, paso, bloque, leidos):
+        """Pone a las filas sin id un rango reservado por encima de todos los ids del fichero."""
+        maximo = max((int(df["id"].max()) for df in leidos if len(df)), default=None)
+        if maximo is not None:
+            paso.asignador.avanzar(maximo + 1)
+        ids = paso.asignador.reservar(len(bloque))
+        self._ids_asignados += len(bloque)
+        return bloque.assign(id=[str(i) for i in ids])
+
+    def _apuntar_errores(self, errores, nombre):
+        """Guarda el informe de errores de un bloque (hasta MAX_ERRORES filas)."""
+        sitio = MAX_ERRORES - self._n_errores
+        if errores.empty or sitio <= 0:
+            return
+        # read_csv numera las filas desde 0 sin contar la cabecera: línea = fila + 2
+        errores = errores.head(sitio).assign(fichero=nombre, linea=lambda e: e["fila"] + 2)
+        self._errores.append(errores)
+        self._n_errores += len(errores)
+
+    def _guardar_cache(self, paso, leidos, huella):
+        """Guarda las filas válidas del CSV como caché (si falla, solo se avisa)."""
+        if not leidos:
+            return
+        import pandas as pd
+        try:
+            with perfilado.tramo(f"guardar caché {os.path.basename(paso.ruta)}"):
+                cache_columnar.guardar(paso.ruta, pd.concat(leidos, ignore_index=True), paso.tipos, huella)
+        except OSError as e:
+            print(f"No se pudo guardar la caché de {os.path.basename(paso.ruta)}: {e}")
+
+    def _poner(self, mensaje):
+        # Espera a que haya sitio en la cola, pero sin quedarse colgado si se cancela
+        while not self._cancelar.is_set():
+            try:
+                self._cola.put(mensaje, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    # ---------- hilo de Tk ----------
+    def _entregar(self):
+        if self._cancelar.is_set():
+            self.resumen["cancelada"] = True
+            self.al_terminar(self.resumen)
+            return
+
+        # Se entregan como mucho FILAS_POR_TICK filas y se devuelve el control a Tk
+        if self._actual is None:
+            try:
+                tipo, indice, df, descartadas, extra = self._cola.get_nowait()
+            except queue.Empty:
+                self.widget.after(INTERVALO_MS, self._entregar)
+                return
+            if tipo == "fin":
+                if self._errores:
+                    import pandas as pd
+                    self.resumen["errores"] = pd.concat(self._errores, ignore_index=True)
+                self.resumen["ids_asignados"] = self._ids_asignados
+                self.resumen["segundos"] = time.perf_counter() - self._inicio
+                self.al_progreso(1.0, self._texto())
+                self.al_terminar(self.resumen)
+                return
+            if tipo == "error":
+                self.resumen["error"] = extra
+                return self._entregar_despues()
+            if tipo == "fichero":
+                self._bytes_previos += extra
+                return self._entregar_despues()
+            self.resumen["descartadas"] += descartadas
+            por_tick = FILAS_POR_TICK_CACHE if tipo == "cache" else FILAS_POR_TICK
+            self._actual = [self.pasos[indice], df, 0, extra, por_tick]
+
+        paso, df, inicio, bytes_leidos, por_tick = self._actual
+        trozo = df.iloc[inicio:inicio + por_tick]
+        if len(trozo):
+            # al_recibir puede devolver cuántas filas aceptó (las demás eran repetidas)
+            anadidas = paso.al_recibir(trozo)
+            anadidas = len(trozo) if anadidas is None else anadidas
+            self.resumen["filas"] += anadidas
+            self.resumen["descartadas"] += len(trozo) - anadidas
+        self._actual[2] += por_tick
+        if self._actual[2] >= len(df):
+            self._actual = None
+        fraccion = min((self._bytes_previos + bytes_leidos) / self._total_bytes, 1.0)
+        self.al_progreso(fraccion, self._texto())
+        self._entregar_despues()
+
+    def _entregar_despues(self):
+        self.widget.after(INTERVALO_MS, self._entregar)
+
+    def _texto(self):
+        texto = f"{self.resumen['filas']:,} filas importadas".replace(",", ".")
+        if self.resumen["descartadas"]:
+            texto += f", {self.resumen['descartadas']} descartadas (inválidas o repetidas)"
+        return texto
@@ -0,0 +1,236 @@
+# ==========================================================
+# Índice de búsqueda de empleados (prefijos y trigramas)
+# ==========================================================
+# Busca en nombre, apellidos, correo y departamento sin recorrer todos
+# los empleados. El texto se normaliza (sin tildes y en minúsculas), así
+# "lopez" encuentra "pedro.lópez@empresa.com".
+#
+# Cada campo se parte en palabras ("pedro", "lopez", "empresa", "com")
+# y se guarda:
+#   - palabra  -> ids de los empleados que la tienen
+#   - lista ordenada de palabras, para buscar por prefijo con bisect
+#   - trigrama -> palabras que lo contienen, para buscar texto en medio
+#     de una palabra ("ópez")
+# Una consulta con varias palabras devuelve los empleados que cumplen
+# todas. Las palabras de menos de 3 letras se buscan como prefijo y las
+# demás como texto contenido en alguna palabra.
+#
+# El índice se suscribe al repositorio y se actualiza con cada cambio.
+# Con muchos empleados, la primera construcción se hace por partes con
+# after() (indexar_por_partes) para no congelar la ventana.
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+# Posiciones de los campos de texto en las filas del repositorio
+CAMPOS_BUSQUEDA = (1, 2, 4, 5)  # nombre, apellidos, correo, departamento
+LONGITUD_TRIGRAMA = 3
+# Con más palabras nuevas o quitadas de golpe (una importación) la lista
+# ordenada se rehace en la siguiente búsqueda en lugar de tocarla una a una
+MAX_INSERCIONES_ORDENADAS = 64
+FILAS_POR_TICK = 2_000  # empleados indexados en cada after() al construir por partes
+
+_PALABRA = re.compile(r"\w+")
+
+
+def normalizar_texto(texto):
+    """Quita tildes y pasa a minúsculas ("Pedro López" -> "pedro lopez")."""
+    texto = str(texto)
+    if texto.isascii():
+        return texto.lower()
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+def palabras_de(texto):
+    return _PALABRA.findall(normalizar_texto(texto))
+
+
+def _trigramas(palabra):
+    return {palabra[i:i + LONGITUD_TRIGRAMA] for i in range(len(palabra) - LONGITUD_TRIGRAMA + 1)}
+
+
+class IndiceBusqueda:
+    """Índice de búsqueda sobre un EmpleadoRepository (se mantiene solo)."""
+
+    def __init__(self, repositorio=None):
+        self._ids_de = {}        # palabra -> {id: None}
+        self._por_trigrama = {}  # trigrama -> {palabra: None}
+        self._ordenadas = []     # palabras en orden alfabético (None = hay que rehacerla)
+        self._normalizado = {}   # caché de textos ya normalizados (nombres y departamentos se repiten)
+        self.listo = True        # False mientras se construye por partes
+        if repositorio is not None:
+            self.aplicar([(None, fila) for fila in repositorio.filas()])
+            repositorio.suscribir(self.aplicar)
+
+    def indexar_por_partes(self, widget, repositorio, al_terminar=None):
+        """
+        Indexa los empleados del repositorio en tandas de FILAS_POR_TICK con
+        widget.after(). Se suscribe desde el principio: lo que cambie mientras
+        tanto se aplica al momento y la tanda que llegue a ese id vuelve a
+        indexar sus valores actuales (poner una palabra dos veces no cambia nada).
+        """
+        self.listo = False
+        repositorio.suscribir(self.aplicar)
+        pendientes = repositorio.ids()
+
+        def tanda(inicio=0):
+            filas = []
+            for emp_id in pendientes[inicio:inicio + FILAS_POR_TICK]:
+                emp = repositorio.obtener(emp_id)
+                if emp is not None:  # se ha borrado mientras tanto
+                    filas.append((None, emp.valores()))
+            self.aplicar(filas)
+            if inicio + FILAS_POR_TICK < len(pendientes):
+                widget.after(1, tanda, inicio + FILAS_POR_TICK)
+            else:
+                self.listo = True
+                if al_terminar is not None:
+                    al_terminar()
+
+        widget.after(1, tanda)
+
+    def __len__(self):
+        """Número de palabras distintas."""
+        return len(self._ids_de)
+
+    # ---------- mantenimiento ----------
+    def aplicar(self, cambios):
+        """Actualiza el índice con una lista de cambios (anterior, nuevo) del repositorio."""
+        # La lista ordenada se toca al final: una palabra que entra y sale
+        # en la misma tanda no llega a estar en ella
+        nuevas = {}    # palabras que entran en el índice en esta tanda
+        quitadas = []  # palabras de la lista ordenada que salen del índice
+        for anterior, nuevo in cambios:
+            if anterior is not None:
+                for palabra in self._palabras_fila(anterior):
+                    if self._quitar(palabra, anterior[0]):
+                        if palabra in nuevas:
+                            del nuevas[palabra]
+                        else:
+                            quitadas.append(palabra)
+            if nuevo is not None:
+                for palabra in self._palabras_fila(nuevo):
+                    if self._poner(palabra, nuevo[0]):
+                        nuevas[palabra] = None
+
+        if self._ordenadas is not None:
+            if len(nuevas) + len(quitadas) > MAX_INSERCIONES_ORDENADAS:
+                self._ordenadas = None
+            else:
+                for palabra in quitadas:
+                    del self._ordenadas[bisect_left(self._ordenadas, palabra)]
+                for palabra in nuevas:
+                    insort(self._ordenadas, palabra)
+
+    def _palabras_fila(self, fila):
+        palabras = set()
+        for posicion in CAMPOS_BUSQUEDA:
+            texto = fila[posicion]
+            normalizado = self._normalizado.get(texto)
+            if normalizado is None:
+                normalizado = _PALABRA.findall(normalizar_texto(texto))
+                # Los correos son únicos: no merece la pena guardarlos en la caché
+                if posicion != 4:
+                    self._normalizado[texto] = normalizado
+            palabras.update(normalizado)
+        return palabras
+
+    def _poner(self, palabra, emp_id):
+        """Devuelve True si la palabra es nueva en el índice."""
+        ids = self._ids_de.get(palabra)
+        if ids is not None:
+            ids[emp_id] = None
+            return False
+        self._ids_de[palabra] = {emp_id: None}
+        for trigrama in _trigramas(palabra):
+            self._por_trigrama.setdefault(trigrama, {})[palabra] = None
+        return True
+
+    def _quitar(self, palabra, emp_id):
+        """Devuelve True si la palabra sale del índice (nadie más la usa)."""
+        ids = self._ids_de.get(palabra)
+        if ids is None:
+            return False
+        ids.pop(emp_id, None)
+        if ids:
+            return False
+        # Nadie más usa la palabra: fuera de todos los índices
+        del self._ids_de[palabra]
+        for trigrama in _trigramas(palabra):
+            palabras = self._por_trigrama[trigrama]
+            del palabras[palabra]
+            if not palabras:
+                del self._por_trigrama[trigrama]
+        return True
+
+    # ---------- consultas ----------
+    def palabras_que_encajan(self, termino):
+        """Palabras del índice que empiezan por 'termino' (corto) o lo contienen."""
+        if len(termino) < LONGITUD_TRIGRAMA:
+            if self._ordenadas is None:
+                self._ordenadas = sorted(self._ids_de)
+            inicio = bisect_left(self._ordenadas, termino)
+            fin = bisect_left(self._ordenadas, termino + "\U0010ffff")
+            return self._ordenadas[inicio:fin]
+
+        # Se cruzan los conjuntos de palabras de cada trigrama, empezando por el menor
+        grupos = []
+        for trigrama in _trigramas(termino):
+            palabras = self._por_trigrama.get(trigrama)
+            if palabras is None:
+                return []
+            grupos.append(palabras)
+        grupos.sort(key=len)
+        candidatas = set(grupos[0]).intersection(*grupos[1:])
+        # Los trigramas no garantizan el orden: se comprueba el texto
+        return [palabra for palabra in candidatas if termino in palabra]
+
+    def buscar(self, texto, limite=None):
+        """
+        Ids de los empleados que encajan con todas las palabras de 'texto'
+        (como mucho 'limite'). Devuelve None si el texto no tiene palabras.
+        """
+        terminos = palabras_de(texto)
+        if not terminos:
+            return None
+
+        grupos = []
+        for termino in dict.fromkeys(terminos):
+            palabras = self.palabras_que_encajan(termino)
+            if not palabras:
+                return []
+            grupos.append([self._ids_de[p] for p in palabras])
+        # El término más selectivo primero: los demás solo filtran sus ids
+        grupos.sort(key=lambda conjuntos: sum(map(len, conjuntos)))
+
+        primero = grupos[0]
+        # Si un término encaja con muchas palabras, sus ids se juntan una vez en un conjunto
+        resto = [grupo if len(grupo) <= 8 else [set().union(*grupo)] for grupo in grupos[1:]]
+        resultado = []
+        vistos = set()
+        for ids in primero:
+            for emp_id in ids:
+                if emp_id in vistos:
+                    continue
+                vistos.add(emp_id)
+                if all(any(emp_id in otros for otros in grupo) for grupo in resto):
+                    resultado.append(emp_id)
+                    if limite is not None and len(resultado) >= limite:
+                        return resultado
+        return resultado
+
+    def coincide(self, fila, texto):
+        """
+        Comprueba una fila suelta con las mismas reglas que buscar(),
+        sin usar el índice (sirve para filtrar altas y cambios al vuelo).
+        """
+        terminos = palabras_de(texto)
+        palabras = self._palabras_fila(fila)
+        for termino in terminos:
+            if len(termino) < LONGITUD_TRIGRAMA:
+                if not any(p.startswith(termino) for p in palabras):
+                    return False
+            elif not any(termino in p for p in palabras):
+                return False
+        return True
@@ -0,0 +1,145 @@
+# ==========================================================
+# Ordenar una tabla por columnas con índices ya ordenados
+# ==========================================================
+# Por cada columna que se ha usado para ordenar se guarda una lista
+# ordenada de (clave, id). Se crea la primera vez que se pulsa la
+# cabecera (O(n log n)) y desde ahí se mantiene con bisect en cada alta,
+# baja o cambio, así volver a pulsar o invertir el orden no vuelve a
+# ordenar nada: la tabla virtual lee directamente el trozo de la lista
+# que está a la vista (VistaOrdenada).
+#
+# Las claves de texto se comparan sin tildes ni mayúsculas.
+from bisect import bisect_left, insort
+
+from indice_busqueda import normalizar_texto
+
+TEXTO = normalizar_texto  # clave para columnas de texto
+# Con más altas de golpe (una importación) se insertan todas y se reordena
+# la lista una vez (Timsort aprovecha que ya estaba casi ordenada); con
+# más bajas, la lista se filtra en una sola pasada
+MAX_INSERCIONES = 64
+FLECHAS = {False: " ▲", True: " ▼"}
+
+
+class IndiceOrden:
+    """Listas (clave, id) ordenadas por columna, mantenidas con bisect."""
+
+    def __init__(self, claves, fuente_filas):
+        """
+        claves: para cada posición de la fila, función que da la clave de
+                orden (None = el propio valor)
+        fuente_filas: función que devuelve todas las filas (para crear una lista)
+        """
+        self.claves = claves
+        self.fuente_filas = fuente_filas
+        self._listas = {}  # posición -> [(clave, id), ...]
+
+    def clave(self, posicion, fila):
+        """(clave de orden de la columna, id) de una fila."""
+        funcion = self.claves[posicion]
+        valor = fila[posicion]
+        return (funcion(valor) if funcion is not None else valor, fila[0])
+
+    def ordenados(self, posicion):
+        """Lista ordenada de (clave, id) de la columna (se crea si hace falta)."""
+        lista = self._listas.get(posicion)
+        if lista is None:
+            lista = sorted(self.clave(posicion, fila) for fila in self.fuente_filas())
+            self._listas[posicion] = lista
+        return lista
+
+    def posicion_de(self, posicion, fila):
+        """Lugar que ocupa la fila en el orden ascendente de la columna."""
+        return bisect_left(self.ordenados(posicion), self.clave(posicion, fila))
+
+    def aplicar(self, cambios):
+        """Mantiene las listas ya creadas con los cambios (anterior, nuevo)."""
+        for posicion, lista in self._listas.items():
+            bajas = [self.clave(posicion, anterior) for anterior, _ in cambios if anterior is not None]
+            altas = [self.clave(posicion, nuevo) for _, nuevo in cambios if nuevo is not None]
+            if len(bajas) > MAX_INSERCIONES:
+                # Muchas bajas (una operación en bloque): una pasada en lugar de un del por baja
+                quitar = set(bajas)
+                lista[:] = [clave for clave in lista if clave not in quitar]
+            else:
+                for clave in bajas:
+                    i = bisect_left(lista, clave)
+                    if i < len(lista) and lista[i] == clave:
+                        del lista[i]
+            if len(altas) > MAX_INSERCIONES:
+                lista.extend(altas)
+                lista.sort()
+            else:
+                for clave in altas:
+                    insort(lista, clave)
+
+
+class VistaOrdenada:
+    """Ids de una lista (clave, id) ordenada, al derecho o al revés, sin copiarla."""
+
+    def __init__(self, lista, descendente):
+        self.lista = lista
+        self.descendente = descendente
+
+    def __len__(self):
+        return len(self.lista)
+
+    def __getitem__(self, corte):
+        n = len(self.lista)
+        inicio, fin, _ = corte.indices(n)
+        if self.descendente:
+            trozo = self.lista[n - fin:n - inicio][::-1]
+        else:
+            trozo = self.lista[inicio:fin]
+        return [registro_id for _, registro_id in trozo]
+
+
+class OrdenTabla:
+    """
+    Ordena una TablaVirtual al pulsar sus cabeceras.
+    La primera pulsación ordena ascendente y la siguiente invierte el orden.
+    """
+
+    def __init__(self, tabla, columnas, claves, fuente_filas, valores_de):
+        """valores_de: función id -> fila (para ordenar pocos ids sueltos)."""
+        self.tabla = tabla
+        self.columnas = columnas
+        self.indice = IndiceOrden(claves, fuente_filas)
+        self.valores_de = valores_de
+        self.posicion = None     # columna por la que se ordena (None = sin orden)
+        self.descendente = False
+        for posicion, columna in enumerate(columnas):
+            tabla.heading(columna, command=lambda p=posicion: self.al_pulsar(p))
+
+    def al_pulsar(self, posicion):
+        self.descendente = self.posicion == posicion and not self.descendente
+        self.posicion = posicion
+        for p, columna in enumerate(self.columnas):
+            texto = columna + FLECHAS[self.descendente] if p == posicion else columna
+            self.tabla.heading(columna, text=texto)
+        self.tabla.ir_a(0)
+
+    def aplicar(self, cambios):
+        """Actualiza el índice. Se llama con todos los cambios del repositorio."""
+        self.indice.aplicar(cambios)
+
+    def vista(self, todos, ids=None):
+        """
+        Vista para la tabla en el orden elegido: 'todos' (vista de todos los
+        registros en su orden) o, si se da, solo la lista 'ids'.
+        """
+        if self.posicion is None:
+            return todos if ids is None else ids
+        lista = self.indice.ordenados(self.posicion)
+        if ids is None:
+            return VistaOrdenada(lista, self.descendente)
+        if len(ids) * 16 < len(lista):
+            # Pocos ids (una búsqueda): es más barato ordenar solo esos
+            claves = sorted(self.indice.clave(self.posicion, self.valores_de(i)) for i in ids)
+            ordenados = [registro_id for _, registro_id in claves]
+        else:
+            conjunto = set(ids)
+            ordenados = [registro_id for _, registro_id in lista if registro_id in conjunto]
+        if self.descendente:
+            ordenados.reverse()
+        return ordenados
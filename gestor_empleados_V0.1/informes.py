@@ -0,0 +1,243 @@
+# ==========================================================
+# Informes: cálculo y dibujo separados
+# ==========================================================
+# Cada informe tiene tres partes:
+#   - datos():            copia barata de lo que necesita (en el hilo de Tk)
+#   - calcular(datos):    el trabajo pesado (en un hilo de trabajo)
+#   - dibujar(fig, res, artistas): pinta en una Figure ya existente y, si
+#     el informe ya estaba dibujado, actualiza sus artistas en el sitio
+#     en lugar de crear una figura nueva
+# Aquí no hay Tk ni pyplot: se puede usar también sin ventana (backend Agg).
+import numpy as np
+import pandas as pd
+
+BINS_EDADES = 10
+
+
+# ==========================================================
+# Fuentes de datos (agregados en memoria o SQLite)
+# ==========================================================
+# preparar(consulta) se llama en el hilo de Tk y devuelve una función sin
+# argumentos que el hilo de trabajo llama para obtener el resultado.
+class FuenteMemoria:
+    """Lee de los agregados que se mantienen en memoria."""
+
+    def __init__(self, agregados, departamentos):
+        self.agregados = agregados
+        self.departamentos = departamentos
+
+    def preparar(self, consulta):
+        # Los agregados cambian en el hilo de Tk: se copian aquí (coste O(departamentos))
+        valor = getattr(self, consulta)()
+        return lambda: valor
+
+    def plantilla(self):
+        return self.agregados.plantilla_por_departamento()
+
+    def recuento_edades(self):
+        return self.agregados.recuento_edades()
+
+    def necesarios_vs_reales(self):
+        plantilla = self.agregados.plantilla_por_departamento()
+        return [(d.nombre, d.empleados_necesarios, plantilla.get(d.nombre, 0)) for d in self.departamentos]
+
+
+class FuenteSQL:
+    """
+    Lee con agregados SQL. Cada consulta abre su propia conexión, así se
+    puede usar desde el hilo de trabajo (sqlite3 no comparte conexiones
+    entre hilos).
+    """
+
+    def __init__(self, almacen):
+        self.ruta = almacen.ruta
+
+    def preparar(self, consulta):
+        # La consulta (lo caro) se hace después, en el hilo de trabajo
+        return lambda: getattr(self, consulta)()
+
+    def _consultar(self, metodo):
+        from almacen_sqlite import AlmacenSQLite
+        almacen = AlmacenSQLite(self.ruta)
+        try:
+            return getattr(almacen, metodo)()
+        finally:
+            almacen.cerrar()
+
+    def plantilla(self):
+        return self._consultar("plantilla_por_departamento")
+
+    def recuento_edades(self):
+        return self._consultar("recuento_edades")
+
+    def necesarios_vs_reales(self):
+        return self._consultar("necesarios_vs_reales")
+
+
+class FuenteDataFrame:
+    """
+    Lee de DataFrames de empleados y departamentos ya cargados (informes
+    sin ventana, informes_lote.py). Se calcula todo en el momento.
+    """
+
+    def __init__(self, empleados, departamentos):
+        self.empleados = empleados
+        self.departamentos = departamentos
+
+    def preparar(self, consulta):
+        return lambda: getattr(self, consulta)()
+
+    def plantilla(self):
+        return self.empleados["departamento"].value_counts(sort=False).to_dict()
+
+    def recuento_edades(self):
+        return self.empleados["edad"].value_counts(sort=False).to_dict()
+
+    def necesarios_vs_reales(self):
+        plantilla = self.plantilla()
+        return [(nombre, necesarios, plantilla.get(nombre, 0))
+                for nombre, necesarios in zip(self.departamentos["nombre"].tolist(),
+                                              self.departamentos["empleados_necesarios"].tolist())]
+
+
+class SinDatos(Exception):
+    """El informe no se puede generar con los datos actuales (se avisa al usuario)."""
+
+
+# ==========================================================
+# Informes
+# ==========================================================
+class Informe:
+    clave = ""     # nombre corto (ficheros de informes_lote.py, caché de resultados)
+    titulo = ""
+    consulta = ""  # método de la fuente de datos que usa el informe
+    depende = ("empleados",)  # datos que, si cambian, cambian el resultado
+
+    def datos(self, fuente):
+        """Se llama en el hilo de Tk; el resultado se pasa a calcular()."""
+        return fuente.preparar(self.consulta)
+
+    def calcular(self, datos):
+        raise NotImplementedError
+
+    def dibujar(self, fig, resultado, artistas=None):
+        """Devuelve los artistas creados/actualizados para el próximo dibujo."""
+        raise NotImplementedError
+
+
+class InformePlantilla(Informe):
+    clave = "plantilla"
+    titulo = "Empleados por departamento (grafico circular)"
+    consulta = "plantilla"
+
+    def calcular(self, datos):
+        conteo = pd.Series(datos(), dtype=int).sort_values(ascending=False)
+        if conteo.empty:
+            raise SinDatos("No hay empleados cargados para generar el informe.")
+        return conteo
+
+    def dibujar(self, fig, conteo, artistas=None):
+        # Si no cambia el número de departamentos se mueven los sectores existentes
+        if artistas is not None and len(artistas["sectores"]) == len(conteo):
+            ax = artistas["ax"]
+            angulos = 90 + 360 * np.concatenate(([0], np.cumsum(conteo.values))) / conteo.sum()
+            for sector, texto, inicio, fin, n in zip(artistas["sectores"], artistas["textos"],
+                                                      angulos[:-1], angulos[1:], conteo.values):
+                sector.set_theta1(inicio)
+                sector.set_theta2(fin)
+                medio = np.deg2rad((inicio + fin) / 2)
+                texto.set_position((0.6 * np.cos(medio), 0.6 * np.sin(medio)))
+                texto.set_text(f"{100 * n / conteo.sum():.1f}%")
+            for etiqueta, nombre in zip(artistas["leyenda"].get_texts(), conteo.index):
+                etiqueta.set_text(nombre)
+            return artistas
+
+        fig.clear()
+        ax = fig.add_subplot()
+        sectores, _, textos = ax.pie(conteo.values, labels=None, autopct="%1.1f%%", startangle=90)
+        ax.set_title("Distribución de empleados por departamento")
+        ax.axis("equal")
+        # Leyenda aparte (queda limpio)
+        leyenda = ax.legend(sectores, conteo.index, title="Departamento",
+                            loc="center left", bbox_to_anchor=(1.0, 0.5))
+        return {"ax": ax, "sectores": sectores, "textos": textos, "leyenda": leyenda}
+
+
+class InformeEdades(Informe):
+    clave = "edades"
+    titulo = "Distribución de edades (histograma)"
+    consulta = "recuento_edades"
+
+    def calcular(self, datos):
+        recuento = datos()
+        if not recuento:
+            raise SinDatos("No hay empleados cargados para generar el informe.")
+        # por si hay edades 0 por errores de entrada
+        edades = {edad: n for edad, n in recuento.items() if edad > 0}
+        if not edades:
+            raise SinDatos("No hay edades válidas para generar el informe.")
+        # Recuento por edad ya agregado: el histograma se calcula con pesos
+        return np.histogram(list(edades), bins=BINS_EDADES, weights=list(edades.values()))
+
+    def dibujar(self, fig, resultado, artistas=None):
+        alturas, bordes = resultado
+        if artistas is None:
+            fig.clear()
+            ax = fig.add_subplot()
+            barras = ax.bar(bordes[:-1], alturas, width=np.diff(bordes), align="edge")
+            ax.set_title("Distribución de edades")
+            ax.set_xlabel("Edad")
+            ax.set_ylabel("Frecuencia")
+            return {"ax": ax, "barras": barras}
+
+        # Siempre hay BINS_EDADES barras: solo cambian posición y altura
+        for barra, x, ancho, altura in zip(artistas["barras"], bordes[:-1], np.diff(bordes), alturas):
+            barra.set_x(x)
+            barra.set_width(ancho)
+            barra.set_height(altura)
+        artistas["ax"].relim()
+        artistas["ax"].autoscale_view()
+        return artistas
+
+
+class InformeNecesarios(Informe):
+    clave = "necesarios"
+    titulo = "Necesarios vs reales por departamento (comparativo)"
+    consulta = "necesarios_vs_reales"
+    depende = ("empleados", "departamentos")
+
+    def calcular(self, datos):
+        # Necesarios (desde departamentos) y reales (agregados) unidos en una tabla
+        df = pd.DataFrame(datos(), columns=["departamento", "necesarios", "reales"])
+        if df.empty:
+            raise SinDatos("No hay departamentos cargados.")
+        if not df["reales"].any():
+            raise SinDatos("No hay empleados cargados.")
+        return df
+
+    def dibujar(self, fig, df, artistas=None):
+        x = np.arange(len(df))
+        if artistas is not None and len(artistas["necesarios"]) == len(df):
+            for barras, columna in ((artistas["necesarios"], "necesarios"), (artistas["reales"], "reales")):
+                for barra, altura in zip(barras, df[columna]):
+                    barra.set_height(altura)
+            ax = artistas["ax"]
+            ax.set_xticks(x, df["departamento"], rotation=30, ha="right")
+            ax.relim()
+            ax.autoscale_view()
+            return artistas
+
+        fig.clear()
+        ax = fig.add_subplot()
+        necesarios = ax.bar(x - 0.2, df["necesarios"], width=0.4, label="Necesarios")
+        reales = ax.bar(x + 0.2, df["reales"], width=0.4, label="Reales")
+        ax.set_xticks(x, df["departamento"], rotation=30, ha="right")
+        ax.set_title("Empleados necesarios vs empleados reales (por departamento)")
+        ax.set_xlabel("Departamento")
+        ax.set_ylabel("Cantidad")
+        ax.legend()
+        return {"ax": ax, "necesarios": necesarios, "reales": reales}
+
+
+# Informes disponibles, en el orden del selector
+INFORMES = {informe.titulo: informe for informe in (InformePlantilla(), InformeEdades(), InformeNecesarios())}
@@ -0,0 +1,154 @@
+# ==========================================================
+# Informes por lotes, sin ventana (backend Agg)
+# ==========================================================
+# Genera todos los informes de INFORMES para muchos pares de CSV de
+# empleados y departamentos (uno por región, por ejemplo) y los guarda
+# como imagen. Cada par se procesa en un proceso distinto, así los
+# informes de varias regiones se dibujan a la vez.
+#
+# Uso:
+#   python informes_lote.py norte/ sur/ --salida informes --formatos png pdf
+#   python informes_lote.py --par emp_este.csv dep_este.csv --procesos 4
+#
+# Una carpeta cuenta como un par si tiene empleados.csv y departamentos.csv.
+# Los ficheros se escriben en <salida>/<nombre del par>/<informe>.<formato>
+# y al terminar se imprime cuánto ha tardado cada informe.
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use("Agg")  # antes de que nada importe pyplot: sin Tk ni pantalla
+from matplotlib.figure import Figure
+
+from cargador_csv import leer_tabla
+from informes import INFORMES, FuenteDataFrame, SinDatos
+from validacion import ESQUEMA_EMPLEADO, ESQUEMA_DEPARTAMENTO
+
+FORMATOS = ("png", "svg", "pdf")
+TAMANO_FIGURA = (8, 4.5)
+DPI = 100
+
+
+def _pares(carpetas, pares):
+    """Lista de (nombre, csv de empleados, csv de departamentos)."""
+    resultado = []
+    for carpeta in carpetas:
+        nombre = os.path.basename(os.path.normpath(carpeta))
+        resultado.append((nombre, os.path.join(carpeta, "empleados.csv"),
+                          os.path.join(carpeta, "departamentos.csv")))
+    for csv_empleados, csv_departamentos in pares:
+        nombre = os.path.splitext(os.path.basename(csv_empleados))[0]
+        resultado.append((nombre, csv_empleados, csv_departamentos))
+
+    # Dos pares con el mismo nombre escribirían en la misma carpeta
+    vistos = defaultdict(int)
+    for i, (nombre, *rutas) in enumerate(resultado):
+        vistos[nombre] += 1
+        if vistos[nombre] > 1:
+            resultado[i] = (f"{nombre}_{vistos[nombre]}", *rutas)
+    return resultado
+
+
+# ==========================================================
+# Trabajo de cada proceso
+# ==========================================================
+def generar_par(nombre, csv_empleados, csv_departamentos, salida, formatos):
+    """
+    Genera todos los informes de un par de CSV.
+    Devuelve (nombre, segundos de carga, [(clave, estado, segundos), ...]).
+    """
+    inicio = time.perf_counter()
+    fuente = FuenteDataFrame(leer_tabla(csv_empleados, ESQUEMA_EMPLEADO),
+                             leer_tabla(csv_departamentos, ESQUEMA_DEPARTAMENTO))
+    carga = time.perf_counter() - inicio
+
+    carpeta = os.path.join(salida, nombre)
+    os.makedirs(carpeta, exist_ok=True)
+    tiempos = []
+    # Una sola Figure por proceso: cada informe la limpia al dibujar
+    figura = Figure(figsize=TAMANO_FIGURA, dpi=DPI)
+    for informe in INFORMES.values():
+        inicio = time.perf_counter()
+        try:
+            resultado = informe.calcular(informe.datos(fuente))
+        except SinDatos as e:
+            tiempos.append((informe.clave, f"sin datos: {e}", time.perf_counter() - inicio))
+            continue
+        informe.dibujar(figura, resultado)
+        figura.tight_layout()
+        for formato in formatos:
+            figura.savefig(os.path.join(carpeta, f"{informe.clave}.{formato}"), format=formato)
+        tiempos.append((informe.clave, "ok", time.perf_counter() - inicio))
+    return nombre, carga, tiempos
+
+
+# ==========================================================
+# Resumen de tiempos
+# ==========================================================
+def imprimir_resumen(resultados, segundos_totales, procesos):
+    por_informe = defaultdict(list)
+    for _, carga, tiempos in resultados:
+        por_informe["(carga de CSV)"].append(carga)
+        for clave, estado, segundos in tiempos:
+            if estado == "ok":
+                por_informe[clave].append(segundos)
+
+    print()
+    print(f"{'Informe':<20}{'veces':>7}{'total s':>10}{'media ms':>10}{'máx ms':>10}")
+    for clave, lista in por_informe.items():
+        print(f"{clave:<20}{len(lista):>7}{sum(lista):>10.2f}"
+              f"{1000 * sum(lista) / len(lista):>10.1f}{1000 * max(lista):>10.1f}")
+    print(f"\n{len(resultados)} pares en {segundos_totales:.2f} s con {procesos} procesos")
+
+
+def leer_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Genera los informes del gestor sin ventana")
+    parser.add_argument("carpetas", nargs="*",
+                        help="carpetas con empleados.csv y departamentos.csv")
+    parser.add_argument("--par", nargs=2, action="append", default=[],
+                        metavar=("EMPLEADOS", "DEPARTAMENTOS"), help="un par de CSV (se puede repetir)")
+    parser.add_argument("--salida", default="informes", help="carpeta donde se guardan los informes")
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=["png"])
+    parser.add_argument("--procesos", type=int, default=os.cpu_count(),
+                        help="procesos a la vez (por defecto, uno por núcleo)")
+    argumentos = parser.parse_args(argv)
+    if not argumentos.carpetas and not argumentos.par:
+        parser.error("indica al menos una carpeta o un --par de CSV")
+    return argumentos
+
+
+def main(argv=None):
+    argumentos = leer_argumentos(argv)
+    pares = _pares(argumentos.carpetas, argumentos.par)
+    procesos = max(1, min(argumentos.procesos, len(pares)))
+
+    inicio = time.perf_counter()
+    resultados = []
+    errores = 0
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        futuros = {ejecutor.submit(generar_par, nombre, emp, dep, argumentos.salida,
+                                   argumentos.formatos): nombre
+                   for nombre, emp, dep in pares}
+        for futuro in as_completed(futuros):
+            nombre = futuros[futuro]
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                errores += 1
+                print(f"[{nombre}] error: {e}")
+                continue
+            resultados.append(resultado)
+            for clave, estado, segundos in resultado[2]:
+                print(f"[{nombre}] {clave}: {estado} ({1000 * segundos:.0f} ms)")
+
+    if resultados:
+        imprimir_resumen(resultados, time.perf_counter() - inicio, procesos)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
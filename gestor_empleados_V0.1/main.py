@@ -1,9 +1,17 @@
 import os
+import argparse
+
+# El perfilado (--profile-startup o GESTOR_PERFIL=1) tiene que empezar
+# antes de importar el resto para poder medir las importaciones
+import perfilado
+if perfilado.pedido():
+    perfilado.activar()
+
 import tkinter as tk
-from tkinter import ttk
-from pestana_empleado import init_empleado
-from pestana_departamentos import init_departamentos
-from pestana_informes import init_informes
+from tkinter import ttk, messagebox
+from pestana_empleado import (init_empleado, init_progreso, init_historial, empleados, importar_csv,
+                              recibir_empleados, historial, ids_empleados)
+from pestana_departamentos import init_departamentos, departamentos, recibir_departamentos, ids_departamentos
 
 
 # Obtenemos la ruta actual del archivo
@@ -59,20 +67,131 @@ def init_inicio(pestanas):
 
 
 
+def init_informes_perezoso(pestanas, almacen=None):
+    # matplotlib (lo más pesado de importar) solo se carga si se abren los informes
+    from pestana_informes import init_informes, usar_sql
+    if almacen is not None:
+        usar_sql(almacen)
+    init_informes(pestanas)
+
+
+def construir_al_abrir(pestanas, almacen=None):
+    """
+    Cada pestaña se construye la primera vez que se abre (<<NotebookTabChanged>>),
+    así la ventana aparece sin esperar a las tablas ni a matplotlib.
+    Las tablas se pintan con lo que haya cargado en ese momento y desde
+    ahí siguen a sus repositorios.
+    """
+    pendientes = {
+        1: perfilado.medido(init_empleado),
+        2: perfilado.medido(init_departamentos),
+        3: perfilado.medido(lambda pestanas: init_informes_perezoso(pestanas, almacen), "init_informes"),
+    }
+
+    def al_cambiar_pestana(event):
+        init = pendientes.pop(pestanas.index(pestanas.select()), None)
+        if init is not None:
+            init(pestanas)
+
+    pestanas.bind("<<NotebookTabChanged>>", al_cambiar_pestana)
+
+
+def leer_argumentos():
+    parser = argparse.ArgumentParser(description="Gestor de Empleados")
+    parser.add_argument("--sqlite", metavar="RUTA", default=os.environ.get("GESTOR_SQLITE"),
+                        help="guardar los datos en una base de datos SQLite (se crea desde los CSV si no existe)")
+    parser.add_argument(perfilado.OPCION, action="store_true",
+                        help="medir el arranque y escribir perfil_arranque.json y perfil_arranque.folded "
+                             f"(también con {perfilado.VARIABLE_ENTORNO}=1)")
+    return parser.parse_args()
+
+
+def conectar_sqlite(ruta):
+    from almacen_sqlite import AlmacenSQLite, conectar_repositorios
+    almacen = AlmacenSQLite(ruta)
+    # Lo que ya estaba guardado no se puede deshacer
+    with historial.sin_registrar():
+        conectar_repositorios(almacen, empleados, departamentos, ids=(ids_empleados, ids_departamentos))
+    return almacen
+
+
+def abrir_diario():
+    """
+    Abre el diario de cambios y devuelve los pasos para importar la
+    instantánea en segundo plano una vez creada la ventana. Los cambios
+    del diario se aplican a cada bloque al llegar (ver DiarioCambios.corregir)
+    y los que quedan, al terminar la importación.
+    """
+    from diario_cambios import DiarioCambios
+    from importador import paso_empleados, paso_departamentos
+    diario = DiarioCambios(al_fallar=lambda error: messagebox.showerror(
+        "Diario de cambios", f"No se pudo guardar la instantánea de los datos:\n{error}\n\n"
+                             "Los cambios siguen guardados en el diario; se volverá a intentar."))
+    diario.conectar(empleados, departamentos, ids=(ids_empleados, ids_departamentos))
+
+    # Lo que llega de la instantánea ya está en disco: no se apunta en el diario
+    def sin_diario(entidad, recibir):
+        def recibir_sin_diario(df):
+            with diario.sin_registrar():
+                return recibir(diario.corregir(entidad, df))
+        return recibir_sin_diario
+
+    csv_empleados, csv_departamentos = diario.fuentes()
+    pasos = [paso_departamentos(csv_departamentos, sin_diario("departamentos", recibir_departamentos),
+                                ids_departamentos),
+             paso_empleados(csv_empleados, sin_diario("empleados", recibir_empleados), ids_empleados)]
+    return diario, pasos
+
+
 def main():
+    args = leer_argumentos()
     root = tk.Tk()
+    # Los datos se cargan y se guardan en SQLite o, por defecto, en los CSV
+    # más un diario de cambios
+    pasos, almacen = [], None
+    if args.sqlite:
+        with perfilado.tramo("cargar datos (SQLite)"):
+            almacen = conectar_sqlite(args.sqlite)
+    else:
+        with perfilado.tramo("abrir diario"):
+            diario, pasos = abrir_diario()
+
+        def cerrar():
+            diario.cerrar()
+            root.destroy()
+
+        root.protocol("WM_DELETE_WINDOW", cerrar)
     # Lanzamos la ventana principal de la aplicación
     ventana_principal(root)
     # Creamos las pestañas de la aplicación
     pestanas = crear_pestanas(root)
-    # Añadimos contenido a la pestaña de inicio
-    init_inicio(pestanas)
-    # Añadimos contenido a la pestaña de empleados
-    init_empleado(pestanas)
-    # Añadimos contenido a la pestaña de departamentos
-    init_departamentos(pestanas)
-    # Añadimos contenido a la pestaña de informes
-    init_informes(pestanas)
+    init_progreso(root, pestanas)
+    # Deshacer y rehacer (botones encima de las pestañas, Ctrl+Z y Ctrl+Y)
+    init_historial(root, pestanas)
+    # Añadimos contenido a la pestaña de inicio (la que se ve al abrir)
+    perfilado.medido(init_inicio)(pestanas)
+    if perfilado.activo:
+        # Primera vez que se muestra la ventana, cuando Tk ya ha terminado de pintarla
+        root.bind("<Map>", lambda e: root.after_idle(perfilado.hito, "primera_ventana"), add="+")
+    # Empleados, departamentos e informes se construyen al abrirlas por primera vez
+    construir_al_abrir(pestanas, almacen)
+    # Los CSV se leen por bloques en segundo plano: la ventana responde desde el principio
+    if pasos:
+        def importacion_terminada(resumen):
+            # Si se canceló o falló, nunca se compacta (se perderían las filas que faltan)
+            if not resumen["cancelada"] and resumen["error"] is None:
+                with historial.sin_registrar():
+                    diario.reaplicar_restantes()
+                diario.marcar_cargado()
+                # Los ids dados a filas que no lo traían se fijan ya en una instantánea
+                if resumen["ids_asignados"]:
+                    diario.compactar()
+            perfilado.hito("datos_cargados")
+            perfilado.escribir()
+
+        importar_csv(pasos, al_terminar=importacion_terminada)
+    else:
+        perfilado.hito("datos_cargados")
 
     root.mainloop()
 
@@ -0,0 +1,288 @@
+# ==========================================================
+# Propuesta de traslados para cubrir los empleados necesarios
+# ==========================================================
+# El informe "necesarios vs reales" enseña cuántos empleados le faltan o
+# le sobran a cada departamento. Aquí se propone qué empleados pasar de
+# los departamentos que tienen de más a los que tienen de menos para
+# que falten los menos posibles en total.
+#
+# Se plantea como un flujo de coste mínimo entre departamentos (no entre
+# empleados, así el grafo tiene cientos de nodos aunque haya cientos de
+# miles de empleados):
+#
+#   origen -> dep. con sobrantes (capacidad: lo que le sobra)
+#          -> dep. con huecos    (coste: COSTE_TRASLADO, o el de 'costes')
+#          -> destino            (capacidad: lo que le falta; coste: -BONO)
+#
+# Cada empleado que llega a un hueco resta BONO, mucho más que cualquier
+# traslado, así que primero se cubre todo lo posible y, entre los planes
+# que cubren lo mismo, se elige el de menor coste de traslado.
+#
+# Presupuesto y horas: un departamento no recibe más empleados de los
+# que puede pagar (presupuesto / coste_empleado) ni de los que puede
+# ocupar (horas_disponibles / horas_empleado). Si no se dicen esos dos
+# valores se usa la media por plaza necesaria de todos los departamentos.
+# Los empleados de un departamento que no existe se pueden mover todos;
+# de los demás solo los que sobran, así ningún departamento se queda
+# por debajo de lo que necesita.
+#
+# Al final, los traslados entre departamentos se convierten en empleados
+# concretos: de cada departamento salen los últimos que entraron.
+import heapq
+
+BONO = 1_000_000      # lo que vale cubrir un hueco (mucho más que cualquier traslado)
+COSTE_TRASLADO = 1    # coste de mover un empleado si 'costes' no dice otro
+INFINITO = float("inf")
+
+
+# ==========================================================
+# Flujo de coste mínimo (caminos más cortos sucesivos)
+# ==========================================================
+class RedFlujo:
+    """Red con capacidades y costes enteros por arco."""
+
+    def __init__(self, n):
+        self.n = n
+        # Por nodo, sus arcos como [destino, capacidad que queda, coste, posición del arco inverso]
+        self.arcos = [[] for _ in range(n)]
+
+    def arco(self, origen, destino, capacidad, coste):
+        """Añade un arco y devuelve su referencia (para leer su flujo al terminar)."""
+        self.arcos[origen].append([destino, capacidad, coste, len(self.arcos[destino])])
+        self.arcos[destino].append([origen, 0, -coste, len(self.arcos[origen]) - 1])
+        return origen, len(self.arcos[origen]) - 1
+
+    def flujo(self, referencia):
+        origen, posicion = referencia
+        destino, _, _, inverso = self.arcos[origen][posicion]
+        return self.arcos[destino][inverso][1]
+
+    def _potenciales(self, s):
+        """Distancias iniciales con Bellman-Ford (hay costes negativos)."""
+        distancia = [INFINITO] * self.n
+        distancia[s] = 0
+        for _ in range(self.n):
+            cambiado = False
+            for u in range(self.n):
+                if distancia[u] == INFINITO:
+                    continue
+                for v, capacidad, coste, _ in self.arcos[u]:
+                    if capacidad > 0 and distancia[u] + coste < distancia[v]:
+                        distancia[v] = distancia[u] + coste
+                        cambiado = True
+            if not cambiado:
+                break
+        return [0 if d == INFINITO else d for d in distancia]
+
+    def minimizar(self, s, t):
+        """
+        Envía flujo de s a t mientras el camino más barato tenga coste
+        negativo (flujo de coste mínimo de cantidad libre).
+        Devuelve (flujo total, coste total).
+        """
+        potencial = self._potenciales(s)
+        total, coste_total = 0, 0
+        while True:
+            # Dijkstra con costes reducidos (no negativos gracias a los potenciales)
+            distancia = [INFINITO] * self.n
+            distancia[s] = 0
+            cola = [(0, s)]
+            while cola:
+                d, u = heapq.heappop(cola)
+                if d > distancia[u]:
+                    continue
+                for v, capacidad, coste, _ in self.arcos[u]:
+                    nueva = d + coste + potencial[u] - potencial[v]
+                    if capacidad > 0 and nueva < distancia[v]:
+                        distancia[v] = nueva
+                        heapq.heappush(cola, (nueva, v))
+            if distancia[t] == INFINITO:
+                break
+            for v in range(self.n):
+                if distancia[v] < INFINITO:
+                    potencial[v] += distancia[v]
+            coste_camino = potencial[t] - potencial[s]
+            if coste_camino >= 0:
+                break  # ya no compensa enviar más
+            # Todos los caminos de coste reducido 0 cuestan lo mismo: se
+            # envía por todos a la vez (flujo bloqueante, como en Dinic)
+            # antes de volver a calcular distancias
+            while True:
+                nivel = self._niveles(s, t, potencial)
+                if nivel is None:
+                    break
+                siguiente = [0] * self.n
+                while True:
+                    cantidad = self._empujar(s, t, INFINITO, nivel, siguiente, potencial)
+                    if not cantidad:
+                        break
+                    total += cantidad
+                    coste_total += cantidad * coste_camino
+        return total, coste_total
+
+    def _admisible(self, u, arco, potencial):
+        v, capacidad, coste, _ = arco
+        return capacidad > 0 and coste + potencial[u] - potencial[v] == 0
+
+    def _niveles(self, s, t, potencial):
+        """Niveles BFS por los arcos de coste reducido 0 (None si t no se alcanza)."""
+        nivel = [-1] * self.n
+        nivel[s] = 0
+        frontera = [s]
+        while frontera:
+            nueva = []
+            for u in frontera:
+                for arco in self.arcos[u]:
+                    if nivel[arco[0]] < 0 and self._admisible(u, arco, potencial):
+                        nivel[arco[0]] = nivel[u] + 1
+                        nueva.append(arco[0])
+            frontera = nueva
+        return nivel if nivel[t] >= 0 else None
+
+    def _empujar(self, u, t, limite, nivel, siguiente, potencial):
+        if u == t:
+            return limite
+        arcos = self.arcos[u]
+        while siguiente[u] < len(arcos):
+            arco = arcos[siguiente[u]]
+            v = arco[0]
+            if nivel[v] == nivel[u] + 1 and self._admisible(u, arco, potencial):
+                cantidad = self._empujar(v, t, min(limite, arco[1]), nivel, siguiente, potencial)
+                if cantidad:
+                    arco[1] -= cantidad
+                    self.arcos[v][arco[3]][1] += cantidad
+                    return cantidad
+            siguiente[u] += 1
+        return 0
+
+
+# ==========================================================
+# Traslados de empleados
+# ==========================================================
+def huecos_y_sobrantes(empleados, departamentos, coste_empleado=None, horas_empleado=None):
+    """
+    DataFrame por departamento (en el orden de 'departamentos') con
+    necesarios, capacidad (lo que permiten presupuesto y horas), antes
+    (empleados que tiene), hueco (los que puede recibir) y sobran (los
+    que puede ceder). Devuelve (resumen, sobrantes de departamentos que no existen).
+    """
+    import numpy as np
+
+    necesarios_total = max(int(departamentos["empleados_necesarios"].sum()), 1)
+    if coste_empleado is None:
+        coste_empleado = departamentos["presupuesto"].sum() / necesarios_total
+    if horas_empleado is None:
+        horas_empleado = departamentos["horas_disponibles"].sum() / necesarios_total
+    coste_empleado = max(coste_empleado, 1e-9)
+    horas_empleado = max(horas_empleado, 1e-9)
+
+    plantilla = empleados["departamento"].value_counts(sort=False)
+    plantilla = plantilla[plantilla > 0]  # un Categorical cuenta también las categorías sin empleados
+    resumen = departamentos[["nombre", "empleados_necesarios"]].rename(
+        columns={"nombre": "departamento", "empleados_necesarios": "necesarios"}).reset_index(drop=True)
+    # Pequeño margen: 3 * 0.1 / 0.1 no debe quedarse en 2 por el redondeo
+    resumen["capacidad"] = np.minimum(
+        np.floor(departamentos["presupuesto"].to_numpy() / coste_empleado + 1e-9),
+        np.floor(departamentos["horas_disponibles"].to_numpy() / horas_empleado + 1e-9)).astype(np.int64)
+    resumen["antes"] = resumen["departamento"].map(plantilla).fillna(0).astype(np.int64)
+    objetivo = np.minimum(resumen["necesarios"], resumen["capacidad"])
+    resumen["hueco"] = np.maximum(objetivo - resumen["antes"], 0)
+    resumen["sobran"] = np.maximum(resumen["antes"] - resumen["necesarios"], 0)
+    huerfanos = plantilla[~plantilla.index.isin(resumen["departamento"])].astype(np.int64)
+    return resumen, huerfanos
+
+
+def proponer_traslados(empleados, departamentos, coste_empleado=None, horas_empleado=None, costes=None):
+    """
+    Plan de traslados para que falten los menos empleados posibles.
+
+    empleados: DataFrame con id, nombre, apellidos y departamento
+    departamentos: DataFrame con nombre, empleados_necesarios, presupuesto y horas_disponibles
+    coste_empleado, horas_empleado: lo que cuesta y ocupa un empleado (por
+        defecto, la media por plaza necesaria)
+    costes: {(origen, destino): coste} de mover un empleado entre dos
+        departamentos; None en un par prohíbe ese traslado
+
+    Devuelve (traslados: DataFrame con id, nombre, apellidos, origen y
+    destino; resumen: DataFrame por departamento con necesarios,
+    capacidad, antes, despues y faltan).
+    """
+    resumen, huerfanos = huecos_y_sobrantes(empleados, departamentos, coste_empleado, horas_empleado)
+    cedentes = [(nombre, n) for nombre, n in zip(resumen["departamento"], resumen["sobran"]) if n > 0]
+    cedentes += [(nombre, int(n)) for nombre, n in huerfanos.items()]
+    receptores = [(nombre, n) for nombre, n in zip(resumen["departamento"], resumen["hueco"]) if n > 0]
+
+    # Nodos: 0 origen, 1 destino, 2 intermedio, después cedentes y receptores
+    red = RedFlujo(3 + len(cedentes) + len(receptores))
+    origen, destino, intermedio = 0, 1, 2
+    nodo_receptor = {nombre: 3 + len(cedentes) + k for k, (nombre, _) in enumerate(receptores)}
+    pares = []  # (cedente, receptor, referencia del arco)
+    salidas = [(nombre, red.arco(origen, 3 + k, int(n), 0)) for k, (nombre, n) in enumerate(cedentes)]
+    entradas = [(nombre, red.arco(nodo_receptor[nombre], destino, int(n), -BONO)) for nombre, n in receptores]
+    if costes is None:
+        # Todos los traslados cuestan lo mismo: un nodo intermedio basta
+        # (cedentes + receptores arcos en lugar de cedentes x receptores)
+        for k in range(len(cedentes)):
+            red.arco(3 + k, intermedio, INFINITO, 0)
+        for nombre, _ in receptores:
+            red.arco(intermedio, nodo_receptor[nombre], INFINITO, COSTE_TRASLADO)
+    else:
+        for k, (cedente, _) in enumerate(cedentes):
+            for receptor, _ in receptores:
+                coste = costes.get((cedente, receptor), COSTE_TRASLADO)
+                if coste is not None and cedente != receptor:
+                    pares.append((cedente, receptor, red.arco(3 + k, nodo_receptor[receptor], INFINITO, coste)))
+    red.minimizar(origen, destino)
+
+    # Cuántos empleados van de cada cedente a cada receptor
+    if costes is None:
+        envios = _emparejar([(nombre, red.flujo(ref)) for nombre, ref in salidas],
+                            [(nombre, red.flujo(ref)) for nombre, ref in entradas])
+    else:
+        envios = [(cedente, receptor, red.flujo(ref)) for cedente, receptor, ref in pares if red.flujo(ref) > 0]
+
+    traslados = _elegir_empleados(empleados, envios)
+    movidos = traslados["destino"].value_counts().sub(traslados["origen"].value_counts(), fill_value=0)
+    resumen["despues"] = (resumen["antes"] + resumen["departamento"].map(movidos).fillna(0)).astype("int64")
+    resumen["faltan"] = (resumen["necesarios"] - resumen["despues"]).clip(lower=0)
+    return traslados, resumen[["departamento", "necesarios", "capacidad", "antes", "despues", "faltan"]]
+
+
+def _emparejar(salidas, entradas):
+    """Reparte en orden lo que sale de cada cedente entre los receptores: [(cedente, receptor, n)]."""
+    envios = []
+    entradas = [[nombre, n] for nombre, n in entradas if n > 0]
+    k = 0
+    for cedente, n in salidas:
+        while n > 0 and k < len(entradas):
+            cantidad = min(n, entradas[k][1])
+            envios.append((cedente, entradas[k][0], cantidad))
+            n -= cantidad
+            entradas[k][1] -= cantidad
+            if entradas[k][1] == 0:
+                k += 1
+    return envios
+
+
+def _elegir_empleados(empleados, envios):
+    """Empleados concretos de cada envío: de cada cedente, los últimos en entrar."""
+    import pandas as pd
+
+    columnas = ["id", "nombre", "apellidos", "origen", "destino"]
+    if not envios:
+        return pd.DataFrame(columns=columnas)
+    cedentes = {cedente for cedente, _, _ in envios}
+    candidatos = empleados[empleados["departamento"].isin(cedentes)]
+    # Posiciones de los empleados de cada cedente, del último que entró al primero
+    posiciones = {nombre: filas[::-1] for nombre, filas in
+                  candidatos.groupby("departamento", sort=False).indices.items()}
+    partes = []
+    usados = {}
+    for cedente, receptor, n in envios:
+        inicio = usados.get(cedente, 0)
+        elegidos = candidatos.iloc[posiciones[cedente][inicio:inicio + n]]
+        usados[cedente] = inicio + n
+        partes.append(pd.DataFrame({"id": elegidos["id"].to_numpy(), "nombre": elegidos["nombre"].to_numpy(),
+                                    "apellidos": elegidos["apellidos"].to_numpy(), "origen": cedente,
+                                    "destino": receptor}))
+    return pd.concat(partes, ignore_index=True)[columnas]
@@ -0,0 +1,188 @@
+# ==========================================================
+# Perfilado del arranque (python main.py --profile-startup)
+# ==========================================================
+# También se activa con la variable de entorno GESTOR_PERFIL=1.
+# Apunta cuánto tarda:
+#   - cada importación de módulo (tiempo total y propio, sin sus hijos)
+#   - cada tramo marcado con tramo(): construcción de pestañas, lectura
+#     de CSV, carga de datos...
+#   - los hitos del arranque (primera ventana pintada, datos cargados)
+# y lo escribe en:
+#   - perfil_arranque.json    informe legible por máquina
+#   - perfil_arranque.folded  pilas plegadas ("a;b;c microsegundos"), el
+#                             formato de flamegraph.pl, speedscope o inferno
+# Desactivado no cuesta nada: tramo() no mide y no se instala ningún gancho.
+import atexit
+import importlib.abc
+import importlib.machinery
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OPCION = "--profile-startup"
+VARIABLE_ENTORNO = "GESTOR_PERFIL"
+
+activo = False
+_inicio = None
+_fecha_inicio = None
+_candado = threading.Lock()
+_local = threading.local()
+_tramos = []               # un diccionario por tramo terminado
+_hitos = {}                # {nombre: ms desde el inicio}
+_plegadas = Counter()      # {"a;b;c": segundos propios}
+
+# Solo se cronometran módulos que se cargan desde fichero (.py, .pyc, extensiones)
+_CARGADORES = (importlib.machinery.SourceFileLoader, importlib.machinery.SourcelessFileLoader,
+               importlib.machinery.ExtensionFileLoader)
+
+
+def pedido(argv=None):
+    """True si se ha pedido el perfilado por línea de órdenes o por entorno."""
+    argv = sys.argv if argv is None else argv
+    return OPCION in argv or os.environ.get(VARIABLE_ENTORNO, "") not in ("", "0")
+
+
+def activar():
+    """Empieza a medir. Conviene llamarlo antes de importar nada pesado."""
+    global activo, _inicio, _fecha_inicio
+    if activo:
+        return
+    activo = True
+    _inicio = time.perf_counter()
+    _fecha_inicio = datetime.now().isoformat(timespec="seconds")
+    sys.meta_path.insert(0, _CronometroImportaciones())
+    atexit.register(escribir)
+
+
+def _ms(segundos):
+    return round(segundos * 1000, 3)
+
+
+def _pila():
+    if not hasattr(_local, "pila"):
+        _local.pila = []
+    return _local.pila
+
+
+@contextmanager
+def tramo(nombre, tipo="tramo"):
+    """Mide el bloque; los tramos anidados forman la pila del flame graph."""
+    if not activo:
+        yield
+        return
+    pila = _pila()
+    pila.append([nombre, 0.0])  # [nombre, tiempo de los tramos hijos]
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracion = time.perf_counter() - inicio
+        hilo = threading.current_thread()
+        ruta = [hilo.name if hilo is not threading.main_thread() else "main"]
+        ruta += [n for n, _ in pila]
+        _, hijos = pila.pop()
+        if pila:
+            pila[-1][1] += duracion
+        with _candado:
+            _tramos.append({
+                "nombre": nombre,
+                "tipo": tipo,
+                "hilo": ruta[0],
+                "inicio_ms": _ms(inicio - _inicio),
+                "duracion_ms": _ms(duracion),
+                "propio_ms": _ms(duracion - hijos),
+                "pila": ";".join(ruta),
+            })
+            _plegadas[";".join(ruta)] += duracion - hijos
+
+
+def medido(funcion, nombre=None):
+    """Devuelve 'funcion' envuelta en un tramo con su nombre."""
+    nombre = nombre or funcion.__name__
+
+    def envoltura(*args, **kwargs):
+        with tramo(nombre):
+            return funcion(*args, **kwargs)
+    return envoltura
+
+
+def hito(nombre):
+    """Apunta el momento (desde el inicio) en que ocurre algo por primera vez."""
+    if activo and nombre not in _hitos:
+        _hitos[nombre] = _ms(time.perf_counter() - _inicio)
+
+
+class _CronometroImportaciones(importlib.abc.MetaPathFinder):
+    """
+    Buscador que se pone el primero en sys.meta_path: deja que los demás
+    encuentren el módulo y envuelve exec_module de su cargador en un tramo.
+    """
+
+    def find_spec(self, nombre, ruta, objetivo=None):
+        if getattr(_local, "buscando", False):
+            return None
+        _local.buscando = True
+        try:
+            for buscador in sys.meta_path:
+                if buscador is self or not hasattr(buscador, "find_spec"):
+                    continue
+                spec = buscador.find_spec(nombre, ruta, objetivo)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            _local.buscando = False
+
+        if isinstance(spec.loader, _CARGADORES):
+            ejecutar = spec.loader.exec_module
+
+            def exec_module(modulo):
+                with tramo("import " + nombre, tipo="import"):
+                    ejecutar(modulo)
+            # Cada módulo tiene su propio cargador: se sustituye solo el de esta instancia
+            spec.loader.exec_module = exec_module
+        return spec
+
+
+def informe():
+    """Diccionario con todo lo medido hasta ahora."""
+    with _candado:
+        tramos = list(_tramos)
+        hitos = dict(_hitos)
+    importaciones = sorted((t for t in tramos if t["tipo"] == "import"),
+                           key=lambda t: t["duracion_ms"], reverse=True)
+    return {
+        "fecha": _fecha_inicio,
+        "argumentos": sys.argv[1:],
+        "total_ms": _ms(time.perf_counter() - _inicio),
+        "hitos": hitos,
+        "importaciones_ms": round(sum(t["propio_ms"] for t in importaciones), 3),
+        "importaciones": [{"modulo": t["nombre"][len("import "):], "total_ms": t["duracion_ms"],
+                           "propio_ms": t["propio_ms"], "hilo": t["hilo"]} for t in importaciones],
+        "tramos": [t for t in tramos if t["tipo"] != "import"],
+    }
+
+
+def escribir(ruta_json="perfil_arranque.json", ruta_plegadas="perfil_arranque.folded"):
+    """Escribe el informe y las pilas plegadas (se sobrescriben en cada llamada)."""
+    if not activo:
+        return
+    ruta_json = os.path.join(BASE_DIR, ruta_json)
+    ruta_plegadas = os.path.join(BASE_DIR, ruta_plegadas)
+    datos = informe()
+    with open(ruta_json, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2)
+    with _candado:
+        plegadas = sorted(_plegadas.items())
+    with open(ruta_plegadas, "w", encoding="utf-8") as f:
+        for pila, segundos in plegadas:
+            # El valor (microsegundos) va tras el último espacio de la línea
+            f.write(f"{pila} {max(int(segundos * 1_000_000), 1)}\n")
+    print(f"Perfil del arranque escrito en {ruta_json} y {ruta_plegadas}")
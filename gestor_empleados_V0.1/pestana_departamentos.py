@@ -1,97 +1,68 @@
-import os
-import random
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 
-import pandas as pd
-
 from departamento import Departamento
+from cargador_csv import COLUMNAS_DEPARTAMENTOS
+from registro_departamentos import RegistroDepartamentos
+from tabla_virtual import crear_tabla_virtual
+from indice_orden import OrdenTabla, TEXTO
+from ids import AsignadorIds, INICIO
 
-# Lista global de objetos Departamento (se rellena desde CSV y/o desde la UI)
-departamentos = []
+# Registro global de objetos Departamento (se rellena desde CSV y/o desde la UI)
+# con índices únicos por id y por nombre
+departamentos = RegistroDepartamentos()
+# Ids libres para los departamentos nuevos (sigue al registro)
+ids_departamentos = AsignadorIds(departamentos, inicio=INICIO)
 
 
 # ==========================================================
-# 1) CONFIGURACIÓN: lista fija de departamentos (ComboBox)
+# 1) CONFIGURACIÓN: departamentos disponibles (ComboBox)
 # ==========================================================
-DEPARTAMENTOS_DISPONIBLES = [
-    "Recursos Humanos",
-    "Desarrollo",
-    "Ventas",
-    "Marketing",
-    "IT",
-    "Operaciones",
-    "Finanzas",
-]
+# Se deriva del registro: siempre contiene los nombres de los departamentos
+# existentes. Se actualiza en el sitio para que quien lo importe vea los cambios.
+DEPARTAMENTOS_DISPONIBLES = []
 
 
-# ==========================================================
-# 2) CARGA INICIAL DESDE CSV
-# ==========================================================
-def cargar_departamentos_desde_csv(csv_filename="departamentos.csv"):
-    """
-    Carga datos iniciales desde un CSV y los mete en la lista global 'departamentos'.
+def _refrescar_disponibles(cambios=None):
+    DEPARTAMENTOS_DISPONIBLES[:] = departamentos.nombres()
 
-    Espera columnas EXACTAS (en minúsculas o mayúsculas, da igual):
-      id, nombre, empleados_necesarios, presupuesto, horas_disponibles
-    """
-    global departamentos
-
-    # Ruta absoluta al CSV (mismo directorio que este .py)
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    csv_path = os.path.join(base_dir, csv_filename)
-
-    # Si no existe el CSV, avisamos al usuario
-    if not os.path.exists(csv_path):
-        messagebox.showwarning(
-            "CSV no encontrado",
-            f"No se encontró el archivo {csv_filename} en:\n{base_dir}\n\n"
-            "Crea el CSV con el contenido que te he pasado."
-        )
-        return
 
-    # Intentamos leer el CSV con pandas
-    try:
-        df = pd.read_csv(csv_path)
-        # Normalizamos nombres de columnas: quitamos espacios, pasamos a minúsculas
-        df.columns = df.columns.str.strip().str.lower()
-    except Exception as e:
-        messagebox.showerror("Error leyendo CSV", f"No se pudo leer el CSV:\n{e}")
-        return
+departamentos.suscribir(_refrescar_disponibles)
 
-    # Comprobamos que el CSV tenga las columnas obligatorias
-    required = {"id", "nombre", "empleados_necesarios", "presupuesto", "horas_disponibles"}
-    if not required.issubset(set(df.columns)):
-        messagebox.showerror(
-            "CSV inválido",
-            "El CSV no tiene las columnas necesarias.\n"
-            "Debe tener: id,nombre,empleados_necesarios,presupuesto,horas_disponibles"
-        )
-        return
 
-    # Vaciamos la lista y cargamos de nuevo
-    departamentos.clear()
+def vincular_combobox(combo):
+    """Mantiene los valores de un Combobox iguales a los departamentos existentes."""
+    def refrescar(cambios=None):
+        combo["values"] = DEPARTAMENTOS_DISPONIBLES
+        if not combo.get() and DEPARTAMENTOS_DISPONIBLES:
+            combo.current(0)
 
-    for _, fila in df.iterrows():
-        # Creamos un objeto Departamento con datos del CSV
-        dep = Departamento(
-            id=int(fila["id"]),
-            nombre=str(fila["nombre"]),
-            empleados_necesarios=int(fila["empleados_necesarios"]),
-            presupuesto=float(fila["presupuesto"]),
-            horas_disponibles=float(fila["horas_disponibles"])
-        )
-        departamentos.append(dep)
+    # se suscribe después de _refrescar_disponibles, así ve la lista ya actualizada
+    departamentos.suscribir(refrescar)
+    refrescar()
+
+
+# ==========================================================
+# 2) CARGA DESDE CSV (por bloques, ver importador.py)
+# ==========================================================
+def recibir_departamentos(df):
+    """
+    Añade al registro un bloque de departamentos ya validado.
+    Los que repiten id o nombre se saltan. Devuelve cuántos se añadieron.
+    """
+    columnas = (df[c].tolist() for c in COLUMNAS_DEPARTAMENTOS)
+    return len(departamentos.agregar_varios(
+        (Departamento(*fila) for fila in zip(*columnas)), omitir_repetidos=True))
 
 
 # ==========================================================
 # 3) UTILIDADES: generar ID y convertir texto a número
 # ==========================================================
-def generate_id(e_id):
-    """Genera un ID aleatorio de 4 dígitos y lo escribe en el Entry de ID."""
+def generate_id(e_id, asignador):
+    """Escribe en el Entry de ID el siguiente id libre del asignador (ver ids.py)."""
     e_id.delete(0, tk.END)
-    e_id.insert(0, str(random.randint(1000, 9999)))
+    e_id.insert(0, str(asignador.siguiente()))
 
 
 def _to_int(s, default=0):
@@ -110,21 +81,32 @@ def _to_float(s, default=0.0):
 
 
 # ==========================================================
-# 4) TREEVIEW: refrescar la tabla con la lista 'departamentos'
+# 4) TREEVIEW: refrescar la tabla con el registro 'departamentos'
 # ==========================================================
+def _valores(d):
+    """Valores de una fila del Treeview para un departamento."""
+    return (d.id, d.nombre, d.empleados_necesarios, d.presupuesto, d.horas_disponibles)
+
+
+def _valores_departamento(dep_id):
+    """Valores de la fila de un id o iid (None si ya no existe)."""
+    d = departamentos.obtener(dep_id)
+    return _valores(d) if d is not None else None
+
+
 def update_treeview(tree):
-    """Limpia y vuelve a cargar el Treeview con los departamentos actuales."""
-    # 1) borrar filas actuales
-    for item in tree.get_children():
-        tree.delete(item)
+    """
+    Vuelve a pintar la tabla virtual con los departamentos actuales.
+    Cada fila usa el ID del departamento como iid, así solo se insertan,
+    actualizan o borran las filas de la ventana que han cambiado.
+    """
+    tree.refrescar()
 
-    # 2) insertar filas desde la lista
-    for d in departamentos:
-        tree.insert(
-            "",
-            "end",
-            values=(d.id, d.nombre, d.empleados_necesarios, d.presupuesto, d.horas_disponibles)
-        )
+
+def _seguir_registro(tree, orden, cambios):
+    """Lleva los cambios del registro al índice de orden y a la tabla."""
+    orden.aplicar(cambios)
+    tree.refrescar(cambios)
 
 
 # ==========================================================
@@ -149,34 +131,54 @@ def add_departamento(tree, w):
         messagebox.showwarning("Datos inválidos", "Por favor, complete todos los campos correctamente.")
         return
 
-    # Evitamos IDs duplicados
-    if any(str(d.id) == str(o_dep.id) for d in departamentos):
+    # Evitamos IDs y nombres duplicados (búsqueda O(1) en el registro)
+    if o_dep.id in departamentos:
         messagebox.showwarning("ID duplicado", "Ese ID ya existe. Genera otro o usa uno distinto.")
         return
+    if departamentos.existe_nombre(o_dep.nombre):
+        messagebox.showwarning("Nombre duplicado", "Ya existe un departamento con ese nombre.")
+        return
 
-    # Añadimos y refrescamos la tabla
-    departamentos.append(o_dep)
-    update_treeview(tree)
+    # Añadimos al registro (la tabla pinta solo la fila nueva al recibir el aviso)
+    departamentos.agregar(o_dep)
 
 
 def delete_departamento(tree):
-    """Elimina el departamento seleccionado en el Treeview y actualiza la tabla."""
+    """Elimina los departamentos seleccionados en la tabla."""
     selected = tree.selection()
     if not selected:
         messagebox.showinfo("Selecciona", "Selecciona una fila primero.")
         return
+    if len(selected) > 1 and not messagebox.askyesno(
+            "Eliminar departamentos", f"¿Eliminar los {len(selected)} departamentos seleccionados?"):
+        return
 
-    # Obtenemos el item seleccionado y su ID (primera columna)
-    iid = selected[0]
-    values = tree.item(iid, "values")
-    dep_id = values[0]
+    # Los iids de las filas son los IDs de los departamentos: se borran
+    # todos del registro con un solo aviso (un refresco de la tabla)
+    departamentos.eliminar_varios(selected)
 
-    # Borramos de la lista global
-    global departamentos
-    departamentos = [d for d in departamentos if str(d.id) != str(dep_id)]
 
-    # Refrescamos tabla
-    update_treeview(tree)
+# Campos que se pueden poner igual a varios departamentos a la vez
+# (id y nombre son únicos): texto del Combobox -> (atributo, conversión)
+CAMPOS_EN_BLOQUE = {
+    "Empleados necesarios": ("empleados_necesarios", _to_int),
+    "Presupuesto": ("presupuesto", _to_float),
+    "Horas disponibles": ("horas_disponibles", _to_float),
+}
+
+
+def editar_seleccion(tree, w):
+    """Pone el mismo valor en un campo de todos los departamentos seleccionados."""
+    selected = tree.selection()
+    if not selected:
+        messagebox.showinfo("Selecciona", "Selecciona una o más filas primero.")
+        return
+    campo, convertir = CAMPOS_EN_BLOQUE[w["c_campo"].get()]
+    valor = convertir(w["e_valor"].get(), -1)
+    if valor < 0:
+        messagebox.showwarning("Dato inválido", "Escribe un número mayor o igual que 0.")
+        return
+    departamentos.actualizar_varios(selected, **{campo: valor})
 
 
 def on_tree_select(event, tree, w):
@@ -196,11 +198,8 @@ def on_tree_select(event, tree, w):
     w["e_id"].delete(0, tk.END)
     w["e_id"].insert(0, dep_id)
 
-    # Cargar departamento en Combobox (si existe en la lista)
-    if nombre in w["c_departamento"]["values"]:
-        w["c_departamento"].set(nombre)
-    else:
-        w["c_departamento"].current(0)
+    # Cargar nombre del departamento en el Combobox
+    w["c_departamento"].set(nombre)
 
     # Cargar empleados necesarios
     w["e_necesarios"].delete(0, tk.END)
@@ -241,24 +240,26 @@ def update_departamento_from_fields(tree, w):
         messagebox.showwarning("Datos inválidos", "Revisa los campos.")
         return
 
-    # Si cambias el ID, aseguramos que no exista ya
-    if str(new_id) != str(selected_id) and any(str(d.id) == str(new_id) for d in departamentos):
+    # Si cambias el ID o el nombre, aseguramos que no existan ya
+    if str(new_id) != str(selected_id) and new_id in departamentos:
         messagebox.showwarning("ID duplicado", "No puedes actualizar: ese nuevo ID ya existe.")
         return
+    if departamentos.existe_nombre(new_nombre, excepto_id=selected_id):
+        messagebox.showwarning("Nombre duplicado", "No puedes actualizar: ya existe un departamento con ese nombre.")
+        return
 
-    # Actualizamos el objeto en la lista global
-    for d in departamentos:
-        if str(d.id) == str(selected_id):
-            d.id = new_id
-            d.nombre = new_nombre
-            d.empleados_necesarios = new_necesarios
-            d.presupuesto = new_presupuesto
-            d.horas_disponibles = new_horas
-            break
-
-    # Actualizamos el ID seleccionado y refrescamos tabla
+    # Actualizamos el objeto en el registro (la tabla repinta solo su fila)
+    departamentos.actualizar(
+        selected_id,
+        id=new_id,
+        nombre=new_nombre,
+        empleados_necesarios=new_necesarios,
+        presupuesto=new_presupuesto,
+        horas_disponibles=new_horas
+    )
+
+    # Actualizamos el ID seleccionado
     w["selected_id"] = str(new_id)
-    update_treeview(tree)
 
 
 # ==========================================================
@@ -267,15 +268,10 @@ def update_departamento_from_fields(tree, w):
 def init_departamentos(pestanas):
     """
     Inicializa la pestaña de Departamentos (pestanas.tabs()[2]):
-      - Carga datos desde CSV (si la lista está vacía)
       - Crea UI (izquierda: formulario / derecha: tabla)
       - Conecta botones y eventos
     """
 
-    # Cargar datos iniciales del CSV solo si aún no hay departamentos
-    if not departamentos:
-        cargar_departamentos_desde_csv("departamentos.csv")
-
     # Estilos (Entry y Button)
     style = ttk.Style()
     style.configure("Tall.TEntry", padding=(6, 8, 6, 8))
@@ -299,7 +295,11 @@ def init_departamentos(pestanas):
     # TREEVIEW (tabla derecha)
     # --------------------------
     columnas = ("ID", "Nombre", "Empleados necesarios", "Presupuesto", "Horas disponibles")
-    tree = ttk.Treeview(frame_derecha, columns=columnas, show="headings")
+    def vista():
+        # Todos los departamentos (en orden de alta o el elegido en las cabeceras)
+        return orden.vista([d.id for d in departamentos])
+
+    tree = crear_tabla_virtual(frame_derecha, columnas, vista, _valores_departamento)
 
     for col in columnas:
         tree.heading(col, text=col)
@@ -321,21 +321,19 @@ def init_departamentos(pestanas):
     ttk.Button(
         frame_izquierda,
         text="Generar ID",
-        command=lambda: generate_id(w["e_id"]),
+        command=lambda: generate_id(w["e_id"], ids_departamentos),
         style="Tall.TButton"
     ).grid(row=0, column=2, padx=10, pady=10)
 
-    # NOMBRE (cambiado a Combobox de departamentos)
+    # NOMBRE (Combobox con los departamentos existentes; se puede escribir uno nuevo)
     ttk.Label(frame_izquierda, text="Departamento:").grid(row=1, column=0, padx=10, pady=10, sticky="w")
     w["c_departamento"] = ttk.Combobox(
         frame_izquierda,
-        values=DEPARTAMENTOS_DISPONIBLES,
         width=28,
-        state="readonly",
         style="Tall.TCombobox"
     )
     w["c_departamento"].grid(row=1, column=1, padx=10, pady=10)
-    w["c_departamento"].current(0)
+    vincular_combobox(w["c_departamento"])
 
     # Empleados necesarios
     ttk.Label(frame_izquierda, text="Empleados necesarios:").grid(row=2, column=0, padx=10, pady=10, sticky="w")
@@ -376,10 +374,36 @@ def init_departamentos(pestanas):
         style="Tall.TButton"
     ).grid(row=5, column=2, padx=10, pady=20)
 
+    # --------------------------
+    # EDICIÓN EN BLOQUE (Ctrl/Shift + clic o Ctrl+A en la tabla)
+    # --------------------------
+    f_bloque = ttk.LabelFrame(frame_izquierda, text="Selección: 0 departamentos")
+    f_bloque.grid(row=6, column=0, columnspan=3, padx=10, pady=10, sticky="we")
+    w["c_campo"] = ttk.Combobox(f_bloque, values=list(CAMPOS_EN_BLOQUE), state="readonly", width=20)
+    w["c_campo"].current(0)
+    w["c_campo"].grid(row=0, column=0, padx=5, pady=5)
+    w["e_valor"] = ttk.Entry(f_bloque, width=15)
+    w["e_valor"].grid(row=0, column=1, padx=5, pady=5)
+    ttk.Button(
+        f_bloque,
+        text="Aplicar a la selección",
+        command=lambda: editar_seleccion(tree, w)
+    ).grid(row=0, column=2, padx=5, pady=5)
+
+    def contar_seleccion(event=None):
+        f_bloque.config(text=f"Selección: {len(tree.selection())} departamentos")
+
     # Evento: al seleccionar una fila de la tabla, se cargan los datos en el formulario
     tree.bind("<<TreeviewSelect>>", lambda e: on_tree_select(e, tree, w))
-
-    # Cargamos los datos en la tabla al abrir la pestaña
+    tree.bind("<<TreeviewSelect>>", contar_seleccion, add="+")
+
+    # Pulsar una cabecera ordena por esa columna (otra vez: al revés)
+    orden = OrdenTabla(tree, columnas, (None, TEXTO, None, None, None),
+                       lambda: (_valores(d) for d in departamentos), _valores_departamento)
+    # Pintamos lo que ya haya y, desde aquí, la tabla sigue al registro:
+    # cada alta, baja o cambio (también los que llegan importando) repinta
+    # solo las filas de la ventana que han cambiado
     update_treeview(tree)
+    departamentos.suscribir(lambda cambios: _seguir_registro(tree, orden, cambios))
 
 
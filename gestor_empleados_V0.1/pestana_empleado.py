@@ -1,34 +1,322 @@
 import os
-import random
+import time
 import tkinter as tk
 from tkinter import ttk
+from tkinter import messagebox
+from tkinter import filedialog
 
-from Mi_repositorio.gestor_empleados_preparada.pestana_departamentos import update_treeview
 from empleado import Empleado
-import pandas as pd
-
-#Leer datos de .csv
-df = pd.read_csv('empleados.csv')
-
-
-empleados = []
+from tabla_virtual import crear_tabla_virtual, VistaPerezosa
+from repositorio_empleados import EmpleadoRepository
+from agregados import AgregadosDepartamentos
+from importador import ImportacionCSV, paso_empleados
+from validacion import resumen_errores
+from duplicados import IndiceDuplicados, buscar_duplicados
+from optimizador import proponer_traslados
+from indice_busqueda import IndiceBusqueda, palabras_de
+from indice_orden import OrdenTabla, TEXTO
+from pestana_departamentos import vincular_combobox, generate_id, departamentos
+from ids import AsignadorIds, INICIO
+from historial import Historial, describir
+
+
+# Repositorio con los empleados indexados por id, departamento y correo
+empleados = EmpleadoRepository()
+# Estadísticas por departamento que se actualizan solas con cada cambio
+agregados = AgregadosDepartamentos(empleados)
+# Ids libres para los empleados nuevos (sigue al repositorio)
+ids_empleados = AsignadorIds(empleados, inicio=INICIO)
+# Bloques por nombre y por correo para avisar de personas repetidas (se construye al usarlo)
+indice_duplicados = IndiceDuplicados(empleados)
+MAX_SUGERENCIAS = 20  # propuestas de fusión que se imprimen
+# Deshacer y rehacer de las altas, bajas y cambios de empleados y departamentos
+historial = Historial()
+historial.seguir("empleados", empleados)
+historial.seguir("departamentos", departamentos)
+MAX_PASOS_MENU = 15  # pasos que se ofrecen en "Volver a..."
 components = []
+# Barra de progreso, texto y botón Cancelar de la importación en curso
+progreso = {"importacion": None}
+# Búsqueda: índice de palabras, texto buscado, ids encontrados y after() pendiente
+busqueda = {"indice": None, "activa": False, "texto": "", "ids": {}, "pendiente": None}
+RETARDO_BUSQUEDA_MS = 150  # se busca cuando se deja de escribir este tiempo
+# La tabla virtual solo pinta lo que se ve: el límite solo acota lo que
+# tarda la búsqueda y ordenar los resultados
+MAX_RESULTADOS = 10_000
+# Todos los empleados en el orden del repositorio, leídos por trozos
+todos = VistaPerezosa(empleados.__len__, empleados.ids_entre)
+# Orden de la tabla al pulsar las cabeceras (OrdenTabla, se crea con la pestaña)
+orden = {"tabla": None}
 
 
 
 
 
-def generate_id(e_id):
-    e_id.delete(0, tk.END)
-    e_id.insert(0, str(random.randint(1000, 9999)))
-
 def update_treeview(tree):
-    # Limpiamos el treeview
-    for item in tree.get_children():
-        tree.delete(item)
-    # Añadimos todos los empleados al treeview
-    for emp in empleados:
-        tree.insert("", "end", values=(emp.id, emp.nombre, emp.apellidos, emp.edad,emp.correo, emp.departamento))
+    # La tabla virtual vuelve a pedir solo las filas que están a la vista
+    tree.refrescar()
+
+
+def _valores_empleado(emp_id):
+    """Fila (id, nombre, apellidos, edad, correo, departamento) de un id o iid, o None."""
+    emp = empleados.obtener(emp_id)
+    return emp.valores() if emp is not None else None
+
+
+def _vista():
+    """Ids que enseña la tabla: los resultados de la búsqueda o todos, en el orden elegido."""
+    if busqueda["activa"]:
+        return orden["tabla"].vista(todos, list(busqueda["ids"]))
+    return orden["tabla"].vista(todos)
+
+
+def _seguir_repositorio(tree, cambios):
+    """Lleva los cambios del repositorio a la tabla (si hay búsqueda, solo los que encajan)."""
+    # El índice de orden cubre todos los empleados, se vean o no
+    orden["tabla"].aplicar(cambios)
+    if busqueda["activa"]:
+        ids = busqueda["ids"]
+        for anterior, nuevo in cambios:
+            encaja = nuevo is not None and busqueda["indice"].coincide(nuevo, busqueda["texto"])
+            # Un cambio que sigue encajando conserva su sitio entre los resultados
+            if anterior is not None and not (encaja and nuevo[0] == anterior[0]):
+                ids.pop(anterior[0], None)
+            if encaja:
+                ids.setdefault(nuevo[0], None)
+    tree.refrescar(cambios)
+
+
+def buscar_empleados(tree):
+    """Muestra solo los empleados que encajan con el texto del buscador."""
+    busqueda["pendiente"] = None
+    texto = busqueda["entrada"].get()
+    busqueda["texto"] = texto
+    busqueda["activa"] = bool(palabras_de(texto))
+    if not busqueda["activa"]:
+        busqueda["ids"] = {}
+        busqueda["etiqueta"].config(text="")
+        tree.ir_a(0)
+        return
+    indice = busqueda["indice"]
+    if not indice.listo:
+        # al terminar de construir el índice se vuelve a buscar
+        busqueda["etiqueta"].config(text="Preparando la búsqueda...")
+        return
+
+    ids = indice.buscar(texto, limite=MAX_RESULTADOS + 1)
+    if len(ids) > MAX_RESULTADOS:
+        busqueda["etiqueta"].config(text=f"Más de {MAX_RESULTADOS} resultados (se muestran {MAX_RESULTADOS})")
+        ids = ids[:MAX_RESULTADOS]
+    else:
+        busqueda["etiqueta"].config(text=f"{len(ids)} resultado{'' if len(ids) == 1 else 's'}")
+    busqueda["ids"] = dict.fromkeys(ids)
+    tree.ir_a(0)
+
+
+def _al_escribir_busqueda(tree):
+    # Se espera a que se deje de escribir para no buscar en cada tecla
+    if busqueda["pendiente"] is not None:
+        tree.after_cancel(busqueda["pendiente"])
+    busqueda["pendiente"] = tree.after(RETARDO_BUSQUEDA_MS, buscar_empleados, tree)
+
+
+def recibir_empleados(df):
+    """Añade un bloque de empleados ya validado (saltando ids repetidos) y devuelve cuántos entraron."""
+    return len(empleados.cargar_dataframe(df, omitir_repetidos=True))
+
+
+def init_progreso(root, antes):
+    """
+    Crea la barra de progreso de las importaciones al pie de la ventana
+    (así se ve en cualquier pestaña). Solo se muestra mientras hay una en
+    curso, debajo del widget 'antes' (el Notebook).
+    """
+    progreso["antes"] = antes
+    progreso["marco"] = ttk.Frame(root)
+    progreso["barra"] = ttk.Progressbar(progreso["marco"], mode="determinate", maximum=100)
+    progreso["barra"].pack(side=tk.LEFT, fill=tk.X, expand=True)
+    progreso["texto"] = ttk.Label(progreso["marco"], text="")
+    progreso["texto"].pack(side=tk.LEFT, padx=10)
+    ttk.Button(progreso["marco"], text="Cancelar", command=cancelar_importacion).pack(side=tk.LEFT)
+
+
+def importar_csv(pasos, al_terminar=None):
+    """
+    Importa en segundo plano los CSV de 'pasos' (ver importador.py)
+    mostrando el progreso al pie de la ventana. La tabla se puede usar
+    mientras tanto: cada bloque que llega se pinta solo.
+    """
+    if progreso["importacion"] is not None:
+        messagebox.showinfo("Importación en curso", "Espera a que termine la importación actual o cancélala.")
+        return
+
+    # Lo importado no entra en el historial de deshacer (ver historial.py)
+    for paso in pasos:
+        paso.al_recibir = _sin_historial(paso.al_recibir)
+
+    def al_progreso(fraccion, texto):
+        progreso["barra"]["value"] = fraccion * 100
+        progreso["texto"].config(text=texto)
+
+    def terminar(resumen):
+        progreso["importacion"] = None
+        progreso["marco"].pack_forget()
+        if resumen["error"] is not None:
+            messagebox.showerror("Error leyendo CSV", f"No se pudo importar:\n{resumen['error']}")
+        elif resumen["cancelada"]:
+            print(f"Importación cancelada tras {resumen['filas']} filas.")
+        else:
+            print(f"Importadas {resumen['filas']} filas en {resumen['segundos']:.3f} s")
+        if resumen["errores"] is not None:
+            for fichero, errores in resumen["errores"].groupby("fichero", sort=False):
+                print(f"{fichero}: {resumen_errores(errores, fila='linea')}")
+        if al_terminar is not None:
+            al_terminar(resumen)
+
+    importacion = ImportacionCSV(progreso["marco"], pasos, al_progreso, terminar)
+    progreso["importacion"] = importacion
+    progreso["barra"]["value"] = 0
+    progreso["texto"].config(text="Importando...")
+    progreso["marco"].pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=5, before=progreso["antes"])
+    importacion.iniciar()
+
+
+def _sin_historial(recibir):
+    def recibir_sin_historial(df):
+        with historial.sin_registrar():
+            return recibir(df)
+    return recibir_sin_historial
+
+
+def cancelar_importacion():
+    if progreso["importacion"] is not None:
+        progreso["importacion"].cancelar()
+
+
+# ==========================================================
+# Deshacer y rehacer
+# ==========================================================
+def init_historial(root, antes):
+    """
+    Barra con Deshacer, Rehacer y "Volver a..." (los últimos pasos) encima
+    del widget 'antes' (el Notebook). También Ctrl+Z y Ctrl+Y en toda la ventana.
+    """
+    barra = ttk.Frame(root)
+    barra.pack(side=tk.TOP, fill=tk.X, padx=10, pady=(5, 0), before=antes)
+    b_deshacer = ttk.Button(barra, text="Deshacer", command=deshacer)
+    b_deshacer.pack(side=tk.LEFT)
+    b_rehacer = ttk.Button(barra, text="Rehacer", command=rehacer)
+    b_rehacer.pack(side=tk.LEFT, padx=5)
+    b_volver = ttk.Menubutton(barra, text="Volver a...")
+    b_volver.pack(side=tk.LEFT)
+    m_volver = tk.Menu(b_volver, tearoff=False)
+    b_volver["menu"] = m_volver
+
+    def actualizar_botones():
+        b_deshacer.state(["!disabled"] if historial.puede_deshacer() else ["disabled"])
+        b_rehacer.state(["!disabled"] if historial.puede_rehacer() else ["disabled"])
+        b_volver.state(["!disabled"] if historial.puede_deshacer() else ["disabled"])
+        # Cada entrada deja los datos como estaban justo antes de ese paso
+        m_volver.delete(0, tk.END)
+        for paso in historial.ultimos(MAX_PASOS_MENU):
+            hora = time.strftime("%H:%M:%S", time.localtime(paso.fecha))
+            m_volver.add_command(label=f"{hora}  antes de: {describir(paso)}",
+                                 command=lambda fecha=paso.fecha: volver_a(fecha))
+
+    historial.suscribir(actualizar_botones)
+    actualizar_botones()
+    root.bind_all("<Control-z>", lambda e: deshacer())
+    root.bind_all("<Control-y>", lambda e: rehacer())
+
+
+def deshacer():
+    for paso in historial.deshacer():
+        print(f"Deshecho: {describir(paso)}")
+
+
+def volver_a(fecha):
+    """Deja los datos como estaban antes del paso hecho en 'fecha' (menú "Volver a...")."""
+    for paso in historial.restaurar(fecha):
+        print(f"Deshecho: {describir(paso)}")
+
+
+def rehacer():
+    for paso in historial.rehacer():
+        print(f"Rehecho: {describir(paso)}")
+
+
+def elegir_csv(tree):
+    """
+    Importa empleados de otro CSV (se añaden a los que ya hay) y al
+    terminar busca personas repetidas.
+    """
+    ruta = filedialog.askopenfilename(title="Importar empleados",
+                                      filetypes=[("CSV", "*.csv"), ("Todos los archivos", "*.*")])
+
+    def revisar(resumen):
+        if resumen["filas"] and resumen["error"] is None and not resumen["cancelada"]:
+            seleccionar_duplicados(tree)
+
+    if ruta:
+        importar_csv([paso_empleados(ruta, recibir_empleados)], al_terminar=revisar)
+
+
+def seleccionar_duplicados(tree):
+    """
+    Busca personas repetidas entre todos los empleados, imprime las
+    propuestas de fusión y selecciona las filas que sobran (para
+    revisarlas y borrarlas con Eliminar Empleado).
+    """
+    sugerencias, omitidos = buscar_duplicados(empleados.dataframe())
+    if omitidos:
+        print(f"{omitidos} grupos de nombres demasiado grandes no se han comparado.")
+    if sugerencias.empty:
+        print("No se han encontrado empleados repetidos.")
+        return
+    print(f"{len(sugerencias)} posibles empleados repetidos (id que se conserva <- id que sobra):")
+    for s in sugerencias.head(MAX_SUGERENCIAS).itertuples(index=False):
+        print(f"  {s.conservar} <- {s.sobra}  ({s.puntuacion:.2f}: {s.motivos})")
+    tree.selection_set(sugerencias["sobra"].unique().tolist())
+
+
+def sugerir_traslados(tree):
+    """
+    Propone traslados de los departamentos con empleados de más a los que
+    tienen de menos (ver optimizador.py), selecciona a los empleados que
+    se moverían y, si se confirma, los mueve todos de una vez (se puede
+    deshacer como un solo paso).
+    """
+    traslados, resumen = proponer_traslados(empleados.dataframe(), departamentos.dataframe())
+    faltan_antes = (resumen["necesarios"] - resumen["antes"]).clip(lower=0).sum()
+    if traslados.empty:
+        print(f"No hay traslados posibles que reduzcan los {faltan_antes} empleados que faltan.")
+        return
+    print(f"{len(traslados)} traslados: faltan {faltan_antes} -> {resumen['faltan'].sum()} empleados")
+    for t in traslados.head(MAX_SUGERENCIAS).itertuples(index=False):
+        print(f"  {t.id} {t.nombre} {t.apellidos}: {t.origen} -> {t.destino}")
+    tree.selection_set(traslados["id"].tolist())
+    if not messagebox.askyesno("Proponer traslados", f"¿Aplicar los {len(traslados)} traslados propuestos?"):
+        return
+    cambios = []
+    for emp_id, destino in zip(traslados["id"].tolist(), traslados["destino"].tolist()):
+        anterior = empleados.obtener(emp_id).valores()
+        cambios.append((anterior, anterior[:5] + (destino,)))
+    empleados.aplicar_cambios(cambios)
+
+
+def confirmar_si_parecido(o_empleado):
+    """Si el empleado parece una persona que ya está (con otro id), pregunta si se guarda igualmente."""
+    fila = (o_empleado.id, o_empleado.nombre, o_empleado.apellidos, o_empleado.edad,
+            o_empleado.correo, o_empleado.departamento)
+    candidatos = indice_duplicados.candidatos(fila)
+    if not candidatos:
+        return True
+    _, emp_id, motivos = candidatos[0]
+    otro = empleados.obtener(emp_id)
+    return messagebox.askyesno(
+        "Posible empleado repetido",
+        f"Se parece al empleado {emp_id} ({otro.nombre} {otro.apellidos}): {', '.join(motivos)}.\n"
+        "¿Guardarlo de todos modos?")
 
 
 def add_empleado(tree, e_id, e_nombre, e_apellido, e_edad, e_correo, c_departamento):
@@ -45,8 +333,16 @@ def add_empleado(tree, e_id, e_nombre, e_apellido, e_edad, e_correo, c_departame
     # Comprobamos si el empleado es válido antes de añadirlo en la lista
     # de empleados y actualizamos el treeview
     if o_empleado.es_valido():
-        empleados.append(o_empleado)
-        update_treeview(tree)
+        if o_empleado.id in empleados:
+            print("Ya existe un empleado con ese id.")
+            return
+        if not confirmar_si_parecido(o_empleado):
+            return
+        try:
+            empleados.agregar(o_empleado)
+        except ValueError as e:
+            print(e)
+            return
     else:
         print("Por favor, complete todos los campos correctamente.")
         return
@@ -57,17 +353,54 @@ def delete_empleado(tree):
     if not selected:
         print("Selecciona una fila primero.")
         return
+    if len(selected) > 1 and not messagebox.askyesno(
+            "Eliminar empleados", f"¿Eliminar los {len(selected)} empleados seleccionados?"):
+        return
 
-    iid = selected[0]
-    values = tree.item(iid, "values")
-    emp_id = values[0]  # primera columna (id)
+    # los iids de las filas son los ids de los empleados: se borran todos
+    # de golpe, con un solo aviso (un refresco de índices y de la tabla)
+    empleados.eliminar_varios(selected)
 
-    # borrar de la lista empleados
-    global empleados
-    empleados = [emp for emp in empleados if str(emp.id) != str(emp_id)]
 
-    # refrescar tree
-    update_treeview(tree)
+# ==========================================================
+# Operaciones en bloque sobre los empleados seleccionados
+# ==========================================================
+# Campos que se pueden poner igual a varios empleados a la vez
+CAMPOS_EN_BLOQUE = {"Nombre": "nombre", "Apellidos": "apellidos", "Edad": "edad"}
+
+
+def mover_seleccion(tree, c_destino):
+    """Pasa los empleados seleccionados al departamento elegido (un solo cambio en bloque)."""
+    selected = tree.selection()
+    departamento = c_destino.get().strip()
+    if not selected:
+        print("Selecciona una o más filas primero.")
+        return
+    if not departamento:
+        print("Elige el departamento de destino.")
+        return
+    n = empleados.actualizar_varios(selected, departamento=departamento)
+    print(f"{n} empleados movidos a {departamento}.")
+
+
+def editar_seleccion(tree, c_campo, e_valor):
+    """Pone el mismo valor en un campo de todos los empleados seleccionados."""
+    selected = tree.selection()
+    if not selected:
+        print("Selecciona una o más filas primero.")
+        return
+    campo = CAMPOS_EN_BLOQUE.get(c_campo.get())
+    valor = e_valor.get().strip()
+    if campo is None or not valor:
+        print("Elige el campo y escribe el valor nuevo.")
+        return
+    if campo == "edad":
+        if not valor.isdigit() or int(valor) <= 0:
+            print("La edad tiene que ser un número mayor que 0.")
+            return
+        valor = int(valor)
+    n = empleados.actualizar_varios(selected, **{campo: valor})
+    print(f"{n} empleados actualizados.")
 
 
     # id_emp = e_id.get()
@@ -90,34 +423,37 @@ def delete_empleado(tree):
 def on_tree_select(event):
     selected_item = components[0].selection()
     if selected_item:
-        item = components[0].item(selected_item)
-        emp_id, nombre, apellidos, edad,correo, departamento = item['values']
+        # el iid de la fila lleva directamente al objeto Empleado
+        emp = empleados.obtener(selected_item[0])
+        if emp is None:
+            return
         components[1].delete(0, tk.END)
-        components[1].insert(0, emp_id)
+        components[1].insert(0, emp.id)
         components[2].delete(0, tk.END)
-        components[2].insert(0, nombre)
+        components[2].insert(0, emp.nombre)
         components[3].delete(0, tk.END)
-        components[3].insert(0, apellidos)
+        components[3].insert(0, emp.apellidos)
         components[4].delete(0, tk.END)
-        components[4].insert(0, edad)
+        components[4].insert(0, emp.edad)
         components[5].delete(0, tk.END)
-        components[5].insert(0, correo)
-        components[6].set(departamento)
+        components[5].insert(0, emp.correo)
+        components[6].set(emp.departamento)
 
 # Actualizar un empleado de la lista a partir de los campos de entrada
 def update_empleado_from_fields():
-    #buscar el empleado en la lista por id
+    #buscar el empleado en el repositorio por id
     e_id = components[1].get()
-    for emp in empleados:
-        if emp.id == e_id:
-            emp.nombre = components[2].get()
-            emp.apellidos = components[3].get()
-            emp.edad = int(components[4].get()) if components[4].get().isdigit() else 0
-            emp.correo = components[5].get()
-            emp.departamento = components[6].get()
-            break
-
-    update_treeview(components[0])
+    if e_id not in empleados:
+        print("No existe ningún empleado con ese id.")
+        return
+    empleados.actualizar(
+        e_id,
+        nombre=components[2].get(),
+        apellidos=components[3].get(),
+        edad=int(components[4].get()) if components[4].get().isdigit() else 0,
+        correo=components[5].get(),
+        departamento=components[6].get()
+    )
 
 def init_empleado(pestanas):
 
@@ -140,23 +476,39 @@ def init_empleado(pestanas):
 
     # treeview para mostrar la lista de empleados
     columnas = ("ID", "Nombre", "Apellidos", "Edad","Correo", "Departamento")
-    tree = ttk.Treeview(frame_derecha, columns=columnas, show="headings")
+    # Buscador sobre nombre, apellidos, correo y departamento (sin tildes ni mayúsculas)
+    frame_busqueda = ttk.Frame(frame_derecha)
+    frame_busqueda.pack(fill=tk.X, pady=(0, 10))
+    ttk.Label(frame_busqueda, text="Buscar: ").pack(side=tk.LEFT)
+    busqueda["entrada"] = ttk.Entry(frame_busqueda, width=40)
+    busqueda["entrada"].pack(side=tk.LEFT)
+    busqueda["etiqueta"] = ttk.Label(frame_busqueda, text="")
+    busqueda["etiqueta"].pack(side=tk.LEFT, padx=10)
+
+    # Tabla virtual: solo tiene en Tk las filas que se ven (ver tabla_virtual.py)
+    tree = crear_tabla_virtual(frame_derecha, columnas, _vista, _valores_empleado)
     components.append(tree)
     for col in columnas:
         tree.heading(col, text=col)
         tree.column(col, width=100, anchor=tk.CENTER)
     tree.pack(fill=tk.BOTH, expand=True)
-    for _, fila in df.iterrows():
-        empleado = Empleado(
-            id=int(fila['id']),
-            nombre=fila['nombre'],
-            apellidos=fila['apellidos'],
-            edad=int(fila['edad']),
-            correo=fila['correo'],
-            departamento=fila['departamento']
-        )
-        empleados.append(empleado)
-        update_treeview(tree)
+    # Pulsar una cabecera ordena por esa columna (otra vez: al revés)
+    orden["tabla"] = OrdenTabla(tree, columnas, (None, TEXTO, TEXTO, None, TEXTO, TEXTO),
+                                empleados.filas, _valores_empleado)
+    # Pintamos lo que ya haya cargado y, desde aquí, la tabla sigue al repositorio
+    # (altas, bajas y cambios, también los bloques que llegan importando)
+    update_treeview(tree)
+    empleados.suscribir(lambda cambios: _seguir_repositorio(tree, cambios))
+
+    # El índice de búsqueda se construye por partes para no congelar la ventana
+    def indice_listo():
+        if busqueda["activa"]:
+            buscar_empleados(tree)
+
+    busqueda["indice"] = IndiceBusqueda()
+    busqueda["indice"].indexar_por_partes(tree, empleados, al_terminar=indice_listo)
+    busqueda["entrada"].bind("<KeyRelease>", lambda e: _al_escribir_busqueda(tree))
+
 
     # Nueva etiqueta para la pestaña de Empleados
     # Campo entrada para la id del empleado
@@ -165,7 +517,7 @@ def init_empleado(pestanas):
     e_id = ttk.Entry(frame_izquierda, width=30, style="Tall.TEntry")
     components.append(e_id)
     e_id.grid(row=0, column=1, padx=10, pady=10)
-    b_id = ttk.Button(frame_izquierda, text="Generar Id", command=lambda: generate_id(e_id), style="Tall.TButton")
+    b_id = ttk.Button(frame_izquierda, text="Generar Id", command=lambda: generate_id(e_id, ids_empleados), style="Tall.TButton")
     b_id.grid(row=0, column=2, padx=10, pady=10)
     # Campo entrada para el nombre del empleado
     l_nombre = ttk.Label(frame_izquierda, text="Nombre: ", justify=tk.LEFT)
@@ -194,12 +546,11 @@ def init_empleado(pestanas):
     # Campo entrada para el departamento del empleado
     l_departamento = ttk.Label(frame_izquierda, text="Departamento: ", justify=tk.LEFT)
     l_departamento.grid(row=5, column=0, padx=10, pady=10)
-    c_departamento = ttk.Combobox(frame_izquierda, values=
-                                  ["Recursos Humanos", "Desarrollo", "Ventas", "Marketing", "IT","Operaciones","Finanzas"],
-                                  width=28, style="Tall.TCombobox")
+    # Los valores salen del registro de departamentos y se actualizan solos
+    c_departamento = ttk.Combobox(frame_izquierda, width=28, style="Tall.TCombobox")
     components.append(c_departamento)
     c_departamento.grid(row=5, column=1, padx=10, pady=10)
-    c_departamento.current(0)  # Selecciona el primer departamento por defecto
+    vincular_combobox(c_departamento)  # Selecciona el primer departamento por defecto
 
     # Boton Guardar empleado
     b_guardar = ttk.Button(frame_izquierda, text="Guardar Empleado" , 
@@ -216,6 +567,42 @@ def init_empleado(pestanas):
                               command=lambda: delete_empleado(tree),
                               style="Tall.TButton")
     b_eliminar.grid(row=6, column=2, padx=10, pady=20)
+    # Boton Importar CSV (en segundo plano, con barra de progreso)
+    b_importar = ttk.Button(frame_izquierda, text="Importar CSV",
+                            command=lambda: elegir_csv(tree),
+                            style="Tall.TButton")
+    b_importar.grid(row=7, column=0, padx=10, pady=10)
+    # Boton Buscar duplicados (selecciona los que sobran)
+    b_duplicados = ttk.Button(frame_izquierda, text="Buscar duplicados",
+                              command=lambda: seleccionar_duplicados(tree),
+                              style="Tall.TButton")
+    b_duplicados.grid(row=7, column=1, padx=10, pady=10)
+    # Boton Proponer traslados (cubrir los empleados necesarios de cada departamento)
+    b_traslados = ttk.Button(frame_izquierda, text="Proponer traslados",
+                             command=lambda: sugerir_traslados(tree),
+                             style="Tall.TButton")
+    b_traslados.grid(row=7, column=2, padx=10, pady=10)
+
+    # Operaciones en bloque sobre la selección (Ctrl/Shift + clic, Ctrl+A para todo lo que se ve)
+    f_bloque = ttk.LabelFrame(frame_izquierda, text="Selección: 0 empleados")
+    f_bloque.grid(row=8, column=0, columnspan=3, padx=10, pady=10, sticky="we")
+    ttk.Label(f_bloque, text="Mover a: ").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+    c_destino = ttk.Combobox(f_bloque, width=20)
+    c_destino.grid(row=0, column=1, padx=5, pady=5)
+    vincular_combobox(c_destino)
+    ttk.Button(f_bloque, text="Mover selección",
+               command=lambda: mover_seleccion(tree, c_destino)).grid(row=0, column=2, padx=5, pady=5)
+    c_campo = ttk.Combobox(f_bloque, values=list(CAMPOS_EN_BLOQUE), state="readonly", width=10)
+    c_campo.current(0)
+    c_campo.grid(row=1, column=0, padx=5, pady=5)
+    e_valor = ttk.Entry(f_bloque, width=22)
+    e_valor.grid(row=1, column=1, padx=5, pady=5)
+    ttk.Button(f_bloque, text="Aplicar a la selección",
+               command=lambda: editar_seleccion(tree, c_campo, e_valor)).grid(row=1, column=2, padx=5, pady=5)
+
+    def contar_seleccion(event=None):
+        f_bloque.config(text=f"Selección: {len(tree.selection())} empleados")
 
     # Bind para seleccionar un empleado y cargar sus datos en los campos de entrada
-    tree.bind("<<TreeviewSelect>>", on_tree_select) 
+    tree.bind("<<TreeviewSelect>>", on_tree_select)
+    tree.bind("<<TreeviewSelect>>", contar_seleccion, add="+")
@@ -1,124 +1,147 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-# Importamos la lista de empleados desde tu pestaña de empleados
-# (asegúrate de que en pestana_empleado.py exista una lista global llamada empleados)
-from pestana_empleado import empleados
+# Importamos los empleados y sus agregados por departamento desde la pestaña de empleados
+# ("empleados" es un EmpleadoRepository y "agregados" se actualiza con cada cambio)
+from pestana_empleado import empleados, agregados
 from pestana_departamentos import departamentos
-
-
-def _empleados_a_dataframe():
-    """Convierte la lista de objetos Empleado a un DataFrame."""
-    if not empleados:
-        return pd.DataFrame(columns=["id", "nombre", "apellidos", "edad", "departamento"])
-
-    data = []
-    for e in empleados:
-        data.append({
-            "id": e.id,
-            "nombre": e.nombre,
-            "apellidos": e.apellidos,
-            "edad": int(e.edad) if str(e.edad).isdigit() else 0,
-            "departamento": e.departamento
-        })
-    return pd.DataFrame(data)
-
-
-def informe_empleados_por_departamento():
-    df = _empleados_a_dataframe()
-    if df.empty:
-        messagebox.showwarning("Sin datos", "No hay empleados cargados para generar el informe.")
+from informes import INFORMES, FuenteMemoria, FuenteSQL, SinDatos
+from cache_informes import CacheLRU, Versiones
+
+COMPROBAR_MS = 50  # cada cuánto mira Tk si el hilo de trabajo ha terminado
+
+
+# Si la app usa SQLite (main.py --sqlite), los datos de los informes salen
+# de agregados SQL; si no, de los agregados que se mantienen en memoria.
+fuente = FuenteMemoria(agregados, departamentos)
+
+
+def usar_sql(almacen):
+    """Hace que los informes consulten un AlmacenSQLite."""
+    global fuente
+    fuente = FuenteSQL(almacen)
+    cache.vaciar()
+    imagenes.vaciar()
+    estado["clave"] = None
+
+
+# ==========================================================
+# Caché de resultados
+# ==========================================================
+# Los resultados se guardan por (informe, versión de los datos que usa).
+# Pedir otra vez un informe sin que hayan cambiado sus datos no pasa por
+# el hilo de trabajo: si es el que ya está dibujado no se hace nada, y si
+# no, se usa el resultado guardado.
+#
+# También se guarda la imagen ya pintada (los píxeles RGBA del canvas) por
+# (clave, tamaño): volver a un informe que ya se vio con estos datos solo
+# copia la imagen, sin crear artistas ni pasar por tight_layout ni Agg.
+# La figura sigue con los artistas del último informe dibujado de verdad;
+# el resultado de la imagen queda pendiente y se monta en la figura si
+# hay que volver a pintarla (al cambiar el tamaño de la ventana).
+versiones = Versiones()
+versiones.seguir("empleados", empleados)
+versiones.seguir("departamentos", departamentos)
+cache = CacheLRU()
+imagenes = CacheLRU()
+
+
+# ==========================================================
+# Generación en segundo plano
+# ==========================================================
+# Un único hilo de trabajo calcula los informes; Tk solo dibuja el
+# resultado. Hay una sola Figure incrustada en la pestaña: al repetir un
+# informe se actualizan sus artistas, y al cambiar de informe se limpia
+# la misma figura (no se abren ventanas ni se acumulan figuras).
+_trabajador = ThreadPoolExecutor(max_workers=1, thread_name_prefix="informes")
+# informe y artistas: lo que hay montado en la figura; clave: lo que se ve;
+# pendiente: (informe, resultado) de la imagen copiada, aún sin montar
+estado = {"canvas": None, "figura": None, "informe": None, "artistas": None,
+          "clave": None, "pendiente": None, "peticion": 0, "etiqueta": None}
+
+
+def generar_informe(titulo):
+    """Calcula el informe en el hilo de trabajo y lo dibuja al terminar."""
+    informe = INFORMES.get(titulo)
+    if informe is None:
+        messagebox.showinfo("Info", "Selecciona un informe válido.")
         return
 
-    conteo = df["departamento"].value_counts()
-
-    plt.figure()
-    wedges, texts, autotexts = plt.pie(
-        conteo.values,
-        labels=None,             # quitamos labels del propio gráfico
-        autopct="%1.1f%%",
-        startangle=90
-    )
-    plt.title("Distribución de empleados por departamento")
-    plt.axis("equal")
-
-    # Leyenda aparte (queda limpio)
-    plt.legend(
-        wedges,
-        conteo.index,
-        title="Departamento",
-        loc="center left",
-        bbox_to_anchor=(1.0, 0.5)
-    )
-
-    plt.tight_layout()
-    plt.show()
+    # Si se pide otro informe antes de terminar, el resultado anterior se descarta
+    estado["peticion"] += 1
+    peticion = estado["peticion"]
+    clave = (informe.clave, versiones.de(informe.depende))
+    if estado["clave"] == clave:
+        estado["etiqueta"].config(text="")
+        return  # ya está dibujado con estos mismos datos
+    resultado = cache.obtener(clave)
+    if resultado is not None:
+        estado["etiqueta"].config(text="")
+        _dibujar(informe, resultado, clave)
+        return
 
+    futuro = _trabajador.submit(informe.calcular, informe.datos(fuente))
+    estado["etiqueta"].config(text="Generando informe...")
+    estado["canvas"].get_tk_widget().after(COMPROBAR_MS, _esperar, futuro, informe, peticion, clave)
 
 
-def informe_histograma_edades():
-    df = _empleados_a_dataframe()
-    if df.empty:
-        messagebox.showwarning("Sin datos", "No hay empleados cargados para generar el informe.")
+def _esperar(futuro, informe, peticion, clave):
+    widget = estado["canvas"].get_tk_widget()
+    if not futuro.done():
+        widget.after(COMPROBAR_MS, _esperar, futuro, informe, peticion, clave)
         return
-
-    edades = df["edad"].astype(int)
-    edades = edades[edades > 0]  # por si hay edades 0 por errores de entrada
-
-    if edades.empty:
-        messagebox.showwarning("Datos inválidos", "No hay edades válidas para generar el informe.")
+    if peticion != estado["peticion"]:
         return
-
-    plt.figure()
-    plt.hist(edades, bins=10)  # no fijo colores (mejor práctica según tu entorno)
-    plt.title("Distribución de edades")
-    plt.xlabel("Edad")
-    plt.ylabel("Frecuencia")
-    plt.tight_layout()
-    plt.show()
-
-def informe_necesarios_vs_reales():
-    if not departamentos:
-        messagebox.showwarning("Sin datos", "No hay departamentos cargados.")
+    estado["etiqueta"].config(text="")
+    try:
+        resultado = futuro.result()
+    except SinDatos as e:
+        messagebox.showwarning("Sin datos", str(e))
+        return
+    except Exception as e:
+        messagebox.showerror("Error en el informe", f"No se pudo generar el informe:\n{e}")
         return
-    if not empleados:
-        messagebox.showwarning("Sin datos", "No hay empleados cargados.")
+    cache.guardar(clave, resultado)
+    _dibujar(informe, resultado, clave)
+
+
+def _dibujar(informe, resultado, clave):
+    canvas = estado["canvas"]
+    # get_renderer() rehace el buffer si ha cambiado el tamaño de la figura
+    pixeles = np.asarray(canvas.get_renderer().buffer_rgba())
+    clave_imagen = (clave, pixeles.shape)
+    estado["clave"] = clave
+    imagen = imagenes.obtener(clave_imagen)
+    if imagen is not None:
+        pixeles[...] = imagen
+        canvas.blit()
+        estado["pendiente"] = (informe, resultado)
         return
+    _montar(informe, resultado)
+    canvas.draw()
+    imagenes.guardar(clave_imagen, np.asarray(canvas.buffer_rgba()).copy())
+
+
+def _montar(informe, resultado):
+    """Pone el resultado en la figura (sin pintarla)."""
+    figura = estado["figura"]
+    artistas = estado["artistas"] if estado["informe"] is informe else None
+    estado["artistas"] = informe.dibujar(figura, resultado, artistas)
+    estado["informe"] = informe
+    estado["pendiente"] = None
+    figura.tight_layout()
+
+
+def _al_redimensionar(evento):
+    # Se va a pintar la figura de nuevo: tiene que tener lo que se está viendo
+    if estado["pendiente"] is not None:
+        _montar(*estado["pendiente"])
 
-    # Reales por departamento (desde empleados)
-    df_emp = pd.DataFrame([{
-        "departamento": e.departamento
-    } for e in empleados])
-
-    reales = df_emp["departamento"].value_counts()
-
-    # Necesarios por departamento (desde departamentos)
-    df_dep = pd.DataFrame([{
-        "departamento": d.nombre,
-        "necesarios": d.empleados_necesarios
-    } for d in departamentos])
-
-    # Unimos en una tabla
-    df = df_dep.copy()
-    df["reales"] = df["departamento"].map(reales).fillna(0).astype(int)
-
-    # Gráfico de barras comparativo
-    x = range(len(df))
-    plt.figure()
-    plt.bar([i - 0.2 for i in x], df["necesarios"], width=0.4, label="Necesarios")
-    plt.bar([i + 0.2 for i in x], df["reales"], width=0.4, label="Reales")
-
-    plt.xticks(list(x), df["departamento"], rotation=30, ha="right")
-    plt.title("Empleados necesarios vs empleados reales (por departamento)")
-    plt.xlabel("Departamento")
-    plt.ylabel("Cantidad")
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
 
 def init_informes(pestanas):
     # pestaña 3 (índice 3): Informes
@@ -130,7 +153,7 @@ def init_informes(pestanas):
 
     descripcion = ttk.Label(
         contenedor,
-        text="Elige un informe y pulsa el botón para generar una gráfica (se abrirá en una ventana nueva).",
+        text="Elige un informe y pulsa el botón para generar una gráfica (se mostrará debajo).",
         font=("Arial", 11)
     )
     descripcion.pack(anchor="w", pady=(0, 20))
@@ -141,26 +164,22 @@ def init_informes(pestanas):
 
     ttk.Label(frame_selector, text="Selecciona informe:", font=("Arial", 12)).grid(row=0, column=0, padx=(0, 10))
 
-    informes = [
-        "Empleados por departamento (grafico circular)",
-        "Distribución de edades (histograma)",
-        "Necesarios vs reales por departamento (comparativo)",
-    ]
+    informes = list(INFORMES)
 
     combo = ttk.Combobox(frame_selector, values=informes, state="readonly", width=45)
     combo.current(0)
     combo.grid(row=0, column=1, padx=(0, 10))
 
     def ejecutar_informe():
-        seleccion = combo.get()
-        if seleccion == informes[0]:
-            informe_empleados_por_departamento()
-        elif seleccion == informes[1]:
-            informe_histograma_edades()
-        elif seleccion == informes[2]:
-            informe_necesarios_vs_reales()
-        else:
-            messagebox.showinfo("Info", "Selecciona un informe válido.")
-
-    btn = ttk.Button(contenedor, text="Generar informe", command=ejecutar_informe)
-    btn.pack(anchor="w", pady=20)
+        generar_informe(combo.get())
+
+    btn = ttk.Button(frame_selector, text="Generar informe", command=ejecutar_informe)
+    btn.grid(row=0, column=2, padx=(0, 10))
+    estado["etiqueta"] = ttk.Label(frame_selector, text="")
+    estado["etiqueta"].grid(row=0, column=3)
+
+    # Gráfica incrustada en la pestaña (se reutiliza para todos los informes)
+    estado["figura"] = Figure(figsize=(8, 4.5), dpi=100)
+    estado["canvas"] = FigureCanvasTkAgg(estado["figura"], master=contenedor)
+    estado["canvas"].get_tk_widget().pack(fill="both", expand=True, pady=(20, 0))
+    estado["canvas"].mpl_connect("resize_event", _al_redimensionar)
@@ -0,0 +1,231 @@
+# ==========================================================
+# Registro de departamentos con índices únicos por id y nombre
+# ==========================================================
+# Sustituye a la lista global 'departamentos'. Las comprobaciones de
+# duplicados son O(1) y no puede haber dos departamentos con el mismo
+# nombre (los informes cruzan empleados y departamentos por nombre).
+#
+# Igual que EmpleadoRepository, avisa a sus oyentes con una lista de
+# cambios (anterior, nuevo); cada elemento es una tupla con los CAMPOS
+# del departamento o None.
+from repositorio_empleados import normalizar_id
+
+CAMPOS = ("id", "nombre", "empleados_necesarios", "presupuesto", "horas_disponibles")
+
+
+def normalizar_nombre(nombre):
+    """Los nombres se comparan sin espacios sobrantes y sin distinguir mayúsculas."""
+    return " ".join(str(nombre).split()).casefold()
+
+
+def valores_de(dep):
+    """Tupla con los CAMPOS de un departamento."""
+    return tuple(getattr(dep, campo) for campo in CAMPOS)
+
+
+class RegistroDepartamentos:
+    """Guarda los objetos Departamento indexados por id y por nombre."""
+
+    def __init__(self, departamentos=()):
+        self._por_id = {}      # id -> Departamento (mantiene el orden de alta)
+        self._por_nombre = {}  # nombre normalizado -> Departamento
+        self._oyentes = []     # funciones que reciben la lista de cambios
+        self.agregar_varios(departamentos)
+
+    # ---------- consultas ----------
+    def __len__(self):
+        return len(self._por_id)
+
+    def __iter__(self):
+        return iter(self._por_id.values())
+
+    def __contains__(self, dep_id):
+        return normalizar_id(dep_id) in self._por_id
+
+    def obtener(self, dep_id):
+        """Devuelve el departamento con ese id (o con ese iid del Treeview) o None."""
+        return self._por_id.get(normalizar_id(dep_id))
+
+    def por_nombre(self, nombre):
+        return self._por_nombre.get(normalizar_nombre(nombre))
+
+    def existe_nombre(self, nombre, excepto_id=None):
+        """True si otro departamento (distinto de excepto_id) ya usa ese nombre."""
+        dep = self.por_nombre(nombre)
+        return dep is not None and dep.id != normalizar_id(excepto_id)
+
+    def nombres(self):
+        """Nombres de los departamentos, en orden de alta (para los Combobox)."""
+        return [d.nombre for d in self._por_id.values()]
+
+    def dataframe(self):
+        """DataFrame con los CAMPOS de todos los departamentos, en orden de alta."""
+        import pandas as pd
+        return pd.DataFrame([valores_de(dep) for dep in self], columns=list(CAMPOS))
+
+    # ---------- altas, bajas y cambios ----------
+    def agregar(self, dep):
+        """Añade un departamento. Lanza ValueError si el id o el nombre ya existen."""
+        dep.id = normalizar_id(dep.id)
+        self._comprobar_unico(dep.id, dep.nombre)
+        self._por_id[dep.id] = dep
+        self._por_nombre[normalizar_nombre(dep.nombre)] = dep
+        self._notificar([(None, valores_de(dep))])
+        return dep
+
+    def agregar_varios(self, departamentos, omitir_repetidos=False):
+        """
+        Añade varios departamentos con un solo aviso y devuelve los añadidos.
+        Con omitir_repetidos=True, los que repiten id o nombre se saltan en
+        lugar de lanzar ValueError.
+        """
+        anadidos = []
+        try:
+            for dep in departamentos:
+                dep.id = normalizar_id(dep.id)
+                try:
+                    self._comprobar_unico(dep.id, dep.nombre)
+                except ValueError:
+                    if omitir_repetidos:
+                        continue
+                    raise
+                self._por_id[dep.id] = dep
+                self._por_nombre[normalizar_nombre(dep.nombre)] = dep
+                anadidos.append(dep)
+        finally:
+            self._notificar([(None, valores_de(dep)) for dep in anadidos])
+        return anadidos
+
+    def reemplazar(self, departamentos):
+        """
+        Sustituye todo el contenido. Si hay duplicados se lanza ValueError
+        y el registro se queda como estaba.
+        """
+        nuevo = RegistroDepartamentos(departamentos)
+        cambios = [(valores_de(d), None) for d in self] + [(None, valores_de(d)) for d in nuevo]
+        self._por_id = nuevo._por_id
+        self._por_nombre = nuevo._por_nombre
+        self._notificar(cambios)
+
+    def eliminar(self, dep_id):
+        """Quita el departamento y lo devuelve (None si no existía)."""
+        dep = self._por_id.pop(normalizar_id(dep_id), None)
+        if dep is not None:
+            del self._por_nombre[normalizar_nombre(dep.nombre)]
+            self._notificar([(valores_de(dep), None)])
+        return dep
+
+    def eliminar_varios(self, ids):
+        """Quita varios departamentos con un solo aviso y devuelve cuántos se quitaron."""
+        bajas = []
+        for dep_id in ids:
+            dep = self._por_id.pop(normalizar_id(dep_id), None)
+            if dep is not None:
+                del self._por_nombre[normalizar_nombre(dep.nombre)]
+                bajas.append((valores_de(dep), None))
+        self._notificar(bajas)
+        return len(bajas)
+
+    def actualizar(self, dep_id, **campos):
+        """Cambia los campos indicados manteniendo la unicidad de id y nombre."""
+        dep = self.obtener(dep_id)
+        if dep is None:
+            raise KeyError(f"No existe el departamento con id {dep_id}")
+
+        nuevo_id = normalizar_id(campos.pop("id", dep.id))
+        nuevo_nombre = campos.pop("nombre", dep.nombre)
+        self._comprobar_unico(nuevo_id, nuevo_nombre, actual=dep)
+        anterior = valores_de(dep)
+
+        # Si el id no cambia, el departamento conserva su posición
+        if nuevo_id != dep.id:
+            del self._por_id[dep.id]
+            self._por_id[nuevo_id] = dep
+        del self._por_nombre[normalizar_nombre(dep.nombre)]
+        dep.id = nuevo_id
+        dep.nombre = nuevo_nombre
+        for campo, valor in campos.items():
+            setattr(dep, campo, valor)
+        self._por_nombre[normalizar_nombre(dep.nombre)] = dep
+        self._notificar([(anterior, valores_de(dep))])
+        return dep
+
+    def actualizar_varios(self, ids, **campos):
+        """
+        Pone los mismos valores en los campos indicados de varios departamentos
+        con un solo aviso. El id y el nombre son únicos y no se pueden cambiar así.
+        Devuelve cuántos se actualizaron.
+        """
+        if "id" in campos or "nombre" in campos:
+            raise ValueError("No se puede poner el mismo id o nombre a varios departamentos")
+        cambios = []
+        for dep_id in ids:
+            dep = self.obtener(dep_id)
+            if dep is None:
+                continue
+            anterior = valores_de(dep)
+            for campo, valor in campos.items():
+                setattr(dep, campo, valor)
+            if valores_de(dep) != anterior:
+                cambios.append((anterior, valores_de(dep)))
+        self._notificar(cambios)
+        return len(cambios)
+
+    def aplicar_cambios(self, cambios):
+        """
+        Deja los departamentos como dice una lista de cambios (anterior, nuevo)
+        con un solo aviso (deshacer y rehacer, ver historial.py). Lo que
+        rompería la unicidad de id o nombre, o se refiere a un departamento
+        que ya no está, se salta. Devuelve cuántos se aplicaron.
+        """
+        from departamento import Departamento
+
+        hechos = []
+        for anterior, nuevo in cambios:
+            dep = None if anterior is None else self._por_id.get(anterior[0])
+            if anterior is not None and dep is None:
+                continue
+            if nuevo is None:
+                del self._por_id[dep.id]
+                del self._por_nombre[normalizar_nombre(dep.nombre)]
+                hechos.append((valores_de(dep), None))
+                continue
+            try:
+                self._comprobar_unico(nuevo[0], nuevo[1], actual=dep)
+            except ValueError:
+                continue
+            if dep is None:
+                dep = Departamento(*nuevo)
+                self._por_id[dep.id] = dep
+                actual = None
+            else:
+                actual = valores_de(dep)
+                del self._por_nombre[normalizar_nombre(dep.nombre)]
+                if nuevo[0] != dep.id:
+                    del self._por_id[dep.id]
+                    self._por_id[nuevo[0]] = dep
+                for campo, valor in zip(CAMPOS, nuevo):
+                    setattr(dep, campo, valor)
+            self._por_nombre[normalizar_nombre(dep.nombre)] = dep
+            hechos.append((actual, valores_de(dep)))
+        self._notificar(hechos)
+        return len(hechos)
+
+    def _comprobar_unico(self, dep_id, nombre, actual=None):
+        otro = self._por_id.get(dep_id)
+        if otro is not None and otro is not actual:
+            raise ValueError(f"Ya existe un departamento con id {dep_id}")
+        otro = self._por_nombre.get(normalizar_nombre(nombre))
+        if otro is not None and otro is not actual:
+            raise ValueError(f"Ya existe un departamento llamado {nombre}")
+
+    # ---------- avisos ----------
+    def suscribir(self, funcion):
+        """Registra una función que recibe la lista de cambios (anterior, nuevo)."""
+        self._oyentes.append(funcion)
+
+    def _notificar(self, cambios):
+        if not cambios:
+            return
+        for funcion in self._oyentes:
+            funcion(cambios)
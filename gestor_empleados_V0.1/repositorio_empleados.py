@@ -0,0 +1,284 @@
+# ==========================================================
+# Repositorio de empleados en memoria con índices
+# ==========================================================
+# Sustituye a la lista global 'empleados': todas las operaciones CRUD
+# son O(1) gracias al índice por id del almacén columnar y a índices
+# secundarios por departamento y por correo.
+#
+# Cada cambio se avisa a los oyentes suscritos como una lista de pares
+# (anterior, nuevo), donde cada elemento es una tupla con los CAMPOS del
+# empleado o None:
+#   alta          -> (None, nuevo)
+#   baja          -> (anterior, None)
+#   modificación  -> (anterior, nuevo)
+import numpy as np
+
+from almacen_columnar import AlmacenColumnar, FilaEmpleado, CAMPOS
+from empleado import Empleado
+
+
+def normalizar_id(valor):
+    """
+    Devuelve el id en una forma única para poder compararlo:
+    '  42 ', 42 y '42' pasan a ser el entero 42.
+    Si no es numérico se devuelve el texto sin espacios.
+    """
+    if isinstance(valor, int):
+        return valor
+    texto = str(valor).strip()
+    return int(texto) if texto.isdigit() else texto
+
+
+def normalizar_correo(correo):
+    """Los correos se comparan sin espacios y en minúsculas."""
+    return str(correo).strip().lower()
+
+
+class EmpleadoRepository:
+    """
+    Guarda los empleados en un AlmacenColumnar indexados por id,
+    departamento y correo. Las consultas devuelven vistas FilaEmpleado.
+    """
+
+    def __init__(self, empleados=()):
+        self._almacen = AlmacenColumnar()
+        self._por_departamento = {}  # departamento -> {id: None} (conjunto ordenado)
+        self._por_correo = {}        # correo -> {id: None}
+        self._oyentes = []           # funciones que reciben la lista de cambios
+        self.agregar_varios(empleados)
+
+    # ---------- consultas ----------
+    def __len__(self):
+        return len(self._almacen)
+
+    def __iter__(self):
+        return (FilaEmpleado(self._almacen, emp_id) for emp_id in self._almacen.ids())
+
+    def __contains__(self, emp_id):
+        return normalizar_id(emp_id) in self._almacen
+
+    def obtener(self, emp_id):
+        """Devuelve la vista del empleado con ese id (o con ese iid del Treeview) o None."""
+        emp_id = normalizar_id(emp_id)
+        return FilaEmpleado(self._almacen, emp_id) if emp_id in self._almacen else None
+
+    def por_departamento(self, departamento):
+        """Empleados de un departamento."""
+        return [FilaEmpleado(self._almacen, i) for i in self._por_departamento.get(departamento, ())]
+
+    def por_correo(self, correo):
+        """Empleados con ese correo (sin distinguir mayúsculas)."""
+        return [FilaEmpleado(self._almacen, i) for i in self._por_correo.get(normalizar_correo(correo), ())]
+
+    def contar_por_departamento(self):
+        """Número de empleados de cada departamento."""
+        return {dep: len(ids) for dep, ids in self._por_departamento.items()}
+
+    def ids(self):
+        """Lista con los ids de todos los empleados (una copia: se puede recorrer mientras cambian)."""
+        return self._almacen.ids()
+
+    def ids_entre(self, inicio, fin):
+        """Ids de las posiciones [inicio, fin) en el orden de ids(), sin copiar el resto."""
+        return self._almacen.ids_entre(inicio, fin)
+
+    def filas(self):
+        """Tuplas (id, nombre, apellidos, edad, correo, departamento) de todos los empleados."""
+        return self._almacen.filas()
+
+    def dataframe(self):
+        """DataFrame montado sobre las columnas del almacén, sin copiarlas."""
+        return self._almacen.dataframe()
+
+    def foto(self):
+        """Copia de las columnas para otro hilo (ver AlmacenColumnar.foto)."""
+        return self._almacen.foto()
+
+    # ---------- altas y bajas ----------
+    def agregar(self, emp):
+        """
+        Añade un empleado (cualquier objeto con los atributos de Empleado).
+        Lanza ValueError si el id no es un entero o ya existe.
+        """
+        emp_id = self._id_valido(emp.id)
+        if emp_id in self._almacen:
+            raise ValueError(f"Ya existe un empleado con id {emp_id}")
+        nuevo = (emp_id, emp.nombre, emp.apellidos, emp.edad, emp.correo, emp.departamento)
+        self._almacen.agregar(*nuevo)
+        self._indexar(emp_id, emp.departamento, emp.correo)
+        self._notificar([(None, nuevo)])
+        return FilaEmpleado(self._almacen, emp_id)
+
+    def agregar_varios(self, empleados):
+        for emp in empleados:
+            self.agregar(emp)
+
+    def cargar_dataframe(self, df, omitir_repetidos=False):
+        """
+        Añade de golpe todos los empleados de un DataFrame con las columnas
+        de CAMPOS y devuelve las filas añadidas. Si algún id está repetido
+        no se añade nada, salvo con omitir_repetidos=True, que solo salta
+        esas filas (útil al importar por bloques).
+        """
+        ids = df["id"]
+        # Coste proporcional al bloque, no a todo lo que ya hay cargado
+        ocupados = np.fromiter((emp_id in self._almacen for emp_id in ids.tolist()), dtype=bool, count=len(ids))
+        repetidos = ids.duplicated() | ocupados
+        if repetidos.any():
+            if not omitir_repetidos:
+                raise ValueError(f"Ids de empleado repetidos: {', '.join(map(str, ids[repetidos].unique()[:10]))}")
+            df = df[~repetidos]
+        if df.empty:
+            return df
+
+        self._almacen.agregar_columnas(*(df[c] for c in CAMPOS))
+        nuevos = list(zip(*(df[c].tolist() for c in CAMPOS)))
+        for emp_id, _, _, _, correo, departamento in nuevos:
+            self._indexar(emp_id, departamento, correo)
+        self._notificar([(None, nuevo) for nuevo in nuevos])
+        return df
+
+    def eliminar(self, emp_id):
+        """Quita el empleado y devuelve un Empleado con sus datos (None si no existía)."""
+        emp_id = normalizar_id(emp_id)
+        if emp_id not in self._almacen:
+            return None
+        valores = self._almacen.fila(emp_id)
+        anterior = Empleado(*valores)
+        self._desindexar(emp_id, anterior.departamento, anterior.correo)
+        self._almacen.eliminar(emp_id)
+        self._notificar([(valores, None)])
+        return anterior
+
+    def eliminar_varios(self, ids):
+        """Quita varios empleados con un solo aviso y devuelve cuántos se quitaron."""
+        bajas = []
+        for emp_id in ids:
+            emp_id = normalizar_id(emp_id)
+            if emp_id not in self._almacen:
+                continue
+            valores = self._almacen.fila(emp_id)
+            self._desindexar(emp_id, valores[5], valores[4])
+            self._almacen.eliminar(emp_id)
+            bajas.append((valores, None))
+        self._notificar(bajas)
+        return len(bajas)
+
+    def actualizar(self, emp_id, **campos):
+        """
+        Cambia los campos indicados del empleado y mantiene los índices.
+        Si se cambia el id, se comprueba que el nuevo no esté ocupado.
+        """
+        emp_id = normalizar_id(emp_id)
+        if emp_id not in self._almacen:
+            raise KeyError(f"No existe el empleado con id {emp_id}")
+
+        nuevo_id = self._id_valido(campos.pop("id", emp_id))
+        if nuevo_id != emp_id and nuevo_id in self._almacen:
+            raise ValueError(f"Ya existe un empleado con id {nuevo_id}")
+
+        anterior = self._almacen.fila(emp_id)
+        self._desindexar(emp_id, anterior[5], anterior[4])
+        if nuevo_id != emp_id:
+            self._almacen.cambiar_id(emp_id, nuevo_id)
+        for campo, valor in campos.items():
+            self._almacen.escribir(nuevo_id, campo, valor)
+        nuevo = self._almacen.fila(nuevo_id)
+        self._indexar(nuevo_id, nuevo[5], nuevo[4])
+        self._notificar([(anterior, nuevo)])
+        return FilaEmpleado(self._almacen, nuevo_id)
+
+    def actualizar_varios(self, ids, **campos):
+        """
+        Pone los mismos valores en los campos indicados de varios empleados
+        (por ejemplo, moverlos a otro departamento) con un solo aviso.
+        El id no se puede cambiar así. Devuelve cuántos se actualizaron.
+        """
+        if "id" in campos:
+            raise ValueError("No se puede poner el mismo id a varios empleados")
+        cambios = []
+        for emp_id in ids:
+            emp_id = normalizar_id(emp_id)
+            if emp_id not in self._almacen:
+                continue
+            anterior = self._almacen.fila(emp_id)
+            self._desindexar(emp_id, anterior[5], anterior[4])
+            for campo, valor in campos.items():
+                self._almacen.escribir(emp_id, campo, valor)
+            nuevo = self._almacen.fila(emp_id)
+            self._indexar(emp_id, nuevo[5], nuevo[4])
+            if nuevo != anterior:
+                cambios.append((anterior, nuevo))
+        self._notificar(cambios)
+        return len(cambios)
+
+    def aplicar_cambios(self, cambios):
+        """
+        Deja los empleados como dice una lista de cambios (anterior, nuevo)
+        con un solo aviso (deshacer y rehacer, ver historial.py). Lo que ya
+        no cuadra se salta: un alta con un id ocupado, o una baja o
+        modificación de un id que ya no está. Devuelve cuántos se aplicaron.
+        """
+        hechos = []
+        for anterior, nuevo in cambios:
+            emp_id = None if anterior is None else anterior[0]
+            if emp_id is not None and emp_id not in self._almacen:
+                continue
+            if nuevo is not None and nuevo[0] != emp_id and nuevo[0] in self._almacen:
+                continue
+            actual = None if emp_id is None else self._almacen.fila(emp_id)
+            if actual is not None:
+                self._desindexar(emp_id, actual[5], actual[4])
+            if nuevo is None:
+                self._almacen.eliminar(emp_id)
+            elif actual is None:
+                self._almacen.agregar(*nuevo)
+            else:
+                # Modificación en el sitio: la fila no cambia de posición
+                if nuevo[0] != emp_id:
+                    self._almacen.cambiar_id(emp_id, nuevo[0])
+                for campo, valor in zip(CAMPOS[1:], nuevo[1:]):
+                    self._almacen.escribir(nuevo[0], campo, valor)
+            if nuevo is not None:
+                self._indexar(nuevo[0], nuevo[5], nuevo[4])
+            hechos.append((actual, nuevo))
+        self._notificar(hechos)
+        return len(hechos)
+
+    def vaciar(self):
+        bajas = [(anterior, None) for anterior in self._almacen.filas()]
+        self._almacen.vaciar()
+        self._por_departamento.clear()
+        self._por_correo.clear()
+        self._notificar(bajas)
+
+    # ---------- avisos ----------
+    def suscribir(self, funcion):
+        """Registra una función que recibe la lista de cambios (anterior, nuevo)."""
+        self._oyentes.append(funcion)
+
+    def _notificar(self, cambios):
+        if not cambios:
+            return
+        for funcion in self._oyentes:
+            funcion(cambios)
+
+    # ---------- índices secundarios ----------
+    def _id_valido(self, emp_id):
+        emp_id = normalizar_id(emp_id)
+        if not isinstance(emp_id, int):
+            raise ValueError(f"El id de empleado debe ser un número entero: {emp_id!r}")
+        return emp_id
+
+    def _indexar(self, emp_id, departamento, correo):
+        self._por_departamento.setdefault(departamento, {})[emp_id] = None
+        self._por_correo.setdefault(normalizar_correo(correo), {})[emp_id] = None
+
+    def _desindexar(self, emp_id, departamento, correo):
+        for indice, clave in ((self._por_departamento, departamento),
+                              (self._por_correo, normalizar_correo(correo))):
+            grupo = indice.get(clave)
+            if grupo is not None:
+                grupo.pop(emp_id, None)
+                if not grupo:
+                    del indice[clave]
@@ -0,0 +1,451 @@
+# ==========================================================
+# Servicio HTTP/JSON local sobre los empleados y departamentos
+# ==========================================================
+# Modo sin ventana para que otras herramientas lean y cambien los datos
+# de la base de datos SQLite (la misma que main.py --sqlite):
+#
+#   python servicio_api.py --sqlite gestor.db --puerto 8765
+#   python servicio_api.py --sqlite gestor.db --unix /tmp/gestor.sock
+#
+#   GET    /empleados?departamento=IT&desde=0&limite=100
+#   GET    /empleados/<id>
+#   POST   /empleados                 {"nombre": ..., "apellidos": ..., ...}
+#   PUT    /empleados/<id>            {"version": 3, "edad": 41}
+#   DELETE /empleados/<id>?version=3
+#   (igual con /departamentos)
+#   GET    /informes/plantilla | /informes/edades | /informes/necesarios
+#
+# - asyncio atiende las conexiones (HTTP/1.1 con keep-alive) en un solo hilo
+# - el trabajo con la base de datos va a un grupo fijo de hilos; cada hilo
+#   tiene su propia conexión SQLite (WAL: las lecturas van a la vez) y hay
+#   un tope de peticiones en espera (más allá se responde 503)
+# - los POST sin id reciben uno de un AsignadorIds (ids.py) por tabla, que
+#   continúa desde la marca guardada en la base de datos: como en la
+#   ventana, nunca se repite el id de un registro borrado
+# - concurrencia optimista: cada registro lleva una versión que sube al
+#   cambiarlo. PUT y DELETE tienen que decir qué versión leyeron (en el
+#   cuerpo, en ?version= o en la cabecera If-Match) y si otro cliente lo
+#   ha cambiado antes se responde 409 con la versión actual
+#
+# La ventana y el servicio no deben escribir a la vez en la misma base de
+# datos: la ventana no se entera de lo que cambia el servicio.
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+from almacen_sqlite import AlmacenSQLite, ConflictoVersion, TABLAS
+from departamento import Departamento
+from empleado import Empleado
+from ids import AsignadorIds, INICIO
+from validacion import MIN_INT64, MAX_INT64
+
+PUERTO = 8765
+TRABAJADORES = min(8, (os.cpu_count() or 1) + 2)  # hilos con conexión a SQLite
+MAX_PENDIENTES = 256        # peticiones esperando un hilo; más allá, 503
+MAX_CUERPO = 1024 * 1024    # bytes como mucho en el cuerpo de una petición
+ESPERA_INACTIVA = 30        # segundos que se mantiene abierta una conexión sin peticiones
+LIMITE_LISTADO = 100        # registros por página si no se dice otro
+MAX_LISTADO = 10_000
+
+RAZONES = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+           428: "Precondition Required", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+ENTERO = re.compile(r"[+-]?\d+")
+
+
+def _entero(valor):
+    """
+    Entero que llega en el JSON, la ruta o la consulta. Sin conversiones
+    silenciosas: 3.7 o true no son un 3 ni un 1, y lo que no cabe en un
+    INTEGER de SQLite (int64) tampoco vale.
+    """
+    if isinstance(valor, bool):
+        raise TypeError("un booleano no es un entero")
+    if isinstance(valor, float):
+        if not valor.is_integer():
+            raise ValueError("no es un número entero")
+        valor = int(valor)
+    elif isinstance(valor, str):
+        if not ENTERO.fullmatch(valor.strip()):
+            raise ValueError("no es un número entero")
+        valor = int(valor)
+    elif not isinstance(valor, int):
+        raise TypeError("no es un número entero")
+    if not MIN_INT64 <= valor <= MAX_INT64:
+        raise ValueError("está fuera de rango")
+    return valor
+
+
+def _decimal(valor):
+    """Número (entero o con decimales) finito; true y false no son números."""
+    if isinstance(valor, bool):
+        raise TypeError("un booleano no es un número")
+    valor = float(valor)
+    if not math.isfinite(valor):
+        raise ValueError("no es un número finito")
+    return valor
+
+
+def _texto(valor):
+    """Texto sin espacios sobrantes; un número, una lista o un objeto no se pasan a texto."""
+    if not isinstance(valor, str):
+        raise TypeError("no es un texto")
+    return valor.strip()
+
+
+# Cómo se convierte cada campo que llega en el JSON
+TIPOS_CAMPO = {
+    "id": _entero, "nombre": _texto, "apellidos": _texto, "edad": _entero, "correo": _texto, "departamento": _texto,
+    "empleados_necesarios": _entero, "presupuesto": _decimal, "horas_disponibles": _decimal,
+}
+CLASES = {"empleados": Empleado, "departamentos": Departamento}
+
+
+class ErrorApi(Exception):
+    """Error que se devuelve al cliente con su código HTTP."""
+
+    def __init__(self, estado, mensaje, **datos):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.datos = {"error": mensaje, **datos}
+
+
+# ==========================================================
+# Operaciones (se ejecutan en los hilos de trabajo)
+# ==========================================================
+def _valores(tabla, cuerpo, completo):
+    """
+    Campos de 'tabla' que trae el cuerpo, con su tipo. Si 'completo', tienen
+    que estar todos (salvo el id) y el registro tiene que ser válido como
+    en los formularios (Empleado.es_valido, Departamento.es_valido).
+    """
+    if not isinstance(cuerpo, dict):
+        raise ErrorApi(400, "El cuerpo tiene que ser un objeto JSON")
+    valores = {}
+    for campo in TABLAS[tabla]:
+        if campo in cuerpo and cuerpo[campo] is not None:
+            try:
+                valores[campo] = TIPOS_CAMPO[campo](cuerpo[campo])
+            except (TypeError, ValueError):
+                raise ErrorApi(400, f"Valor no válido para {campo}: {cuerpo[campo]!r}")
+    if completo:
+        faltan = [campo for campo in TABLAS[tabla] if campo != "id" and campo not in valores]
+        if faltan:
+            raise ErrorApi(400, f"Faltan campos: {', '.join(faltan)}")
+        # El id aún no existe si lo va a poner SQLite: se valida con uno cualquiera
+        if not CLASES[tabla](**{"id": 1, **valores}).es_valido():
+            raise ErrorApi(400, f"Datos no válidos para {tabla}")
+    return valores
+
+
+def _version(cuerpo, consulta, cabeceras):
+    """Versión que el cliente leyó: en el cuerpo, en ?version= o en If-Match."""
+    version = None
+    if isinstance(cuerpo, dict):
+        version = cuerpo.get("version")
+    version = version if version is not None else consulta.get("version")
+    version = version if version is not None else cabeceras.get("if-match", "").strip('"') or None
+    if version is None:
+        raise ErrorApi(428, "Falta la versión leída (campo version, ?version= o If-Match)")
+    try:
+        return _entero(version)
+    except (TypeError, ValueError):
+        raise ErrorApi(400, f"Versión no válida: {version!r}")
+
+
+def _id(texto):
+    try:
+        return _entero(texto)
+    except ValueError:
+        raise ErrorApi(404, f"No existe el registro {texto}")
+
+
+def listar(almacen, tabla, consulta):
+    try:
+        desde = _entero(consulta.get("desde", 0))
+        limite = max(1, min(_entero(consulta.get("limite", LIMITE_LISTADO)), MAX_LISTADO))
+    except ValueError:
+        raise ErrorApi(400, "desde y limite tienen que ser números")
+    filtros = {campo: valor for campo, valor in consulta.items() if campo in TABLAS[tabla] and campo != "id"}
+    registros = almacen.listar(tabla, desde, limite, **filtros)
+    siguiente = registros[-1]["id"] if len(registros) == limite else None
+    return 200, {"registros": registros, "siguiente": siguiente}
+
+
+def leer(almacen, tabla, registro_id):
+    registro = almacen.leer_registro(tabla, registro_id)
+    if registro is None:
+        raise ErrorApi(404, f"No existe el registro {registro_id} en {tabla}")
+    return 200, registro
+
+
+def asignadores(almacen):
+    """{tabla: AsignadorIds} que continúan desde la marca de la base de datos."""
+    ids = {}
+    for tabla in TABLAS:
+        ids[tabla] = AsignadorIds(inicio=INICIO)
+        ids[tabla].avanzar(almacen.marca_ids(tabla))
+    return ids
+
+
+def crear(almacen, tabla, cuerpo, ids):
+    valores = _valores(tabla, cuerpo, completo=True)
+    if "id" in valores:
+        ids[tabla].ocupar(valores["id"])
+    else:
+        valores["id"] = ids[tabla].siguiente()
+    try:
+        return 201, almacen.insertar(tabla, valores)
+    except sqlite3.IntegrityError:
+        raise ErrorApi(409, f"Ya existe en {tabla} un registro con ese id o nombre")
+
+
+def actualizar(almacen, tabla, registro_id, cuerpo, consulta, cabeceras):
+    version = _version(cuerpo, consulta, cabeceras)
+    valores = _valores(tabla, cuerpo, completo=False)
+    actual = almacen.leer_registro(tabla, registro_id)
+    if actual is None:
+        raise ErrorApi(404, f"No existe el registro {registro_id} en {tabla}")
+    # Lo que quedaría tiene que seguir siendo válido
+    _valores(tabla, {**actual, **valores}, completo=True)
+    try:
+        return 200, almacen.actualizar_si_version(tabla, registro_id, valores, version)
+    except KeyError:
+        raise ErrorApi(404, f"No existe el registro {registro_id} en {tabla}")
+    except ConflictoVersion as e:
+        raise ErrorApi(409, str(e), version=e.actual)
+    except sqlite3.IntegrityError:
+        raise ErrorApi(409, f"Ya existe en {tabla} un registro con ese id o nombre")
+
+
+def eliminar(almacen, tabla, registro_id, consulta, cabeceras):
+    version = _version(None, consulta, cabeceras)
+    try:
+        almacen.eliminar_si_version(tabla, registro_id, version)
+    except KeyError:
+        raise ErrorApi(404, f"No existe el registro {registro_id} en {tabla}")
+    except ConflictoVersion as e:
+        raise ErrorApi(409, str(e), version=e.actual)
+    return 204, None
+
+
+# Los tres informes de pestana_informes, con los agregados SQL de AlmacenSQLite
+INFORMES = {
+    "plantilla": lambda almacen: almacen.plantilla_por_departamento(),
+    "edades": lambda almacen: {str(edad): n for edad, n in sorted(almacen.recuento_edades().items())},
+    "necesarios": lambda almacen: [{"departamento": nombre, "necesarios": necesarios, "reales": reales}
+                                   for nombre, necesarios, reales in almacen.necesarios_vs_reales()],
+}
+
+
+def despachar(almacen, metodo, ruta, consulta, cabeceras, cuerpo, ids=None):
+    """
+    Ejecuta una petición y devuelve (código HTTP, datos para el JSON).
+    ids: asignadores() compartidos por todas las peticiones (si no se
+    pasan, se crean para esta desde la marca de la base de datos).
+    """
+    partes = [parte for parte in ruta.split("/") if parte]
+    if len(partes) == 2 and partes[0] == "informes":
+        if partes[1] not in INFORMES:
+            raise ErrorApi(404, f"No existe el informe {partes[1]}")
+        if metodo != "GET":
+            raise ErrorApi(405, "Los informes solo se leen con GET")
+        return 200, INFORMES[partes[1]](almacen)
+    if not partes or partes[0] not in TABLAS or len(partes) > 2:
+        raise ErrorApi(404, f"No existe la ruta {ruta}")
+
+    tabla = partes[0]
+    if len(partes) == 1:
+        if metodo == "GET":
+            return listar(almacen, tabla, consulta)
+        if metodo == "POST":
+            return crear(almacen, tabla, cuerpo, ids if ids is not None else asignadores(almacen))
+    else:
+        registro_id = _id(partes[1])
+        if metodo == "GET":
+            return leer(almacen, tabla, registro_id)
+        if metodo == "PUT":
+            return actualizar(almacen, tabla, registro_id, cuerpo, consulta, cabeceras)
+        if metodo == "DELETE":
+            return eliminar(almacen, tabla, registro_id, consulta, cabeceras)
+    raise ErrorApi(405, f"{metodo} no se admite en {ruta}")
+
+
+# ==========================================================
+# Servidor
+# ==========================================================
+class ServicioApi:
+    """Servidor HTTP/JSON con asyncio y un grupo fijo de hilos con su conexión a SQLite."""
+
+    def __init__(self, ruta_bd, trabajadores=TRABAJADORES, max_pendientes=MAX_PENDIENTES):
+        self.ruta_bd = ruta_bd
+        self.max_pendientes = max_pendientes
+        self.pendientes = 0
+        self._local = threading.local()
+        self._ids = None  # asignadores(), compartidos por todos los hilos
+        self._candado_ids = threading.Lock()
+        self._ejecutor = ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix="servicio")
+        self._servidor = None
+
+    def _almacen(self):
+        """Conexión del hilo actual (se abre la primera vez que la usa)."""
+        almacen = getattr(self._local, "almacen", None)
+        if almacen is None:
+            almacen = self._local.almacen = AlmacenSQLite(self.ruta_bd)
+        return almacen
+
+    def _asignadores(self):
+        with self._candado_ids:
+            if self._ids is None:
+                self._ids = asignadores(self._almacen())
+            return self._ids
+
+    def _ejecutar(self, metodo, ruta, consulta, cabeceras, cuerpo):
+        try:
+            return despachar(self._almacen(), metodo, ruta, consulta, cabeceras, cuerpo, self._asignadores())
+        except ErrorApi as e:
+            return e.estado, e.datos
+        except sqlite3.OperationalError as e:  # base de datos bloqueada demasiado tiempo
+            return 503, {"error": str(e)}
+
+    async def atender_peticion(self, metodo, destino, cabeceras, cuerpo_bytes):
+        """(código, datos) de una petición ya leída; el trabajo va a un hilo del grupo."""
+        url = urlsplit(destino)
+        consulta = dict(parse_qsl(url.query))
+        try:
+            cuerpo = json.loads(cuerpo_bytes) if cuerpo_bytes else None
+        except ValueError:
+            return 400, {"error": "El cuerpo no es JSON válido"}
+        if self.pendientes >= self.max_pendientes:
+            return 503, {"error": "Servicio ocupado, inténtalo más tarde"}
+        self.pendientes += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._ejecutor, self._ejecutar,
+                                              metodo, url.path, consulta, cabeceras, cuerpo)
+        finally:
+            self.pendientes -= 1
+
+    async def _atender_conexion(self, lector, escritor):
+        try:
+            while True:
+                try:
+                    linea = await asyncio.wait_for(lector.readline(), ESPERA_INACTIVA)
+                except asyncio.TimeoutError:
+                    break
+                if not linea.strip():
+                    break
+                try:
+                    metodo, destino, version_http = linea.decode("latin-1").split()
+                except ValueError:
+                    await _responder(escritor, 400, {"error": "Petición mal formada"}, cerrar=True)
+                    break
+                cabeceras = await _leer_cabeceras(lector)
+                try:
+                    largo = int(cabeceras.get("content-length", "0").strip() or 0)
+                except ValueError:
+                    largo = -1
+                if largo < 0:
+                    await _responder(escritor, 400, {"error": "Content-Length no válido"}, cerrar=True)
+                    break
+                if largo > MAX_CUERPO:
+                    await _responder(escritor, 413, {"error": "Cuerpo demasiado grande"}, cerrar=True)
+                    break
+                cuerpo = await lector.readexactly(largo) if largo else b""
+                cerrar = cabeceras.get("connection", "").lower() == "close" or version_http == "HTTP/1.0"
+                try:
+                    estado, datos = await self.atender_peticion(metodo.upper(), destino, cabeceras, cuerpo)
+                except Exception as e:  # no se tumba el servidor por una petición
+                    estado, datos = 500, {"error": str(e)}
+                await _responder(escritor, estado, datos, cerrar)
+                if cerrar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+    async def iniciar(self, host="127.0.0.1", puerto=PUERTO, unix=None):
+        if unix is not None:
+            self._servidor = await asyncio.start_unix_server(self._atender_conexion, path=unix)
+        else:
+            self._servidor = await asyncio.start_server(self._atender_conexion, host, puerto)
+        return self._servidor
+
+    async def servir(self, host="127.0.0.1", puerto=PUERTO, unix=None):
+        servidor = await self.iniciar(host, puerto, unix)
+        direccion = unix or ", ".join(f"http://{s.getsockname()[0]}:{s.getsockname()[1]}" for s in servidor.sockets)
+        print(f"Servicio escuchando en {direccion}")
+        async with servidor:
+            await servidor.serve_forever()
+
+    def cerrar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+        self._ejecutor.shutdown(wait=True)
+
+
+async def _leer_cabeceras(lector):
+    cabeceras = {}
+    while True:
+        linea = await lector.readline()
+        if linea in (b"\r\n", b"\n", b""):
+            return cabeceras
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        cabeceras[nombre.strip().lower()] = valor.strip()
+
+
+async def _responder(escritor, estado, datos, cerrar=False):
+    cuerpo = b"" if datos is None else json.dumps(datos, ensure_ascii=False).encode("utf-8")
+    cabeceras = [f"HTTP/1.1 {estado} {RAZONES.get(estado, '')}",
+                 f"Content-Length: {len(cuerpo)}",
+                 "Connection: close" if cerrar else "Connection: keep-alive"]
+    if cuerpo:
+        cabeceras.append("Content-Type: application/json; charset=utf-8")
+    if isinstance(datos, dict) and "version" in datos and estado < 300:
+        cabeceras.append(f'ETag: "{datos["version"]}"')
+    escritor.write(("\r\n".join(cabeceras) + "\r\n\r\n").encode("latin-1") + cuerpo)
+    await escritor.drain()
+
+
+def leer_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON del gestor de empleados (sin ventana)")
+    parser.add_argument("--sqlite", metavar="RUTA", default=os.environ.get("GESTOR_SQLITE", "gestor.db"),
+                        help="base de datos SQLite (se crea desde los CSV si no existe)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--unix", metavar="RUTA", help="escuchar en un socket Unix en lugar de TCP")
+    parser.add_argument("--trabajadores", type=int, default=TRABAJADORES,
+                        help="hilos (y conexiones a SQLite) que atienden las peticiones")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    argumentos = leer_argumentos(argv)
+    # Igual que main.py --sqlite: si la base de datos está vacía se llena con los CSV
+    almacen = AlmacenSQLite(argumentos.sqlite)
+    if almacen.esta_vacia():
+        almacen.importar_csv()
+    almacen.cerrar()
+
+    servicio = ServicioApi(argumentos.sqlite, argumentos.trabajadores)
+    try:
+        asyncio.run(servicio.servir(argumentos.host, argumentos.puerto, argumentos.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servicio.cerrar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# ==========================================================
+# Refresco incremental de un ttk.Treeview
+# ==========================================================
+# Cada fila del Treeview se identifica por un iid estable (el id del
+# empleado o del departamento). Guardamos en Python los valores que ya
+# están pintados, de modo que solo se envían a Tk las filas que cambian:
+#   - insert() para las nuevas
+#   - item(values=...) para las modificadas
+#   - delete() para las que ya no existen
+
+# Valores pintados por cada Treeview: {ruta_widget: {iid: values}}
+_pintado = {}
+
+
+def _filas_de(tree):
+    """Devuelve el diccionario iid -> values que hay pintado en el Treeview."""
+    return _pintado.setdefault(str(tree), {})
+
+
+def iid_de(id_registro):
+    """Convierte un id de empleado/departamento en el iid del Treeview."""
+    return str(id_registro).strip()
+
+
+def insertar_fila(tree, iid, valores, index="end"):
+    """Añade una fila nueva (1 llamada a Tk)."""
+    filas = _filas_de(tree)
+    valores = tuple(valores)
+    tree.insert("", index, iid=iid, values=valores)
+    filas[iid] = valores
+
+
+def actualizar_fila(tree, iid, valores):
+    """Actualiza en el sitio una fila existente (0 o 1 llamadas a Tk)."""
+    filas = _filas_de(tree)
+    valores = tuple(valores)
+    if filas.get(iid) == valores:
+        return
+    tree.item(iid, values=valores)
+    filas[iid] = valores
+
+
+def borrar_fila(tree, iid):
+    """Elimina una fila (1 llamada a Tk)."""
+    filas = _filas_de(tree)
+    if filas.pop(iid, None) is not None:
+        tree.delete(iid)
+
+
+def ordenar_filas(tree, iids):
+    """
+    Recoloca las filas en el orden de 'iids' con una sola llamada a Tk
+    ('children' con la lista nueva). Equivale a un tree.move() por fila,
+    pero cada move recorre la lista de hijos y con muchas filas sería O(n²).
+    'iids' tiene que contener todas las filas pintadas.
+    """
+    tree.set_children("", *iids)
+
+
+def sincronizar_treeview(tree, filas_nuevas):
+    """
+    Deja el Treeview igual que 'filas_nuevas' (iterable de (iid, values))
+    aplicando solo las diferencias.
+
+    El coste en llamadas a Tk es proporcional al número de filas que
+    cambian, no al tamaño de la tabla.
+    """
+    filas = _filas_de(tree)
+    vistas = set()
+
+    for iid, valores in filas_nuevas:
+        vistas.add(iid)
+        if iid in filas:
+            actualizar_fila(tree, iid, valores)
+        else:
+            insertar_fila(tree, iid, valores)
+
+    # Las que estaban pintadas y ya no existen se borran de una vez
+    sobrantes = [iid for iid in filas if iid not in vistas]
+    if sobrantes:
+        tree.delete(*sobrantes)
+        for iid in sobrantes:
+            del filas[iid]
+
+
+def olvidar_treeview(tree):
+    """Descarta la caché de un Treeview (por ejemplo, al destruirlo)."""
+    _pintado.pop(str(tree), None)
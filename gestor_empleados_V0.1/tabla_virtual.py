@@ -0,0 +1,240 @@
+# ==========================================================
+# Tabla virtual: un Treeview que solo tiene las filas a la vista
+# ==========================================================
+# Un ttk.Treeview normal tiene un elemento de Tk por registro, así que
+# la memoria y las llamadas a Tk crecen con los datos. La tabla virtual
+# tiene como mucho las filas que caben en pantalla más OVERSCAN por
+# arriba y por abajo. Al desplazarse se piden al almacén las filas de la
+# nueva ventana y se pintan con sincronizar_treeview (solo van a Tk las
+# que cambian), así que desplazarse por 5 millones de empleados cuesta lo
+# mismo que por 50.
+#
+# Lo que se enseña lo da una "vista": cualquier objeto con len() y
+# cortes [inicio:fin] que devuelvan ids (una lista, una VistaPerezosa
+# sobre el repositorio, la lista de un índice de orden...).
+#
+# La barra de desplazamiento es propia: la del Treeview solo vería la
+# ventana. Si el Treeview se mueve solo (flechas del teclado), se mueve
+# dentro del margen OVERSCAN y la ventana se recoloca a su alrededor.
+#
+# La selección se guarda por iid, así se mantiene aunque la fila salga
+# de la ventana (Ctrl+A selecciona toda la vista, para las operaciones
+# en bloque). Para que el resto de la pestaña no cambie, la tabla
+# responde a selection(), item(iid, "values"), heading(), column(),
+# bind(), pack() y after() como un Treeview.
+import tkinter as tk
+from tkinter import ttk
+
+from tabla_incremental import iid_de, sincronizar_treeview, ordenar_filas
+
+OVERSCAN = 20         # filas de margen pintadas por encima y por debajo de las visibles
+FILAS_INICIALES = 40  # filas visibles supuestas hasta que el Treeview dice cuántas caben
+PASO_RUEDA = 3        # filas por cada paso de la rueda del ratón
+# Shift o Control en event.state: el clic o la tecla amplían la selección
+_AMPLIAR = 0x0001 | 0x0004
+
+
+class VistaPerezosa:
+    """Vista que pide los ids por trozos, sin copiar la lista entera."""
+
+    def __init__(self, contar, trozo):
+        self.contar = contar  # función -> número de ids
+        self.trozo = trozo    # función (inicio, fin) -> lista de ids
+
+    def __len__(self):
+        return self.contar()
+
+    def __getitem__(self, corte):
+        inicio, fin, _ = corte.indices(len(self))
+        return self.trozo(inicio, fin)
+
+
+def crear_tabla_virtual(padre, columnas, fuente, valores_de, **opciones):
+    """Crea el Treeview y su barra de desplazamiento dentro de un Frame."""
+    marco = ttk.Frame(padre)
+    tree = ttk.Treeview(marco, columns=columnas, show="headings", **opciones)
+    barra = ttk.Scrollbar(marco, orient=tk.VERTICAL)
+    barra.pack(side=tk.RIGHT, fill=tk.Y)
+    tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    tabla = TablaVirtual(tree, barra, fuente, valores_de)
+    barra.configure(command=tabla.desplazar)
+    for evento in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+        tree.bind(evento, tabla._rueda)
+    return tabla
+
+
+class TablaVirtual:
+    """Ventana de filas de una vista pintada en un Treeview."""
+
+    def __init__(self, tree, barra, fuente, valores_de):
+        """
+        fuente: función que devuelve la vista actual (se llama al pintar)
+        valores_de: función id/iid -> tupla de valores de la fila (None si no existe)
+        """
+        self.tree = tree
+        self.barra = barra
+        self.fuente = fuente
+        self.valores_de = valores_de
+        self.vista = []
+        self.primera = 0                  # posición en la vista de la primera fila visible
+        self.visibles = FILAS_INICIALES
+        self._inicio = 0                  # posición en la vista de la primera fila pintada
+        self._pintadas = []               # iids pintados, en orden
+        self._seleccion = {}              # iid -> None (conjunto ordenado)
+        self._ampliar = False
+        self._oyentes_seleccion = []
+        self._pendiente = None
+        tree.configure(yscrollcommand=self._al_moverse_tree)
+        tree.bind("<<TreeviewSelect>>", self._al_seleccionar)
+        tree.bind("<ButtonPress-1>", self._al_pulsar, add="+")
+        tree.bind("<KeyPress>", self._al_pulsar, add="+")
+        tree.bind("<Control-a>", self.seleccionar_todo)
+
+    # ---------- pintar ----------
+    def refrescar(self, cambios=None):
+        """
+        Vuelve a pintar la ventana cuando Tk esté libre (varios avisos
+        seguidos se pintan una sola vez). Con los cambios del repositorio se
+        quitan de la selección las filas borradas o que han cambiado de id
+        (y se avisa, como hace el Treeview al borrar filas seleccionadas).
+        """
+        antes = len(self._seleccion)
+        for anterior, nuevo in cambios or ():
+            if anterior is not None and (nuevo is None or nuevo[0] != anterior[0]):
+                self._seleccion.pop(iid_de(anterior[0]), None)
+        if len(self._seleccion) != antes:
+            self._avisar_seleccion(None)
+        if self._pendiente is None:
+            self._pendiente = self.tree.after_idle(self.pintar)
+
+    def pintar(self):
+        """Pinta ya las filas de la ventana actual."""
+        self._pendiente = None
+        self.vista = self.fuente()
+        total = len(self.vista)
+        self.primera = max(0, min(self.primera, total - self.visibles))
+        inicio = max(0, self.primera - OVERSCAN)
+        filas = []
+        for registro_id in self.vista[inicio:self.primera + self.visibles + OVERSCAN]:
+            valores = self.valores_de(registro_id)
+            if valores is not None:
+                filas.append((iid_de(registro_id), valores))
+
+        sincronizar_treeview(self.tree, filas)
+        self._pintadas = [iid for iid, _ in filas]
+        self._inicio = inicio
+        ordenar_filas(self.tree, self._pintadas)
+        self.tree.selection_set([iid for iid in self._pintadas if iid in self._seleccion])
+        if self._pintadas:
+            # +0.1: que el redondeo de Tk no deje la ventana una fila más arriba
+            self.tree.yview_moveto((self.primera - inicio + 0.1) / len(self._pintadas))
+        self._actualizar_barra()
+
+    def ir_a(self, posicion):
+        """Desplaza la tabla para que la fila 'posicion' de la vista sea la primera visible."""
+        self.primera = max(0, posicion)
+        self.refrescar()
+
+    def _actualizar_barra(self):
+        total = len(self.vista)
+        if total <= self.visibles:
+            self.barra.set(0.0, 1.0)
+        else:
+            self.barra.set(self.primera / total, min(1.0, (self.primera + self.visibles) / total))
+
+    # ---------- desplazamiento ----------
+    def desplazar(self, accion, cantidad, unidad=None):
+        """Órdenes de la barra de desplazamiento ("moveto" o "scroll")."""
+        if accion == "moveto":
+            self.primera = int(float(cantidad) * len(self.vista))
+        else:
+            paso = self.visibles if unidad == "pages" else 1
+            self.primera += int(cantidad) * paso
+        self.ir_a(self.primera)
+
+    def _rueda(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.desplazar("scroll", -PASO_RUEDA)
+        else:
+            self.desplazar("scroll", PASO_RUEDA)
+        return "break"
+
+    def _al_moverse_tree(self, primero, ultimo):
+        """yscrollcommand del Treeview: cuántas filas caben y si se ha movido solo."""
+        n = len(self._pintadas)
+        if not n:
+            return
+        primero, ultimo = float(primero), float(ultimo)
+        desde = self._inicio + round(primero * n)
+        if ultimo < 1.0:
+            self.visibles = max(1, round((ultimo - primero) * n))
+        elif self._inicio + n < len(self.vista):
+            # Se ve hasta el final del margen: cabe más de lo que se ha pintado
+            self.visibles += OVERSCAN
+            self.refrescar()
+        if desde != self.primera:
+            # Las flechas del teclado han movido el Treeview: se recoloca la ventana
+            self.primera = desde
+            self.refrescar()
+        self._actualizar_barra()
+
+    # ---------- selección ----------
+    def _al_pulsar(self, event):
+        self._ampliar = bool(event.state & _AMPLIAR)
+
+    def _al_seleccionar(self, event):
+        en_tk = self.tree.selection()
+        ventana = set(self._pintadas)
+        if set(en_tk) == {iid for iid in self._seleccion if iid in ventana}:
+            return  # es la selección que ha vuelto a poner pintar()
+        fuera = [iid for iid in self._seleccion if iid not in ventana] if self._ampliar else []
+        self._seleccion = dict.fromkeys(fuera + list(en_tk))
+        self._avisar_seleccion(event)
+
+    def _avisar_seleccion(self, event):
+        for funcion in self._oyentes_seleccion:
+            funcion(event)
+
+    def seleccionar_todo(self, event=None):
+        """Selecciona todas las filas de la vista, también las que no se ven (Ctrl+A)."""
+        self._seleccion = dict.fromkeys(iid_de(i) for i in self.vista[0:len(self.vista)])
+        self.refrescar()
+        self._avisar_seleccion(event)
+        return "break"
+
+    # ---------- como un Treeview ----------
+    def selection(self):
+        """Iids seleccionados, estén o no en la ventana."""
+        return tuple(self._seleccion)
+
+    def selection_set(self, iids):
+        self._seleccion = dict.fromkeys(iid_de(iid) for iid in iids)
+        self.refrescar()
+
+    def item(self, iid, opcion="values"):
+        """Valores de una fila, esté o no pintada."""
+        if opcion != "values":
+            return self.tree.item(iid, opcion)
+        return self.valores_de(iid)
+
+    def heading(self, columna, **opciones):
+        return self.tree.heading(columna, **opciones)
+
+    def column(self, columna, **opciones):
+        return self.tree.column(columna, **opciones)
+
+    def bind(self, evento, funcion, add=None):
+        if evento == "<<TreeviewSelect>>":
+            # Se avisa solo cuando cambia la selección, no al repintar la ventana
+            self._oyentes_seleccion.append(funcion)
+        else:
+            self.tree.bind(evento, funcion, add)
+
+    def pack(self, **opciones):
+        self.tree.master.pack(**opciones)
+
+    def after(self, ms, funcion, *args):
+        return self.tree.after(ms, funcion, *args)
+
+    def after_cancel(self, identificador):
+        self.tree.after_cancel(identificador)
@@ -0,0 +1,6 @@
+# Los módulos del gestor se importan por su nombre (import validacion),
+# igual que cuando se ejecuta main.py desde su carpeta
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+import random
+from collections import Counter
+
+from agregados import AgregadosDepartamentos, tramo_de
+from empleado import Empleado
+from repositorio_empleados import EmpleadoRepository
+
+
+def test_coinciden_con_recalcular_desde_cero():
+    azar = random.Random(2)
+    repo = EmpleadoRepository(Empleado(i, "N", "A", azar.randint(18, 70), f"{i}@e.com", azar.choice("ABC"))
+                              for i in range(1, 200))
+    agregados = AgregadosDepartamentos(repo)
+    for _ in range(300):
+        emp_id = azar.choice(repo.ids())
+        if azar.random() < 0.3:
+            repo.eliminar(emp_id)
+        else:
+            repo.actualizar(emp_id, edad=azar.randint(18, 70), departamento=azar.choice("ABCD"))
+
+    filas = list(repo.filas())
+    assert agregados.plantilla_por_departamento() == dict(Counter(f[5] for f in filas))
+    assert agregados.total() == len(filas)
+    assert agregados.recuento_edades() == Counter(f[3] for f in filas)
+    assert agregados.histograma_tramos() == dict(sorted(Counter(tramo_de(f[3]) for f in filas).items()))
+    for departamento in agregados.departamentos():
+        edades = [f[3] for f in filas if f[5] == departamento]
+        agregado = agregados[departamento]
+        assert agregado.edad_media == sum(edades) / len(edades)
+        assert (agregado.edad_minima, agregado.edad_maxima) == (min(edades), max(edades))
+
+
+def test_un_departamento_sin_empleados_desaparece():
+    repo = EmpleadoRepository([Empleado(1, "N", "A", 30, "a@e.com", "IT")])
+    agregados = AgregadosDepartamentos(repo)
+    repo.eliminar(1)
+    assert agregados.departamentos() == []
+    vacio = agregados["IT"]
+    assert (vacio.plantilla, vacio.edad_media, vacio.edad_minima) == (0, 0, None)
+
+
+def test_tramos():
+    assert [tramo_de(e) for e in (0, 9, 10, 39, 40)] == [0, 0, 10, 30, 40]
@@ -0,0 +1,85 @@
+import random
+
+import pandas as pd
+import pytest
+
+from almacen_columnar import AlmacenColumnar, FilaEmpleado
+
+
+def fila(i, departamento="IT"):
+    return (i, f"Nombre{i}", f"Apellido{i}", 20 + i % 40, f"c{i}@empresa.com", departamento)
+
+
+def test_operaciones_al_azar_coinciden_con_un_diccionario():
+    azar = random.Random(5)
+    almacen, esperado = AlmacenColumnar(capacidad=2), {}
+    siguiente = 1
+    for _ in range(2000):
+        operacion = azar.random()
+        if operacion < 0.5 or not esperado:
+            datos = fila(siguiente, azar.choice(["IT", "Ventas", "RRHH"]))
+            almacen.agregar(*datos)
+            esperado[siguiente] = datos
+            siguiente += 1
+        elif operacion < 0.75:
+            emp_id = azar.choice(list(esperado))
+            almacen.eliminar(emp_id)
+            del esperado[emp_id]
+        elif operacion < 0.9:
+            emp_id = azar.choice(list(esperado))
+            almacen.escribir(emp_id, "departamento", "Nuevo")
+            esperado[emp_id] = esperado[emp_id][:5] + ("Nuevo",)
+        else:
+            emp_id = azar.choice(list(esperado))
+            almacen.cambiar_id(emp_id, siguiente)
+            esperado[siguiente] = (siguiente,) + esperado.pop(emp_id)[1:]
+            siguiente += 1
+    assert len(almacen) == len(esperado)
+    assert sorted(almacen.filas()) == sorted(esperado.values())
+    assert all(almacen.fila(emp_id) == datos for emp_id, datos in esperado.items())
+
+
+def test_agregar_columnas_con_departamentos_nuevos_y_repetidos():
+    almacen = AlmacenColumnar()
+    almacen.agregar(*fila(1, "Ventas"))
+    filas = [fila(i, d) for i, d in zip(range(2, 6), ["IT", "Ventas", "IT", "RRHH"])]
+    almacen.agregar_columnas(*zip(*filas))
+    assert list(almacen.filas()) == [fila(1, "Ventas")] + filas
+    assert almacen.categorias == ["Ventas", "IT", "RRHH"]
+
+
+def test_fila_empleado_lee_del_almacen():
+    almacen = AlmacenColumnar()
+    almacen.agregar(*fila(1))
+    vista = FilaEmpleado(almacen, 1)
+    assert (vista.nombre, vista.edad, vista.departamento) == ("Nombre1", 21, "IT")
+
+
+def test_dataframe_es_de_solo_lectura():
+    almacen = AlmacenColumnar()
+    almacen.agregar_columnas(*zip(*(fila(i) for i in range(1, 4))))
+    df = almacen.dataframe()
+    with pytest.raises(ValueError):
+        df.iloc[0, df.columns.get_loc("edad")] = 99
+    with pytest.raises(ValueError):
+        df.loc[0, "nombre"] = "Otro"
+    with pytest.raises(ValueError):
+        df["id"].to_numpy()[0] = 7
+    assert almacen.fila(1) == fila(1)
+    # El almacén sí sigue pudiendo cambiar, y una copia del DataFrame también
+    almacen.escribir(1, "edad", 50)
+    almacen.eliminar(2)
+    assert almacen.fila(3) == fila(3)
+    copia = almacen.dataframe().copy()
+    copia.loc[0, "edad"] = 1
+    assert almacen.fila(1)[3] == 50
+
+
+def test_dataframe_tiene_los_tipos_de_los_informes():
+    almacen = AlmacenColumnar()
+    almacen.agregar_columnas(*zip(*(fila(i, d) for i, d in zip(range(1, 4), ["IT", "RRHH", "IT"]))))
+    almacen.eliminar(2)  # la categoría RRHH se queda sin nadie
+    df = almacen.dataframe()
+    assert df["id"].tolist() == [1, 3]
+    assert isinstance(df["departamento"].dtype, pd.CategoricalDtype)
+    assert df["departamento"].value_counts().to_dict() == {"IT": 2, "RRHH": 0}
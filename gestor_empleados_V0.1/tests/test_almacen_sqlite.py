@@ -0,0 +1,96 @@
+import sqlite3
+
+import pytest
+
+from almacen_sqlite import AlmacenSQLite, ConflictoVersion, conectar_repositorios
+from departamento import Departamento
+from empleado import Empleado
+from registro_departamentos import RegistroDepartamentos
+from repositorio_empleados import EmpleadoRepository
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    almacen = AlmacenSQLite(str(tmp_path / "gestor.db"))
+    yield almacen
+    almacen.cerrar()
+
+
+def test_los_cambios_de_los_repositorios_se_guardan(almacen):
+    almacen.insertar_departamento(Departamento(1, "IT", 2, 1000.0, 80.0))
+    almacen.insertar_empleado(Empleado(1, "Ana", "Pérez", 30, "ana@empresa.com", "IT"))
+    empleados, departamentos = EmpleadoRepository(), RegistroDepartamentos()
+    conectar_repositorios(almacen, empleados, departamentos)
+    assert empleados.obtener(1).nombre == "Ana" and departamentos.por_nombre("it").id == 1
+
+    empleados.agregar(Empleado(2, "Luis", "Gómez", 41, "luis@empresa.com", "IT"))
+    empleados.actualizar(1, id=10, departamento="Ventas")
+    empleados.eliminar(2)
+    departamentos.actualizar(1, presupuesto=5.0)
+    assert almacen.leer_empleados().values.tolist() == [[10, "Ana", "Pérez", 30, "ana@empresa.com", "Ventas"]]
+    assert almacen.leer_departamentos()[0].presupuesto == 5.0
+    assert almacen.plantilla_por_departamento() == {"Ventas": 1}
+    assert almacen.necesarios_vs_reales() == [("IT", 2, 0)]
+
+
+def test_aplicar_cambios_en_una_sola_transaccion(almacen):
+    almacen.insertar_empleado(Empleado(1, "Ana", "Pérez", 30, "a@e.com", "IT"))
+    fila = (1, "Ana", "Pérez", 30, "a@e.com", "IT")
+    with pytest.raises(sqlite3.IntegrityError):
+        almacen.aplicar_cambios_empleados([(None, (2,) + fila[1:]), (None, fila)])
+    # El fallo deshace también lo que iba antes en el lote
+    assert almacen.contar_empleados() == 1 and almacen.obtener_empleado(2) is None
+
+
+def test_concurrencia_optimista(almacen):
+    registro = almacen.insertar("departamentos", {"id": 1, "nombre": "IT", "empleados_necesarios": 2,
+                                                  "presupuesto": 1.0, "horas_disponibles": 1.0})
+    assert registro["version"] == 1
+    actualizado = almacen.actualizar_si_version("departamentos", registro["id"], {"presupuesto": 2.0}, 1)
+    assert actualizado["version"] == 2 and actualizado["presupuesto"] == 2.0
+    with pytest.raises(ConflictoVersion) as error:
+        almacen.actualizar_si_version("departamentos", registro["id"], {"presupuesto": 3.0}, 1)
+    assert error.value.actual == 2
+    with pytest.raises(KeyError):
+        almacen.eliminar_si_version("departamentos", 99, 1)
+    almacen.eliminar_si_version("departamentos", registro["id"], 2)
+    assert almacen.leer_registro("departamentos", registro["id"]) is None
+
+
+def test_las_bases_antiguas_reciben_la_columna_version(tmp_path):
+    ruta = str(tmp_path / "antigua.db")
+    conexion = sqlite3.connect(ruta)
+    conexion.execute("CREATE TABLE empleados (id INTEGER PRIMARY KEY, nombre TEXT NOT NULL, apellidos TEXT NOT NULL, "
+                     "edad INTEGER NOT NULL, correo TEXT NOT NULL, departamento TEXT NOT NULL)")
+    conexion.execute("INSERT INTO empleados VALUES (1, 'Ana', 'Pérez', 30, 'a@e.com', 'IT')")
+    conexion.commit()
+    conexion.close()
+    almacen = AlmacenSQLite(ruta)
+    try:
+        assert almacen.leer_registro("empleados", 1)["version"] == 1
+        assert [r["id"] for r in almacen.listar("empleados", departamento="IT")] == [1]
+    finally:
+        almacen.cerrar()
+
+
+def test_exportar_e_importar_csv(almacen, tmp_path):
+    almacen.insertar_departamento(Departamento(1, "IT", 2, 1000.0, 80.0))
+    almacen.insertar_empleado(Empleado(1, "Ana", "Pérez", 30, "a@e.com", "IT"))
+    empleados_csv, departamentos_csv = str(tmp_path / "e.csv"), str(tmp_path / "d.csv")
+    almacen.exportar_csv(empleados_csv, departamentos_csv)
+    almacen.eliminar_empleado(1)
+    almacen.importar_csv(empleados_csv, departamentos_csv)
+    assert almacen.obtener_empleado(1) == (1, "Ana", "Pérez", 30, "a@e.com", "IT")
+    assert almacen.contar_departamentos() == 1
+
+
+def test_la_marca_de_ids_recuerda_los_borrados(almacen):
+    assert almacen.marca_ids("empleados") == 1
+    for i in (5, 9):
+        almacen.insertar_empleado(Empleado(i, "Ana", "Pérez", 30, f"{i}@e.com", "IT"))
+    assert almacen.marca_ids("empleados") == 10
+    almacen.eliminar_empleado(9)
+    almacen.actualizar_empleado(5, Empleado(7, "Ana", "Pérez", 30, "5@e.com", "IT"))
+    almacen.aplicar_cambios_empleados([((7, "Ana", "Pérez", 30, "5@e.com", "IT"), None)])
+    assert almacen.contar_empleados() == 0 and almacen.marca_ids("empleados") == 10
+    assert almacen.marca_ids("departamentos") == 1
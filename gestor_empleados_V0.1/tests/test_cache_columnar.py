@@ -0,0 +1,70 @@
+import os
+
+import pandas as pd
+import pytest
+
+import cache_columnar
+from validacion import ESQUEMA_EMPLEADO
+
+COLUMNAS = ESQUEMA_EMPLEADO.columnas
+
+
+@pytest.fixture
+def csv(tmp_path, monkeypatch):
+    # La caché solo se guarda para los CSV que están junto a la aplicación
+    monkeypatch.setattr(cache_columnar, "BASE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache_columnar, "CARPETA", str(tmp_path / "cache_columnar"))
+    ruta = tmp_path / "empleados.csv"
+    ruta.write_text("id,nombre,apellidos,edad,correo,departamento\n1,Ana,Pérez,30,a@e.com,IT\n", encoding="utf-8")
+    return str(ruta)
+
+
+def datos():
+    return pd.DataFrame({"id": [1, 2, 3], "nombre": ["Ana", "Íñigo", ""], "apellidos": ["Pérez", "Pérez", "X"],
+                         "edad": [30, 41, 52], "correo": ["a@e.com", "i@e.com", ""],
+                         "departamento": ["IT", "Ventas", "IT"]})
+
+
+def test_lo_guardado_se_lee_igual(csv):
+    df = datos()
+    assert cache_columnar.guardar(csv, df, COLUMNAS, cache_columnar.huella(csv))
+    leido = cache_columnar.leer(csv, COLUMNAS)
+    assert leido.to_dict("list") == df.to_dict("list")
+    assert leido["id"].dtype == "int64"
+
+
+def test_deja_de_valer_si_cambia_el_csv(csv):
+    cache_columnar.guardar(csv, datos(), COLUMNAS, cache_columnar.huella(csv))
+    with open(csv, "a", encoding="utf-8") as f:
+        f.write("2,Luis,Gómez,41,l@e.com,IT\n")
+    assert cache_columnar.leer(csv, COLUMNAS) is None
+
+
+def test_misma_longitud_y_otra_fecha_decide_el_contenido(csv):
+    cache_columnar.guardar(csv, datos(), COLUMNAS, cache_columnar.huella(csv))
+    tamano, mtime = cache_columnar.huella(csv)
+    os.utime(csv, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+    assert cache_columnar.vigente(csv, COLUMNAS)
+    with open(csv, "r+", encoding="utf-8") as f:
+        texto = f.read()
+        f.seek(0)
+        f.write(texto.replace("Ana", "Eva"))
+    os.utime(csv, ns=(mtime + 2 * 10 ** 9, mtime + 2 * 10 ** 9))
+    assert cache_columnar.huella(csv)[0] == tamano
+    assert not cache_columnar.vigente(csv, COLUMNAS)
+
+
+def test_no_se_guarda_si_el_csv_cambio_mientras_se_leia(csv):
+    huella = cache_columnar.huella(csv)
+    with open(csv, "a", encoding="utf-8") as f:
+        f.write("2,Luis,Gómez,41,l@e.com,IT\n")
+    assert not cache_columnar.guardar(csv, datos(), COLUMNAS, huella)
+    assert cache_columnar.leer(csv, COLUMNAS) is None
+
+
+def test_otras_columnas_o_csv_de_fuera_no_usan_la_cache(csv, tmp_path_factory):
+    cache_columnar.guardar(csv, datos(), COLUMNAS, cache_columnar.huella(csv))
+    assert cache_columnar.leer(csv, {c: t for c, t in COLUMNAS.items() if c != "correo"}) is None
+    fuera = tmp_path_factory.mktemp("otra") / "empleados.csv"
+    fuera.write_text("id\n1\n", encoding="utf-8")
+    assert not cache_columnar.guardar(str(fuera), datos(), COLUMNAS, cache_columnar.huella(str(fuera)))
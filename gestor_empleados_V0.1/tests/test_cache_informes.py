@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from cache_informes import CacheLRU, Versiones, tamano
+from empleado import Empleado
+from repositorio_empleados import EmpleadoRepository
+
+
+def test_olvida_lo_menos_usado_al_pasar_de_entradas():
+    cache = CacheLRU(max_entradas=2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    assert cache.obtener("a") == 1  # "b" pasa a ser el menos usado
+    cache.guardar("c", 3)
+    assert cache.obtener("b") is None and cache.obtener("a") == 1 and cache.obtener("c") == 3
+    assert (cache.aciertos, cache.fallos) == (3, 1)
+
+
+def test_tope_de_memoria():
+    grande = np.zeros(100, dtype=np.int64)  # 800 bytes
+    cache = CacheLRU(max_entradas=10, max_bytes=2000)
+    cache.guardar("a", grande)
+    cache.guardar("b", grande)
+    cache.guardar("c", grande)
+    assert len(cache) == 2 and cache.obtener("a") is None
+    assert cache.bytes == 1600
+    # Volver a guardar una clave no cuenta sus bytes dos veces
+    cache.guardar("c", grande)
+    assert cache.bytes == 1600
+    # Lo que no cabe ni solo no se guarda ni echa a nadie
+    cache.guardar("d", np.zeros(1000))
+    assert cache.obtener("d") is None and len(cache) == 2
+    cache.vaciar()
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_tamano_de_resultados_habituales():
+    df = pd.DataFrame({"a": np.arange(10, dtype=np.int64)})
+    assert tamano(df) >= 80
+    assert tamano(df["a"]) >= 80
+    assert tamano((np.zeros(4), [1, 2])) > 32
+
+
+def test_versiones_suben_con_cada_aviso():
+    repo = EmpleadoRepository()
+    versiones = Versiones()
+    versiones.seguir("empleados", repo)
+    assert versiones.de(("empleados", "departamentos")) == (0, 0)
+    repo.agregar(Empleado(1, "Ana", "Pérez", 30, "a@e.com", "IT"))
+    repo.eliminar_varios([99])  # nada que avisar: la versión no cambia
+    assert versiones.de(("empleados",)) == (1,)
+    # La clave con la versión vieja ya no coincide
+    cache = CacheLRU()
+    cache.guardar(("plantilla",) + versiones.de(("empleados",)), {"IT": 1})
+    repo.actualizar(1, departamento="Ventas")
+    assert cache.obtener(("plantilla",) + versiones.de(("empleados",))) is None
@@ -0,0 +1,56 @@
+import pytest
+
+import cache_columnar
+from cargador_csv import leer_csv, leer_tabla
+from validacion import ESQUEMA_EMPLEADO, ESQUEMA_DEPARTAMENTO
+
+
+def escribir(carpeta, nombre, texto):
+    ruta = carpeta / nombre
+    ruta.write_text(texto, encoding="utf-8")
+    return str(ruta)
+
+
+def test_columnas_normalizadas_y_tipos_explicitos(tmp_path):
+    ruta = escribir(tmp_path, "departamentos.csv",
+                    " ID ,Nombre,EMPLEADOS_NECESARIOS,presupuesto,horas_disponibles,sobra\n"
+                    "1, IT ,2,1000,80.5,x\n"
+                    "2,Ventas,0,\"12,5\",0,y\n")
+    df = leer_csv(ruta, ESQUEMA_DEPARTAMENTO)
+    assert list(df.columns) == list(ESQUEMA_DEPARTAMENTO.columnas)
+    assert str(df["id"].dtype) == "int64" and str(df["empleados_necesarios"].dtype) == "int64"
+    assert str(df["presupuesto"].dtype) == "float64" and df["presupuesto"].tolist() == [1000.0, 12.5]
+    assert df["nombre"].tolist() == ["IT", "Ventas"]
+
+
+def test_faltan_columnas(tmp_path):
+    ruta = escribir(tmp_path, "empleados.csv", "id,nombre,apellidos\n1,Ana,Pérez\n")
+    with pytest.raises(ValueError, match="edad, correo, departamento"):
+        leer_csv(ruta, ESQUEMA_EMPLEADO)
+
+
+def test_las_filas_invalidas_se_descartan_con_un_resumen(tmp_path, capsys):
+    ruta = escribir(tmp_path, "empleados.csv",
+                    "id,nombre,apellidos,edad,correo,departamento\n"
+                    "1,Ana,Pérez,30,a@e.com,IT\n"
+                    "2,Luis,Gómez,abc,l@e.com,IT\n"
+                    "1,Eva,Sanz,40,e@e.com,Compras\n"
+                    "3,Pau,Vila,50,p@e.com,Compras\n")
+    df = leer_csv(ruta, ESQUEMA_EMPLEADO, departamentos={"it"})
+    # Un departamento desconocido solo se avisa
+    assert df["id"].tolist() == [1, 3] and df.index.tolist() == [0, 1]
+    salida = capsys.readouterr().out
+    assert "empleados.csv: 4 errores en 3 filas (2 descartadas):" in salida
+    assert "edad no es un número entero: 1" in salida and "id está repetido: 1" in salida
+
+
+def test_leer_tabla_usa_la_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_columnar, "BASE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache_columnar, "CARPETA", str(tmp_path / "cache_columnar"))
+    ruta = escribir(tmp_path, "empleados.csv",
+                    "id,nombre,apellidos,edad,correo,departamento\n1,Ana,Pérez,30,a@e.com,IT\n")
+    huella = cache_columnar.huella(ruta)
+    df = leer_csv(ruta, ESQUEMA_EMPLEADO)
+    # Sin caché, leer_tabla leería la fila de Ana del CSV
+    assert cache_columnar.guardar(ruta, df.assign(nombre=["Desde la caché"]), ESQUEMA_EMPLEADO.columnas, huella)
+    assert leer_tabla(ruta, ESQUEMA_EMPLEADO)["nombre"].tolist() == ["Desde la caché"]
@@ -0,0 +1,243 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import diario_cambios
+from diario_cambios import DiarioCambios
+from departamento import Departamento
+from empleado import Empleado
+from ids import AsignadorIds
+from registro_departamentos import RegistroDepartamentos, valores_de
+from repositorio_empleados import EmpleadoRepository
+from validacion import ESQUEMA_EMPLEADO, ESQUEMA_DEPARTAMENTO
+
+CSV_EMPLEADOS = (
+    "id,nombre,apellidos,edad,correo,departamento\n"
+    "1,Ana,Pérez,30,ana@empresa.com,IT\n"
+    "2,Luis,Gómez,41,luis@empresa.com,IT\n"
+    "x,Mal,Fila,20,mal@empresa.com,IT\n"  # la validación la rechaza
+    "3,Eva,Ruiz,25,eva@empresa.com,Ventas\n"
+    "4,Juan,Sanz,52,juan@empresa.com,Ventas\n"
+)
+CSV_DEPARTAMENTOS = (
+    "id,nombre,empleados_necesarios,presupuesto,horas_disponibles\n"
+    "1,IT,2,1000.0,80.0\n"
+    "2,Ventas,3,500.0,40.0\n"
+)
+
+
+@pytest.fixture
+def carpeta(tmp_path):
+    (tmp_path / "empleados.csv").write_text(CSV_EMPLEADOS, encoding="utf-8")
+    (tmp_path / "departamentos.csv").write_text(CSV_DEPARTAMENTOS, encoding="utf-8")
+    return tmp_path
+
+
+def abrir(carpeta):
+    return DiarioCambios(*(str(carpeta / nombre) for nombre in (
+        "cambios.journal", "empleados.csv", "departamentos.csv", "instantanea.json",
+        "instantanea_empleados.csv", "instantanea_departamentos.csv")))
+
+
+def arrancar(carpeta, filas_por_bloque=2, con_ids=False):
+    """
+    Lo mismo que main.abrir_diario + la importación, sin Tk: bloques pequeños.
+    con_ids: devuelve también los AsignadorIds de empleados y departamentos.
+    """
+    diario = abrir(carpeta)
+    empleados, departamentos = EmpleadoRepository(), RegistroDepartamentos()
+    ids = (AsignadorIds(empleados), AsignadorIds(departamentos)) if con_ids else None
+    diario.conectar(empleados, departamentos, ids=ids)
+    csv_empleados, csv_departamentos = diario.fuentes()
+    for ruta, esquema, entidad in ((csv_departamentos, ESQUEMA_DEPARTAMENTO, "departamentos"),
+                                   (csv_empleados, ESQUEMA_EMPLEADO, "empleados")):
+        for bloque in pd.read_csv(ruta, dtype=str, keep_default_na=False, chunksize=filas_por_bloque):
+            df = diario.corregir(entidad, esquema.validar(bloque).validos)
+            with diario.sin_registrar():
+                if entidad == "empleados":
+                    empleados.cargar_dataframe(df, omitir_repetidos=True)
+                else:
+                    departamentos.agregar_varios(
+                        (Departamento(*fila) for fila in zip(*(df[c].tolist() for c in df.columns))),
+                        omitir_repetidos=True)
+    diario.reaplicar_restantes()
+    diario.marcar_cargado()
+    if con_ids:
+        return diario, empleados, departamentos, ids
+    return diario, empleados, departamentos
+
+
+def hacer_cambios(empleados, departamentos):
+    empleados.eliminar(2)
+    empleados.actualizar(3, edad=26, departamento="IT")
+    empleados.actualizar(4, id=40)
+    empleados.agregar(Empleado(5, "Sara", "León", 33, "sara@empresa.com", "Ventas"))
+    empleados.agregar(Empleado(6, "Temporal", "X", 33, "t@empresa.com", "IT"))
+    empleados.eliminar(6)
+    departamentos.actualizar(2, presupuesto=750.0)
+    departamentos.agregar(Departamento(3, "RRHH", 1, 100.0, 10.0))
+
+
+def estado(empleados, departamentos):
+    return sorted(empleados.filas()), sorted(valores_de(d) for d in departamentos)
+
+
+def test_reaplicar_el_diario_al_importar_por_bloques(carpeta):
+    diario, empleados, departamentos = arrancar(carpeta)
+    hacer_cambios(empleados, departamentos)
+    esperado = estado(empleados, departamentos)
+    diario.cerrar()
+
+    diario, empleados, departamentos = arrancar(carpeta)
+    assert estado(empleados, departamentos) == esperado
+    # Lo reaplicado no se vuelve a escribir en el diario
+    assert diario.seq == 8
+    assert len(diario._leer_entradas()) == 0  # seq ya es el último leído
+    diario.cerrar()
+
+
+def test_los_cambios_tras_arrancar_siguen_la_numeracion(carpeta):
+    diario, empleados, departamentos = arrancar(carpeta)
+    hacer_cambios(empleados, departamentos)
+    diario.cerrar()
+
+    diario, empleados, departamentos = arrancar(carpeta)
+    empleados.eliminar(1)
+    esperado = estado(empleados, departamentos)
+    diario.cerrar()
+
+    diario, empleados, departamentos = arrancar(carpeta)
+    assert estado(empleados, departamentos) == esperado
+    diario.cerrar()
+
+
+def test_compactar_no_pisa_los_csv_del_usuario(carpeta):
+    diario, empleados, departamentos = arrancar(carpeta)
+    hacer_cambios(empleados, departamentos)
+    esperado = estado(empleados, departamentos)
+    diario.compactar()
+    diario.cerrar()
+
+    # La fila rechazada sigue en el CSV del usuario, que no se ha tocado
+    assert (carpeta / "empleados.csv").read_text(encoding="utf-8") == CSV_EMPLEADOS
+    assert (carpeta / "departamentos.csv").read_text(encoding="utf-8") == CSV_DEPARTAMENTOS
+    assert (carpeta / "instantanea_empleados.csv").exists()
+    assert not (carpeta / "cambios.journal.1").exists()
+
+    diario = abrir(carpeta)
+    assert diario.fuentes() == (str(carpeta / "instantanea_empleados.csv"),
+                                str(carpeta / "instantanea_departamentos.csv"))
+    assert diario.seq == 8
+    diario, empleados, departamentos = arrancar(carpeta)
+    assert estado(empleados, departamentos) == esperado
+    diario.cerrar()
+
+
+def test_sin_instantanea_se_leen_los_csv_del_usuario(carpeta):
+    diario = abrir(carpeta)
+    assert diario.fuentes() == (str(carpeta / "empleados.csv"), str(carpeta / "departamentos.csv"))
+
+
+def test_no_se_compacta_antes_de_terminar_la_importacion(carpeta):
+    diario = abrir(carpeta)
+    diario.conectar(EmpleadoRepository(), RegistroDepartamentos())
+    diario.compactar()
+    diario.cerrar()
+    assert not (carpeta / "instantanea.json").exists()
+
+
+def test_linea_a_medio_escribir_se_descarta(carpeta):
+    diario, empleados, departamentos = arrancar(carpeta)
+    empleados.eliminar(1)
+    diario.cerrar()
+    with open(carpeta / "cambios.journal", "a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "e": "empleados", "a": [3')
+
+    diario, empleados, departamentos = arrancar(carpeta)
+    assert 1 not in empleados and 3 in empleados
+    diario.cerrar()
+
+
+def test_plegar_deja_el_estado_final_de_cada_id():
+    fila = (7, "Ana", "Pérez", 30, "ana@empresa.com", "IT")
+    cambiada = (8,) + fila[1:]
+    entradas = [
+        {"seq": 1, "e": "empleados", "a": None, "n": list(fila)},
+        {"seq": 2, "e": "empleados", "a": list(fila), "n": list(cambiada)},
+        {"seq": 3, "e": "empleados", "a": [1, "B", "C", 40, "b@e.com", "IT"], "n": None},
+    ]
+    assert diario_cambios._plegar(entradas)["empleados"] == {7: None, 8: cambiada, 1: None}
+
+
+@pytest.mark.parametrize("compactar", [False, True])
+def test_los_ids_borrados_no_se_dan_tras_reiniciar(carpeta, compactar):
+    diario, empleados, departamentos, ids = arrancar(carpeta, con_ids=True)
+    empleados.agregar(Empleado(ids[0].siguiente(), "Sara", "León", 33, "sara@empresa.com", "IT"))
+    empleados.eliminar(5)
+    departamentos.agregar(Departamento(9, "RRHH", 1, 100.0, 10.0))
+    departamentos.eliminar(9)
+    if compactar:
+        diario.compactar()
+    diario.cerrar()
+
+    # Sin la marca, los ids saldrían del mayor que queda: 5 y 3
+    diario, empleados, departamentos, ids = arrancar(carpeta, con_ids=True)
+    assert (ids[0].siguiente(), ids[1].siguiente()) == (6, 10)
+    diario.cerrar()
+
+
+@pytest.mark.parametrize("falla_la_segunda", [False, True])
+def test_una_compactacion_fallida_no_pierde_cambios(carpeta, monkeypatch, falla_la_segunda):
+    escribir = diario_cambios._escribir_csv_atomico
+
+    def disco_lleno(ruta, cabecera, filas):
+        raise OSError("No queda espacio en el disco")
+
+    avisos = []
+    diario, empleados, departamentos = arrancar(carpeta)
+    diario.al_fallar = avisos.append
+    monkeypatch.setattr(diario_cambios, "_escribir_csv_atomico", disco_lleno)
+    empleados.eliminar(1)
+    diario.compactar()
+    diario._compactando.join()
+    assert (carpeta / "cambios.journal.1").exists()
+
+    # El siguiente cambio avisa del fallo y la siguiente compactación no pisa el segmento
+    empleados.actualizar(3, edad=60)
+    assert [str(e) for e in avisos] == ["No queda espacio en el disco"]
+    if not falla_la_segunda:
+        monkeypatch.setattr(diario_cambios, "_escribir_csv_atomico", escribir)
+    diario.compactar()
+    empleados.agregar(Empleado(9, "Sara", "León", 33, "sara@empresa.com", "IT"))
+    esperado = estado(empleados, departamentos)
+    diario.cerrar()
+    assert len(avisos) == (2 if falla_la_segunda else 1)
+    assert (carpeta / "cambios.journal.1").exists() == falla_la_segunda
+
+    monkeypatch.setattr(diario_cambios, "_escribir_csv_atomico", escribir)
+    diario, empleados, departamentos = arrancar(carpeta)
+    assert estado(empleados, departamentos) == esperado
+    diario.cerrar()
+
+
+def test_la_compactacion_escribe_la_foto_del_momento(carpeta, monkeypatch):
+    escribir, puede_seguir = diario_cambios._escribir_csv_atomico, threading.Event()
+
+    def despacio(ruta, cabecera, filas):
+        puede_seguir.wait()
+        escribir(ruta, cabecera, filas)
+
+    diario, empleados, departamentos = arrancar(carpeta)
+    monkeypatch.setattr(diario_cambios, "_escribir_csv_atomico", despacio)
+    empleados.actualizar(1, edad=31)
+    esperado = sorted(empleados.filas())
+    diario.compactar()
+    # Cambios mientras el hilo escribe: no entran en la instantánea (siguen en el diario)
+    empleados.eliminar(1)
+    empleados.actualizar(3, nombre="Otra")
+    puede_seguir.set()
+    diario._compactando.join()
+    leidas = pd.read_csv(carpeta / "instantanea_empleados.csv", dtype={"id": int, "edad": int})
+    assert sorted(map(tuple, leidas.itertuples(index=False))) == esperado
+    diario.cerrar()
@@ -0,0 +1,66 @@
+import itertools
+import random
+
+import pandas as pd
+import pytest
+
+from duplicados import UMBRAL, IndiceDuplicados, buscar_duplicados, clave_persona, claves_persona, puntuar
+from empleado import Empleado
+from indice_busqueda import normalizar_texto
+from repositorio_empleados import EmpleadoRepository
+
+COLUMNAS = ["id", "nombre", "apellidos", "edad", "correo", "departamento"]
+
+
+@pytest.mark.parametrize("nombre, apellidos", [
+    ("Íñigo", "Pérez García"),
+    ("Lu\u1ab0cía", "Muñoz"),   # marca combinable fuera de U+0300..U+036F en medio de la palabra
+    ("José", "Straße"),         # ß: casefold la convierte en "ss"
+    ("ﬁlomena", "Díaz"),        # ligadura fi: NFKD la separa
+    ("  ANA ", "garcía-lópez"),
+])
+def test_las_claves_de_un_dataframe_y_las_del_formulario_coinciden(nombre, apellidos):
+    columna = claves_persona(pd.Series([nombre, "Otra"]), pd.Series([apellidos, "Persona"]))
+    assert columna[0] == clave_persona(nombre, apellidos)
+    assert columna[0] == " ".join(sorted(normalizar_texto(f"{nombre} {apellidos}")
+                                         .replace("-", " ").split()))
+
+
+def test_encuentra_variantes_de_la_misma_persona():
+    df = pd.DataFrame([
+        (1, "Ana", "Pérez García", 30, "ana@empresa.com", "IT"),
+        (2, "ana", "Garcia Perez", 30, "ANA@empresa.com ", "IT"),
+        (3, "Luis", "Gómez", 41, "luis@empresa.com", "Ventas"),
+        (4, "Otro", "Nombre", 50, "luis@empresa.com", "IT"),
+    ], columns=COLUMNAS)
+    sugerencias, omitidos = buscar_duplicados(df)
+    assert omitidos == 0
+    assert sugerencias[["conservar", "sobra"]].values.tolist() == [[1, 2]]
+    assert sugerencias.loc[0, "motivos"] == "mismo nombre, mismo correo, misma edad, mismo departamento"
+
+
+def test_coincide_con_comparar_todas_las_parejas():
+    azar = random.Random(3)
+    nombres, apellidos = ["Ana", "Luis", "María"], ["Pérez", "Perez", "Gómez", "Ruiz"]
+    filas = []
+    for i in range(1, 121):
+        a, b = azar.sample(apellidos, 2)
+        filas.append((i, azar.choice(nombres), f"{a} {b}", azar.choice([30, 31]),
+                      azar.choice(["", "x@e.com", "y@e.com", f"{i}@e.com"]), azar.choice(["IT", "Ventas"])))
+    sugerencias, omitidos = buscar_duplicados(pd.DataFrame(filas, columns=COLUMNAS))
+    assert omitidos == 0
+    todas = {(a[0], b[0]): puntuar(a, b)[0] for a, b in itertools.combinations(filas, 2)}
+    esperado = {pareja: p for pareja, p in todas.items() if p >= UMBRAL}
+    assert dict(zip(zip(sugerencias["conservar"], sugerencias["sobra"]), sugerencias["puntuacion"])) == esperado
+
+
+def test_el_indice_incremental_sigue_al_repositorio():
+    empleados = EmpleadoRepository()
+    indice = IndiceDuplicados(empleados)
+    empleados.agregar(Empleado(1, "Íñigo", "Pérez", 30, "inigo@empresa.com", "IT"))
+    nueva = (99, "Inigo", "Perez", 30, "otro@empresa.com", "IT")
+    assert [c[1] for c in indice.candidatos(nueva)] == [1]
+    empleados.agregar(Empleado(2, "Íñigo", "Pérez", 30, "i2@empresa.com", "IT"))
+    empleados.eliminar(1)
+    assert [c[1] for c in indice.candidatos(nueva)] == [2]
+    assert indice.candidatos(nueva, excepto=2) == []
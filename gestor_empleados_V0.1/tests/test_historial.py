@@ -0,0 +1,115 @@
+import pytest
+
+from departamento import Departamento
+from empleado import Empleado
+from historial import Historial, Paso, describir
+from registro_departamentos import RegistroDepartamentos, valores_de
+from repositorio_empleados import EmpleadoRepository
+
+
+def empleado(i, departamento="IT"):
+    return Empleado(i, f"Nombre{i}", "Apellido", 30, f"c{i}@empresa.com", departamento)
+
+
+@pytest.fixture
+def repos():
+    empleados, departamentos = EmpleadoRepository(), RegistroDepartamentos()
+    historial = Historial()
+    historial.seguir("empleados", empleados)
+    historial.seguir("departamentos", departamentos)
+    with historial.sin_registrar():
+        departamentos.agregar(Departamento(1, "IT", 2, 1000.0, 80.0))
+        for i in range(1, 4):
+            empleados.agregar(empleado(i))
+    return historial, empleados, departamentos
+
+
+def estado(empleados, departamentos):
+    return sorted(empleados.filas()), sorted(valores_de(d) for d in departamentos)
+
+
+def test_lo_cargado_sin_registrar_no_se_deshace(repos):
+    historial, _, _ = repos
+    assert not historial.puede_deshacer()
+
+
+def test_deshacer_y_rehacer_vuelven_a_cada_estado(repos):
+    historial, empleados, departamentos = repos
+    estados = [estado(empleados, departamentos)]
+    empleados.eliminar_varios([1, 2])
+    estados.append(estado(empleados, departamentos))
+    empleados.actualizar(3, id=30, edad=41)
+    estados.append(estado(empleados, departamentos))
+    departamentos.actualizar(1, presupuesto=500.0)
+    estados.append(estado(empleados, departamentos))
+    empleados.agregar(empleado(4, "Ventas"))
+    estados.append(estado(empleados, departamentos))
+
+    for esperado in reversed(estados[:-1]):
+        historial.deshacer()
+        assert estado(empleados, departamentos) == esperado
+    assert not historial.puede_deshacer()
+    for esperado in estados[1:]:
+        historial.rehacer()
+        assert estado(empleados, departamentos) == esperado
+    assert not historial.puede_rehacer()
+
+
+def test_un_cambio_nuevo_descarta_lo_deshecho(repos):
+    historial, empleados, _ = repos
+    empleados.eliminar(1)
+    historial.deshacer()
+    empleados.eliminar(2)
+    assert not historial.puede_rehacer()
+    assert [describir(p) for p in historial.ultimos()] == ["Eliminar 1 empleado"]
+
+
+def test_restaurar_deshace_desde_la_fecha_del_paso(repos):
+    historial, empleados, departamentos = repos
+    inicial = estado(empleados, departamentos)
+    empleados.eliminar(1)
+    tras_primero = estado(empleados, departamentos)
+    empleados.eliminar(2)
+    empleados.actualizar(3, edad=50)
+    pasos = historial.ultimos()  # del más nuevo al más viejo
+
+    assert len(historial.restaurar(pasos[1].fecha)) == 2
+    assert estado(empleados, departamentos) == tras_primero
+    assert len(historial.restaurar(pasos[2].fecha)) == 1
+    assert estado(empleados, departamentos) == inicial
+    assert historial.rehacer(3) and estado(empleados, departamentos)[0] == [
+        (3, "Nombre3", "Apellido", 50, "c3@empresa.com", "IT")]
+
+
+def test_deshacer_salta_lo_que_ya_no_cuadra(repos):
+    historial, empleados, _ = repos
+    empleados.actualizar(1, edad=31)
+    with historial.sin_registrar():
+        empleados.eliminar(1)
+    historial.deshacer()
+    assert 1 not in empleados
+    # Lo que no se pudo deshacer tampoco se rehace
+    historial.rehacer()
+    assert 1 not in empleados
+
+
+def test_limites_de_pasos_y_de_cambios():
+    empleados = EmpleadoRepository()
+    historial = Historial(max_pasos=3, max_cambios=5)
+    historial.seguir("empleados", empleados)
+    for i in range(1, 6):
+        empleados.agregar(empleado(i))
+    assert len(historial.ultimos(10)) == 3
+    empleados.eliminar_varios([1, 2, 3, 4])
+    # 4 + 1 cambios caben; los pasos más viejos se olvidan
+    assert [len(p.cambios) for p in historial.ultimos(10)] == [4, 1]
+    empleados.agregar_varios(empleado(i) for i in range(10, 20))  # 10 avisos de 1
+    assert len(historial.ultimos(10)) == 3
+    empleados.eliminar_varios(range(10, 20))  # un paso de 10 no cabe: se olvida todo
+    assert not historial.puede_deshacer()
+
+
+def test_describir():
+    paso = Paso(0.0, "empleados", [(None, (1,)), (None, (2,)), ((3,), None)])
+    assert describir(paso) == "Añadir 2 empleados, eliminar 1 empleado"
+    assert describir(Paso(0.0, "departamentos", [((1,), (1,))])) == "Modificar 1 departamento"
@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from departamento import Departamento
+from empleado import Empleado
+from ids import AsignadorIds
+from registro_departamentos import RegistroDepartamentos
+from repositorio_empleados import EmpleadoRepository
+
+
+def empleado(i):
+    return Empleado(i, "Ana", "Pérez", 30, f"c{i}@empresa.com", "IT")
+
+
+def test_empieza_en_inicio_y_salta_los_ids_ya_ocupados():
+    asignador = AsignadorIds(ids=[3, 1500, "x"], inicio=1000)
+    assert asignador.siguiente() == 1501
+    assert AsignadorIds(inicio=1000).siguiente() == 1000
+
+
+def test_nunca_da_un_id_que_este_en_el_repositorio():
+    empleados = EmpleadoRepository()
+    asignador = AsignadorIds(empleados, inicio=1000)
+    dados = set()
+    for _ in range(50):
+        nuevo = asignador.siguiente()
+        assert nuevo not in empleados and nuevo not in dados
+        dados.add(nuevo)
+        empleados.agregar(empleado(nuevo))
+        # Un id escrito a mano por encima del cursor lo mueve
+        empleados.agregar(empleado(nuevo + 3))
+        dados.add(nuevo + 3)
+
+
+def test_sigue_importaciones_y_cambios_de_id():
+    empleados = EmpleadoRepository()
+    asignador = AsignadorIds(empleados, inicio=1)
+    empleados.cargar_dataframe(pd.DataFrame({
+        "id": [10, 20], "nombre": ["A", "B"], "apellidos": ["C", "D"], "edad": [30, 40],
+        "correo": ["a@e.com", "b@e.com"], "departamento": ["IT", "IT"]}))
+    assert asignador.siguiente() == 21
+    empleados.actualizar(10, id=500)
+    assert asignador.siguiente() == 501
+
+
+def test_los_ids_borrados_no_se_vuelven_a_dar():
+    departamentos = RegistroDepartamentos()
+    asignador = AsignadorIds(departamentos, inicio=1000)
+    dep_id = asignador.siguiente()
+    departamentos.agregar(Departamento(dep_id, "IT", 1, 10.0, 10.0))
+    departamentos.eliminar(dep_id)
+    assert asignador.siguiente() == dep_id + 1
+
+
+def test_reutilizar_da_primero_los_ids_liberados():
+    departamentos = RegistroDepartamentos()
+    asignador = AsignadorIds(departamentos, inicio=1000, reutilizar=True)
+    for dep_id in (asignador.siguiente(), asignador.siguiente()):
+        departamentos.agregar(Departamento(dep_id, f"D{dep_id}", 1, 10.0, 10.0))
+    departamentos.eliminar(1000)
+    assert not asignador.ocupado(1000)
+    assert asignador.siguiente() == 1000
+    # Ya dado: aunque siga libre en el repositorio no sale dos veces
+    assert asignador.siguiente() == 1002
+    # Uno liberado y vuelto a ocupar antes de pedirlo no se da
+    departamentos.eliminar(1001)
+    departamentos.agregar(Departamento(1001, "Otra vez", 1, 10.0, 10.0))
+    assert asignador.siguiente() == 1003
+
+
+def test_reservar_da_un_rango_consecutivo_que_nadie_mas_recibe():
+    asignador = AsignadorIds(ids=[1004], inicio=1000)
+    rango = asignador.reservar(3)
+    assert list(rango) == [1005, 1006, 1007]
+    assert asignador.siguiente() == 1008 and asignador.reservar(0) == range(1009, 1009)
+    with pytest.raises(ValueError):
+        asignador.reservar(-1)
+
+
+def test_avanzar_con_la_marca_guardada():
+    asignador = AsignadorIds(ids=[1500], inicio=1000)
+    asignador.avanzar(1200)  # por debajo del cursor: no cambia nada
+    assert asignador.marca() == 1501
+    asignador.avanzar(2000)
+    assert asignador.siguiente() == 2000 and asignador.marca() == 2001
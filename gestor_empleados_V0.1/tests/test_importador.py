@@ -0,0 +1,95 @@
+import pytest
+
+import cache_columnar
+import importador
+from ids import AsignadorIds
+from importador import ImportacionCSV, paso_empleados
+from repositorio_empleados import EmpleadoRepository
+
+CABECERA = "id,nombre,apellidos,edad,correo,departamento\n"
+
+
+class Widget:
+    """Lo único que usa ImportacionCSV de Tk: after(), aquí en una lista."""
+
+    def __init__(self):
+        self.pendientes = []
+
+    def after(self, ms, funcion, *args):
+        self.pendientes.append((funcion, args))
+
+
+def importar(pasos):
+    """Ejecuta la importación entera y devuelve su resumen."""
+    widget, resumen = Widget(), {}
+    ImportacionCSV(widget, pasos, al_terminar=resumen.update).iniciar()
+    while not resumen:
+        funcion, args = widget.pendientes.pop(0)
+        funcion(*args)
+    return resumen
+
+
+@pytest.fixture(autouse=True)
+def bloques_pequenos(monkeypatch):
+    monkeypatch.setattr(importador, "FILAS_POR_BLOQUE", 2)
+
+
+def recibir(empleados):
+    """Como pestana_empleado.recibir_empleados, para otro repositorio."""
+    return lambda df: len(empleados.cargar_dataframe(df, omitir_repetidos=True))
+
+
+def escribir(carpeta, *filas):
+    ruta = carpeta / "empleados.csv"
+    ruta.write_text(CABECERA + "".join(f"{fila}\n" for fila in filas), encoding="utf-8")
+    return str(ruta)
+
+
+def fila(i, correo):
+    return f"{i},Ana,Pérez,30,{correo}@e.com,IT"
+
+
+def test_las_filas_sin_id_reciben_un_rango_por_encima_de_todo_el_fichero(tmp_path):
+    ruta = escribir(tmp_path, fila(1, "a"), fila("", "b"), fila(" ", "c"), fila(7, "d"), fila(1500, "e"))
+    empleados = EmpleadoRepository()
+    asignador = AsignadorIds(empleados, inicio=1000)
+    resumen = importar([paso_empleados(ruta, recibir(empleados), asignador)])
+    assert resumen["ids_asignados"] == 2 and resumen["errores"] is None
+    # 1500 llega después de las filas sin id y aun así no choca
+    assert sorted(empleados.ids()) == [1, 7, 1500, 1501, 1502]
+    assert {empleados.obtener(i).correo for i in (1501, 1502)} == {"b@e.com", "c@e.com"}
+    assert asignador.siguiente() == 1503
+    assert resumen["segundos"] > 0
+
+
+def test_sin_asignador_las_filas_sin_id_son_errores(tmp_path):
+    ruta = escribir(tmp_path, fila(1, "a"), fila("", "b"))
+    empleados = EmpleadoRepository()
+    resumen = importar([paso_empleados(ruta, recibir(empleados))])
+    assert resumen["ids_asignados"] == 0 and empleados.ids() == [1]
+    assert resumen["errores"][["linea", "campo"]].values.tolist() == [[3, "id"]]
+
+
+def test_los_ids_dados_quedan_en_la_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_columnar, "BASE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache_columnar, "CARPETA", str(tmp_path / "cache_columnar"))
+    ruta = escribir(tmp_path, fila("", "a"), fila(3, "b"))
+    primera = EmpleadoRepository()
+    importar([paso_empleados(ruta, recibir(primera), AsignadorIds(primera, inicio=1000))])
+    # Otro arranque, con el cursor más adelante: lee la caché con los mismos ids
+    segunda = EmpleadoRepository()
+    asignador = AsignadorIds(segunda, inicio=5000)
+    resumen = importar([paso_empleados(ruta, recibir(segunda), asignador)])
+    assert resumen["ids_asignados"] == 0
+    assert sorted(segunda.filas()) == sorted(primera.filas())
+
+
+def test_un_id_repetido_en_otro_bloque_sale_en_el_informe(tmp_path):
+    # Bloques de 2 filas: [1, 2] [3, 1] [1]
+    ruta = escribir(tmp_path, fila(1, "a"), fila(2, "b"), fila(3, "c"), fila(1, "d"), fila(1, "e"))
+    empleados = EmpleadoRepository()
+    resumen = importar([paso_empleados(ruta, recibir(empleados))])
+    assert sorted(empleados.ids()) == [1, 2, 3] and empleados.obtener(1).correo == "a@e.com"
+    assert resumen["filas"] == 3 and resumen["descartadas"] == 2
+    assert resumen["errores"][["linea", "campo", "error"]].values.tolist() == [
+        [5, "id", "está repetido"], [6, "id", "está repetido"]]
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from empleado import Empleado
+from indice_busqueda import IndiceBusqueda, normalizar_texto, palabras_de
+from repositorio_empleados import EmpleadoRepository
+
+NOMBRES = ["Pedro", "Ana", "Íñigo", "Lucía", "Andrés", "Ángel"]
+APELLIDOS = ["López", "Lopez", "García", "Anaya", "Pérez Ruiz"]
+DEPARTAMENTOS = ["IT", "Ventas", "Recursos Humanos"]
+
+
+def al_azar(azar, i):
+    nombre = azar.choice(NOMBRES)
+    return Empleado(i, nombre, azar.choice(APELLIDOS), azar.randint(20, 60),
+                    f"{normalizar_texto(nombre)}{i}@empresa.com", azar.choice(DEPARTAMENTOS))
+
+
+def cambiar_al_azar(azar, repo, veces):
+    siguiente = len(repo) + 1000
+    for _ in range(veces):
+        operacion = azar.randrange(4)
+        if operacion == 0 or not len(repo):
+            repo.agregar(al_azar(azar, siguiente))
+            siguiente += 1
+        elif operacion == 1:
+            repo.eliminar(azar.choice(repo.ids()))
+        elif operacion == 2:
+            repo.actualizar(azar.choice(repo.ids()), apellidos=azar.choice(APELLIDOS), edad=azar.randint(20, 60))
+        else:
+            repo.eliminar_varios(azar.sample(repo.ids(), min(3, len(repo))))
+
+
+def encaja(fila, texto):
+    """Las reglas de la búsqueda, comprobadas a lo bruto."""
+    palabras = [p for posicion in (1, 2, 4, 5) for p in palabras_de(fila[posicion])]
+    return all(any(p.startswith(t) if len(t) < 3 else t in p for p in palabras) for t in palabras_de(texto))
+
+
+@pytest.mark.parametrize("texto", ["lopez", "LÓPEZ", "ope", "an", "a", "ana ruiz", "rec hum", "empresa", "zzz"])
+def test_buscar_coincide_con_recorrer_todo(texto):
+    azar = random.Random(7)
+    repo = EmpleadoRepository(al_azar(azar, i) for i in range(1, 200))
+    indice = IndiceBusqueda(repo)
+    cambiar_al_azar(azar, repo, 300)
+    # Una importación grande: la lista ordenada se rehace en la siguiente búsqueda
+    repo.agregar_varios(al_azar(azar, i) for i in range(5000, 5100))
+    esperado = {fila[0] for fila in repo.filas() if encaja(fila, texto)}
+    assert set(indice.buscar(texto)) == esperado
+    assert all(indice.coincide(fila, texto) == (fila[0] in esperado) for fila in repo.filas())
+
+
+def test_buscar_sin_palabras_y_con_limite():
+    repo = EmpleadoRepository(al_azar(random.Random(1), i) for i in range(1, 50))
+    indice = IndiceBusqueda(repo)
+    assert indice.buscar("  ,. ") is None
+    assert len(indice.buscar("empresa", limite=5)) == 5
+
+
+def test_las_palabras_que_nadie_usa_salen_del_indice():
+    repo = EmpleadoRepository([Empleado(1, "Zoe", "Única", 30, "z@e.com", "IT")])
+    indice = IndiceBusqueda(repo)
+    palabras = len(indice)
+    repo.actualizar(1, apellidos="Otra")
+    assert indice.buscar("unica") == [] and indice.palabras_que_encajan("un") == []
+    assert len(indice) == palabras
+
+
+def test_alta_y_baja_de_una_palabra_nueva_en_la_misma_tanda():
+    repo = EmpleadoRepository([Empleado(1, "Ana", "López", 30, "ana@e.com", "IT")])
+    indice = IndiceBusqueda(repo)
+    indice.buscar("an")  # la lista ordenada ya está hecha
+    nueva = (2, "Xavi", "Zubiri", 40, "xavi@e.com", "Ventas")
+    ana = repo.obtener(1).valores()
+    otra_ana = (3,) + ana[1:3] + (50, "b@e.com", "IT")
+    # "xavi" y "zubiri" entran y salen; las palabras de Ana salen y vuelven con otro id
+    repo.aplicar_cambios([(None, nueva), (nueva, None), (ana, None), (None, otra_ana)])
+    for prefijo in ("a", "an", "x", "xa", "z", "l", "lo", "b", "i", "v", "e"):
+        esperado = sorted(p for p in indice._ids_de if p.startswith(prefijo))
+        assert indice.palabras_que_encajan(prefijo) == esperado
+    assert indice.buscar("xa") == [] and indice.buscar("lo") == [3] and indice.buscar("an") == [3]
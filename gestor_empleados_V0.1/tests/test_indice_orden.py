@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from empleado import Empleado
+from indice_busqueda import normalizar_texto
+from indice_orden import TEXTO, IndiceOrden, VistaOrdenada
+from repositorio_empleados import EmpleadoRepository
+
+NOMBRES = ["Pedro", "Ana", "Íñigo", "Lucía", "Andrés", "Ángel"]
+APELLIDOS = ["López", "Lopez", "García", "Anaya", "Pérez Ruiz"]
+DEPARTAMENTOS = ["IT", "Ventas", "Recursos Humanos"]
+
+
+def al_azar(azar, i):
+    nombre = azar.choice(NOMBRES)
+    return Empleado(i, nombre, azar.choice(APELLIDOS), azar.randint(20, 60),
+                    f"{normalizar_texto(nombre)}{i}@empresa.com", azar.choice(DEPARTAMENTOS))
+
+
+def cambiar_al_azar(azar, repo, veces):
+    siguiente = len(repo) + 1000
+    for _ in range(veces):
+        operacion = azar.randrange(4)
+        if operacion == 0 or not len(repo):
+            repo.agregar(al_azar(azar, siguiente))
+            siguiente += 1
+        elif operacion == 1:
+            repo.eliminar(azar.choice(repo.ids()))
+        elif operacion == 2:
+            repo.actualizar(azar.choice(repo.ids()), apellidos=azar.choice(APELLIDOS), edad=azar.randint(20, 60))
+        else:
+            repo.eliminar_varios(azar.sample(repo.ids(), min(3, len(repo))))
+
+
+@pytest.mark.parametrize("posicion", [1, 2, 3, 5])
+def test_indice_orden_coincide_con_ordenar_de_nuevo(posicion):
+    azar = random.Random(posicion)
+    repo = EmpleadoRepository(al_azar(azar, i) for i in range(1, 300))
+    claves = [None, TEXTO, TEXTO, None, TEXTO, TEXTO]
+    indice = IndiceOrden(claves, repo.filas)
+    repo.suscribir(indice.aplicar)
+    indice.ordenados(posicion)
+    cambiar_al_azar(azar, repo, 200)
+    repo.agregar_varios(al_azar(azar, i) for i in range(5000, 5100))  # más de MAX_INSERCIONES
+    repo.eliminar_varios(range(5000, 5080))
+    esperado = sorted(indice.clave(posicion, fila) for fila in repo.filas())
+    assert indice.ordenados(posicion) == esperado
+    fila = next(iter(repo.filas()))
+    assert esperado[indice.posicion_de(posicion, fila)] == indice.clave(posicion, fila)
+
+
+def test_vista_ordenada_en_los_dos_sentidos():
+    lista = [(k, i) for i, k in enumerate("abcdef")]
+    assert VistaOrdenada(lista, False)[1:4] == [1, 2, 3]
+    assert VistaOrdenada(lista, True)[0:2] == [5, 4]
+    assert VistaOrdenada(lista, True)[4:10] == [1, 0]
+    assert len(VistaOrdenada(lista, True)) == 6
@@ -0,0 +1,41 @@
+import os
+
+from informes_lote import _pares, main
+
+
+def escribir(carpeta, nombre, texto):
+    ruta = carpeta / nombre
+    ruta.write_text(texto, encoding="utf-8")
+    return str(ruta)
+
+
+def test_main_genera_cada_informe_en_cada_formato(tmp_path, capsys):
+    emp = escribir(tmp_path, "emp_este.csv",
+                   "id,nombre,apellidos,edad,correo,departamento\n"
+                   "1,Ana,Pérez,30,a@e.com,IT\n"
+                   "2,Luis,Gómez,45,l@e.com,Ventas\n"
+                   "3,Eva,Sanz,28,e@e.com,IT\n")
+    dep = escribir(tmp_path, "dep_este.csv",
+                   "id,nombre,empleados_necesarios,presupuesto,horas_disponibles\n"
+                   "1,IT,3,1000,80\n"
+                   "2,Ventas,1,500,40\n")
+    salida = tmp_path / "informes"
+    codigo = main(["--par", emp, dep, "--salida", str(salida), "--formatos", "png", "svg", "--procesos", "1"])
+    assert codigo == 0
+    assert sorted(os.listdir(salida / "emp_este")) == [
+        "edades.png", "edades.svg", "necesarios.png", "necesarios.svg", "plantilla.png", "plantilla.svg"]
+    assert all(os.path.getsize(salida / "emp_este" / f) > 0 for f in os.listdir(salida / "emp_este"))
+    assert "1 pares en" in capsys.readouterr().out
+
+
+def test_main_sin_csv_devuelve_error(tmp_path):
+    falta = str(tmp_path / "no_existe.csv")
+    assert main(["--par", falta, falta, "--salida", str(tmp_path / "informes"), "--procesos", "1"]) == 1
+
+
+def test_pares_con_el_mismo_nombre_se_renombran():
+    pares = _pares([os.path.join("norte", "este"), os.path.join("sur", "este") + os.sep],
+                   [(os.path.join("otra", "este.csv"), "dep.csv")])
+    assert [nombre for nombre, _, _ in pares] == ["este", "este_2", "este_3"]
+    # Solo cambia el nombre: las rutas siguen siendo las de cada par
+    assert pares[2][1:] == (os.path.join("otra", "este.csv"), "dep.csv")
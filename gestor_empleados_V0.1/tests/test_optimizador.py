@@ -0,0 +1,102 @@
+import itertools
+import random
+
+import pandas as pd
+import pytest
+
+from optimizador import RedFlujo, proponer_traslados
+
+
+def datos(plantilla, necesarios, capacidad=None):
+    """Empleados y departamentos con 'plantilla' {departamento: empleados} y 'necesarios'."""
+    filas = [(i, f"N{i}", "A", dep) for i, dep in enumerate(
+        (dep for dep, n in plantilla.items() for _ in range(n)), start=1)]
+    empleados = pd.DataFrame(filas, columns=["id", "nombre", "apellidos", "departamento"])
+    capacidad = capacidad or {}
+    departamentos = pd.DataFrame([(nombre, n, float(capacidad.get(nombre, 100)), float(capacidad.get(nombre, 100)))
+                                  for nombre, n in necesarios.items()],
+                                 columns=["nombre", "empleados_necesarios", "presupuesto", "horas_disponibles"])
+    return empleados, departamentos
+
+
+def comprobar_plan(empleados, traslados, resumen):
+    # Cada empleado se mueve una vez como mucho, desde su departamento
+    assert traslados["id"].is_unique
+    origen = dict(zip(empleados["id"], empleados["departamento"]))
+    assert all(origen[i] == o for i, o in zip(traslados["id"], traslados["origen"]))
+    # Nadie baja de lo que necesita ni pasa de lo que puede pagar y ocupar
+    recibe = resumen["despues"] > resumen["antes"]
+    assert (resumen.loc[recibe, "despues"] <= resumen.loc[recibe, ["necesarios", "capacidad"]].min(axis=1)).all()
+    cede = resumen["despues"] < resumen["antes"]
+    assert (resumen.loc[cede, "despues"] >= resumen.loc[cede, "necesarios"]).all()
+
+
+def test_cubre_los_huecos_con_lo_que_sobra():
+    empleados, departamentos = datos({"IT": 5, "Ventas": 1, "RRHH": 0}, {"IT": 2, "Ventas": 3, "RRHH": 2})
+    traslados, resumen = proponer_traslados(empleados, departamentos, coste_empleado=1, horas_empleado=1)
+    comprobar_plan(empleados, traslados, resumen)
+    assert len(traslados) == 3 and set(traslados["origen"]) == {"IT"}
+    assert resumen.set_index("departamento")["faltan"].to_dict() == {"IT": 0, "Ventas": 0, "RRHH": 1}
+    # De cada departamento salen los últimos que entraron
+    assert sorted(traslados["id"]) == [3, 4, 5]
+
+
+def test_respeta_presupuesto_y_horas():
+    empleados, departamentos = datos({"IT": 6, "Ventas": 0}, {"IT": 1, "Ventas": 5}, capacidad={"Ventas": 2})
+    traslados, resumen = proponer_traslados(empleados, departamentos, coste_empleado=1, horas_empleado=1)
+    comprobar_plan(empleados, traslados, resumen)
+    assert len(traslados) == 2
+
+
+def test_los_empleados_de_un_departamento_que_no_existe_se_pueden_mover_todos():
+    empleados, departamentos = datos({"Viejo": 2, "IT": 0}, {"IT": 3})
+    traslados, resumen = proponer_traslados(empleados, departamentos, coste_empleado=1, horas_empleado=1)
+    assert len(traslados) == 2 and set(traslados["destino"]) == {"IT"}
+    assert resumen["despues"].tolist() == [2]
+
+
+def test_sin_huecos_no_hay_traslados():
+    empleados, departamentos = datos({"IT": 2}, {"IT": 2})
+    traslados, resumen = proponer_traslados(empleados, departamentos, coste_empleado=1, horas_empleado=1)
+    assert traslados.empty and list(traslados.columns) == ["id", "nombre", "apellidos", "origen", "destino"]
+
+
+def mejor_plan(sobran, huecos, costes):
+    """Fuerza bruta: (empleados que llegan, coste) del mejor reparto."""
+    pares = [(c, r) for c in sobran for r in huecos if c != r and costes.get((c, r), 1) is not None]
+    mejor = (0, 0)
+    for cantidades in itertools.product(*(range(min(sobran[c], huecos[r]) + 1) for c, r in pares)):
+        if any(sum(n for (c, _), n in zip(pares, cantidades) if c == cedente) > sobran[cedente] for cedente in sobran):
+            continue
+        if any(sum(n for (_, r), n in zip(pares, cantidades) if r == receptor) > huecos[receptor] for receptor in huecos):
+            continue
+        plan = (sum(cantidades), -sum(n * costes.get(par, 1) for par, n in zip(pares, cantidades)))
+        mejor = max(mejor, plan)
+    return mejor[0], -mejor[1]
+
+
+@pytest.mark.parametrize("semilla", range(8))
+def test_el_plan_es_optimo_frente_a_la_fuerza_bruta(semilla):
+    azar = random.Random(semilla)
+    cedentes, receptores = ["A", "B"], ["X", "Y", "Z"]
+    plantilla = {d: azar.randint(2, 5) for d in cedentes} | {d: 0 for d in receptores}
+    necesarios = {d: azar.randint(0, 2) for d in cedentes} | {d: azar.randint(0, 3) for d in receptores}
+    costes = {(c, r): azar.choice([1, 2, 5, None]) for c in cedentes for r in receptores}
+    empleados, departamentos = datos(plantilla, necesarios)
+    traslados, resumen = proponer_traslados(empleados, departamentos, coste_empleado=1, horas_empleado=1,
+                                            costes=costes)
+    comprobar_plan(empleados, traslados, resumen)
+    sobran = {d: max(plantilla[d] - necesarios[d], 0) for d in cedentes}
+    huecos = {d: necesarios[d] for d in receptores}
+    coste = sum(costes[par] for par in zip(traslados["origen"], traslados["destino"]))
+    assert (len(traslados), coste) == mejor_plan(sobran, huecos, costes)
+
+
+def test_red_flujo_solo_envia_mientras_compensa():
+    red = RedFlujo(4)
+    a = red.arco(0, 1, 3, -5)
+    b = red.arco(1, 3, 2, 1)
+    c = red.arco(1, 2, 5, 2)
+    red.arco(2, 3, 5, 4)  # por aquí costaría 1 más que lo que gana
+    assert red.minimizar(0, 3) == (2, -8)
+    assert (red.flujo(a), red.flujo(b), red.flujo(c)) == (2, 2, 0)
@@ -0,0 +1,66 @@
+import matplotlib
+matplotlib.use("Agg")  # sin pantalla: el canvas de Tk se cambia por uno de Agg
+
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.backend_bases import ResizeEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import pestana_informes
+from informes import InformeEdades, InformePlantilla
+
+
+@pytest.fixture
+def pestana(monkeypatch):
+    figura = Figure(figsize=(4, 3), dpi=50)
+    canvas = FigureCanvasAgg(figura)
+    canvas.mpl_connect("resize_event", pestana_informes._al_redimensionar)
+    monkeypatch.setitem(pestana_informes.estado, "figura", figura)
+    monkeypatch.setitem(pestana_informes.estado, "canvas", canvas)
+    for clave in ("informe", "artistas", "clave", "pendiente"):
+        monkeypatch.setitem(pestana_informes.estado, clave, None)
+    monkeypatch.setattr(pestana_informes, "imagenes", pestana_informes.CacheLRU())
+    montados = []
+    montar = pestana_informes._montar
+    monkeypatch.setattr(pestana_informes, "_montar", lambda informe, resultado: (
+        montados.append(informe.clave), montar(informe, resultado)))
+    return canvas, montados
+
+
+def pixeles(canvas):
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def test_volver_a_un_informe_copia_su_imagen(pestana):
+    canvas, montados = pestana
+    plantilla, edades = InformePlantilla(), InformeEdades()
+    conteo = pd.Series({"IT": 3, "Ventas": 1})
+    histograma = np.histogram([20, 30, 40], bins=5)
+    pestana_informes._dibujar(plantilla, conteo, ("plantilla", (0,)))
+    imagen_plantilla = pixeles(canvas)
+    pestana_informes._dibujar(edades, histograma, ("edades", (0,)))
+    assert not np.array_equal(pixeles(canvas), imagen_plantilla)
+
+    pestana_informes._dibujar(plantilla, conteo, ("plantilla", (0,)))
+    assert montados == ["plantilla", "edades"]
+    assert np.array_equal(pixeles(canvas), imagen_plantilla)
+    # La figura sigue con el histograma hasta que haga falta pintarla otra vez
+    assert pestana_informes.estado["informe"] is edades
+    assert pestana_informes.estado["pendiente"][0] is plantilla
+
+    # Lo que hace el canvas de Tk al cambiar de tamaño, antes de pintar otra vez
+    canvas.figure.set_size_inches(5, 4, forward=False)
+    ResizeEvent("resize_event", canvas)._process()
+    assert montados == ["plantilla", "edades", "plantilla"]
+    assert pestana_informes.estado["informe"] is plantilla and pestana_informes.estado["pendiente"] is None
+
+
+def test_otro_tamano_no_usa_la_imagen_guardada(pestana):
+    canvas, montados = pestana
+    conteo = pd.Series({"IT": 3})
+    pestana_informes._dibujar(InformePlantilla(), conteo, ("plantilla", (0,)))
+    canvas.figure.set_size_inches(5, 3)
+    pestana_informes._dibujar(InformePlantilla(), conteo, ("plantilla", (0,)))
+    assert montados == ["plantilla", "plantilla"] and pixeles(canvas).shape == (150, 250, 4)
@@ -0,0 +1,73 @@
+import pytest
+
+from departamento import Departamento
+from registro_departamentos import RegistroDepartamentos, normalizar_nombre, valores_de
+
+
+def departamento(i, nombre):
+    return Departamento(i, nombre, 2, 1000.0, 80.0)
+
+
+def test_id_y_nombre_son_unicos():
+    registro = RegistroDepartamentos([departamento(1, "IT"), departamento(2, "Ventas")])
+    with pytest.raises(ValueError):
+        registro.agregar(departamento(1, "Otro"))
+    with pytest.raises(ValueError):
+        registro.agregar(departamento(3, "  it "))
+    assert registro.por_nombre("VENTAS").id == 2
+    assert registro.existe_nombre("it") and not registro.existe_nombre("it", excepto_id="1")
+    assert normalizar_nombre("  Recursos   Humanos ") == "recursos humanos"
+
+
+def test_agregar_varios_avisa_de_lo_que_llego_a_entrar():
+    registro = RegistroDepartamentos()
+    avisos = []
+    registro.suscribir(avisos.append)
+    with pytest.raises(ValueError):
+        registro.agregar_varios([departamento(1, "IT"), departamento(2, "it")])
+    # Lo que sí entró se avisa igualmente
+    assert [n[1] for n in avisos[0]] == [valores_de(registro.obtener(1))]
+    anadidos = registro.agregar_varios([departamento(2, "IT"), departamento(3, "RRHH")], omitir_repetidos=True)
+    assert [d.id for d in anadidos] == [3]
+
+
+def test_actualizar_mantiene_los_indices_y_la_posicion():
+    registro = RegistroDepartamentos([departamento(1, "IT"), departamento(2, "Ventas"), departamento(3, "RRHH")])
+    registro.actualizar(2, nombre="Comercial", presupuesto=5.0)
+    assert registro.por_nombre("ventas") is None and registro.por_nombre("comercial").presupuesto == 5.0
+    assert registro.nombres() == ["IT", "Comercial", "RRHH"]
+    with pytest.raises(ValueError):
+        registro.actualizar(2, nombre="it")
+    with pytest.raises(ValueError):
+        registro.actualizar(2, id=1)
+    registro.actualizar(2, id=20)
+    assert 2 not in registro and registro.obtener("20").nombre == "Comercial"
+    with pytest.raises(KeyError):
+        registro.actualizar(99, presupuesto=1.0)
+    with pytest.raises(ValueError):
+        registro.actualizar_varios([1, 3], nombre="Igual")
+
+
+def test_reemplazar_y_eliminar():
+    registro = RegistroDepartamentos([departamento(1, "IT")])
+    avisos = []
+    registro.suscribir(avisos.append)
+    with pytest.raises(ValueError):
+        registro.reemplazar([departamento(5, "A"), departamento(6, "a")])
+    assert registro.nombres() == ["IT"] and avisos == []
+    registro.reemplazar([departamento(5, "A")])
+    assert registro.nombres() == ["A"] and registro.por_nombre("IT") is None
+    assert registro.eliminar_varios([5, 99]) == 1 and len(registro) == 0
+
+
+def test_aplicar_cambios_salta_lo_que_rompe_la_unicidad():
+    registro = RegistroDepartamentos([departamento(1, "IT"), departamento(2, "Ventas")])
+    hechos = registro.aplicar_cambios([
+        (None, valores_de(departamento(3, "it"))),        # nombre ocupado
+        ((9, "X", 1, 1.0, 1.0), None),                     # ya no está
+        (valores_de(registro.obtener(2)), (2, "Comercial", 4, 1.0, 1.0)),
+        (valores_de(registro.obtener(1)), None),
+    ])
+    assert hechos == 2
+    assert [valores_de(d) for d in registro] == [(2, "Comercial", 4, 1.0, 1.0)]
+    assert registro.por_nombre("comercial").id == 2 and registro.por_nombre("it") is None
@@ -0,0 +1,135 @@
+import random
+
+import pandas as pd
+import pytest
+
+from empleado import Empleado
+from repositorio_empleados import EmpleadoRepository, normalizar_id
+
+
+def empleado(i, departamento="IT", correo=None):
+    return Empleado(i, f"Nombre{i}", "Apellido", 30, correo or f"c{i}@empresa.com", departamento)
+
+
+def indices_al_dia(repo):
+    """Los índices por departamento y por correo coinciden con recorrer todo."""
+    filas = list(repo.filas())
+    por_departamento = {}
+    for fila in filas:
+        por_departamento.setdefault(fila[5], set()).add(fila[0])
+    assert {d: {e.id for e in repo.por_departamento(d)} for d in por_departamento} == por_departamento
+    assert repo.contar_por_departamento() == {d: len(ids) for d, ids in por_departamento.items()}
+    for fila in filas:
+        assert fila[0] in {e.id for e in repo.por_correo(fila[4].upper())}
+
+
+def test_normalizar_id():
+    assert normalizar_id(" 42 ") == normalizar_id("42") == normalizar_id(42) == 42
+    assert normalizar_id(" abc ") == "abc"
+
+
+def test_alta_consulta_y_baja():
+    repo = EmpleadoRepository([empleado(1), empleado(2, "Ventas")])
+    assert len(repo) == 2 and "1" in repo and repo.obtener(" 2 ").departamento == "Ventas"
+    with pytest.raises(ValueError):
+        repo.agregar(empleado(1))
+    with pytest.raises(ValueError):
+        repo.agregar(empleado("x"))
+    assert repo.eliminar(1).nombre == "Nombre1"
+    assert repo.eliminar(1) is None and repo.obtener(1) is None
+    indices_al_dia(repo)
+
+
+def test_actualizar_cambia_indices_y_comprueba_el_id():
+    repo = EmpleadoRepository([empleado(1), empleado(2)])
+    repo.actualizar(1, id=10, departamento="Ventas", correo="NUEVO@empresa.com")
+    assert 1 not in repo and repo.obtener(10).correo == "NUEVO@empresa.com"
+    assert repo.por_correo("nuevo@empresa.com")[0].id == 10
+    with pytest.raises(ValueError):
+        repo.actualizar(10, id=2)
+    with pytest.raises(KeyError):
+        repo.actualizar(99, edad=3)
+    indices_al_dia(repo)
+
+
+def test_avisos_de_cada_operacion():
+    repo = EmpleadoRepository()
+    avisos = []
+    repo.suscribir(avisos.append)
+    repo.agregar(empleado(1))
+    repo.actualizar(1, edad=31)
+    repo.actualizar_varios([1, 99], departamento="Ventas")
+    repo.eliminar_varios([1, 99])
+    fila = (1, "Nombre1", "Apellido", 30, "c1@empresa.com", "IT")
+    assert avisos == [
+        [(None, fila)],
+        [(fila, fila[:3] + (31,) + fila[4:])],
+        [(fila[:3] + (31,) + fila[4:], fila[:3] + (31, fila[4], "Ventas"))],
+        [(fila[:3] + (31, fila[4], "Ventas"), None)],
+    ]
+
+
+def test_cargar_dataframe_con_repetidos():
+    repo = EmpleadoRepository([empleado(1)])
+    df = pd.DataFrame({"id": [1, 2, 2, 3], "nombre": list("abcd"), "apellidos": list("efgh"),
+                       "edad": [20, 30, 40, 50], "correo": list("ijkl"), "departamento": ["IT"] * 4})
+    with pytest.raises(ValueError):
+        repo.cargar_dataframe(df)
+    assert len(repo) == 1
+    # Del id repetido dentro del bloque entra el primero
+    assert repo.cargar_dataframe(df, omitir_repetidos=True)["id"].tolist() == [2, 3]
+    assert repo.obtener(2).edad == 30 and repo.obtener(1).nombre == "Nombre1"
+    indices_al_dia(repo)
+
+
+def test_operaciones_al_azar_mantienen_los_indices():
+    azar = random.Random(11)
+    repo = EmpleadoRepository()
+    for i in range(1, 300):
+        repo.agregar(empleado(i, azar.choice("ABC"), correo=f"c{azar.randrange(40)}@e.com"))
+    for _ in range(300):
+        ids = repo.ids()
+        operacion = azar.randrange(3)
+        if operacion == 0:
+            repo.eliminar(azar.choice(ids))
+        elif operacion == 1:
+            repo.actualizar(azar.choice(ids), departamento=azar.choice("ABCD"))
+        else:
+            repo.actualizar_varios(azar.sample(ids, 5), correo=f"c{azar.randrange(40)}@e.com")
+    indices_al_dia(repo)
+
+
+def test_eliminar_varios_avisa_una_vez_y_salta_los_que_no_existen():
+    repo = EmpleadoRepository([empleado(i, "IT" if i % 2 else "Ventas") for i in range(1, 7)])
+    avisos = []
+    repo.suscribir(avisos.append)
+    assert repo.eliminar_varios([2, "3", 99, " 5 ", 2]) == 3
+    assert len(avisos) == 1 and [anterior[0] for anterior, nuevo in avisos[0]] == [2, 3, 5]
+    assert all(nuevo is None for _, nuevo in avisos[0])
+    assert sorted(repo.ids()) == [1, 4, 6]
+    # Si no existe ninguno no hay aviso
+    assert repo.eliminar_varios([99, 100]) == 0 and len(avisos) == 1
+    indices_al_dia(repo)
+
+
+def test_actualizar_varios_avisa_una_vez_y_salta_los_que_no_existen():
+    repo = EmpleadoRepository([empleado(1), empleado(2), empleado(3, "Ventas")])
+    avisos = []
+    repo.suscribir(avisos.append)
+    assert repo.actualizar_varios([1, 99, 3, "2"], departamento="Ventas", correo="Mismo@empresa.com") == 3
+    assert len(avisos) == 1 and [nuevo[0] for _, nuevo in avisos[0]] == [1, 3, 2]
+    assert repo.contar_por_departamento() == {"Ventas": 3}
+    assert {e.id for e in repo.por_correo("mismo@empresa.com")} == {1, 2, 3}
+    # Los que ya tienen esos valores no se cuentan ni se avisan
+    assert repo.actualizar_varios([1, 2], departamento="Ventas") == 0 and len(avisos) == 1
+    indices_al_dia(repo)
+
+
+def test_actualizar_varios_no_cambia_el_id():
+    repo = EmpleadoRepository([empleado(1), empleado(2)])
+    avisos = []
+    repo.suscribir(avisos.append)
+    with pytest.raises(ValueError):
+        repo.actualizar_varios([1, 2], id=5, departamento="Ventas")
+    assert avisos == [] and repo.contar_por_departamento() == {"IT": 2}
+    indices_al_dia(repo)
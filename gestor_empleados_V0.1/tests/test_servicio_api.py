@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from almacen_sqlite import AlmacenSQLite
+from ids import INICIO
+from servicio_api import ErrorApi, ServicioApi, asignadores, despachar
+
+EMPLEADO = {"nombre": "Ana", "apellidos": "Pérez", "edad": 30, "correo": "ana@empresa.com", "departamento": "IT"}
+DEPARTAMENTO = {"nombre": "IT", "empleados_necesarios": 2, "presupuesto": 1000.0, "horas_disponibles": 80.0}
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    almacen = AlmacenSQLite(str(tmp_path / "gestor.db"))
+    yield almacen
+    almacen.cerrar()
+
+
+def pedir(almacen, metodo, ruta, cuerpo=None, consulta=None, cabeceras=None, ids=None):
+    try:
+        return despachar(almacen, metodo, ruta, consulta or {}, cabeceras or {}, cuerpo, ids)
+    except ErrorApi as e:
+        return e.estado, e.datos
+
+
+def test_crear_leer_y_listar(almacen):
+    estado, dep = pedir(almacen, "POST", "/departamentos", DEPARTAMENTO)
+    assert estado == 201 and dep["version"] == 1
+    estado, emp = pedir(almacen, "POST", "/empleados", EMPLEADO)
+    assert estado == 201
+    assert pedir(almacen, "GET", f"/empleados/{emp['id']}") == (200, emp)
+    estado, pagina = pedir(almacen, "GET", "/empleados", consulta={"departamento": "IT"})
+    assert estado == 200 and [r["id"] for r in pagina["registros"]] == [emp["id"]]
+    assert pedir(almacen, "GET", "/informes/plantilla") == (200, {"IT": 1})
+
+
+@pytest.mark.parametrize("campo, valor", [
+    ("edad", 3.7), ("edad", True), ("edad", "30 años"), ("edad", [30]),
+    ("id", 2 ** 63), ("id", -2 ** 63 - 1), ("id", 1e20), ("edad", float("nan")),
+])
+def test_enteros_no_validos_son_400(almacen, campo, valor):
+    estado, datos = pedir(almacen, "POST", "/empleados", {**EMPLEADO, campo: valor})
+    assert estado == 400, datos
+    assert almacen.contar_empleados() == 0
+
+
+@pytest.mark.parametrize("valor", [True, float("inf"), "mucho"])
+def test_decimales_no_validos_son_400(almacen, valor):
+    assert pedir(almacen, "POST", "/departamentos", {**DEPARTAMENTO, "presupuesto": valor})[0] == 400
+
+
+@pytest.mark.parametrize("campo, valor", [
+    ("nombre", 123), ("apellidos", ["Pérez"]), ("correo", {"a": "a@e.com"}), ("departamento", True),
+])
+def test_textos_no_validos_son_400(almacen, campo, valor):
+    estado, datos = pedir(almacen, "POST", "/empleados", {**EMPLEADO, campo: valor})
+    assert estado == 400 and campo in datos["error"], datos
+    assert almacen.contar_empleados() == 0
+
+
+def test_enteros_escritos_sin_decimales_valen(almacen):
+    estado, emp = pedir(almacen, "POST", "/empleados", {**EMPLEADO, "id": "7", "edad": 30.0})
+    assert estado == 201 and emp["id"] == 7 and emp["edad"] == 30
+
+
+def test_ids_fuera_de_rango_en_la_ruta_y_la_consulta(almacen):
+    assert pedir(almacen, "GET", f"/empleados/{2 ** 64}")[0] == 404
+    assert pedir(almacen, "GET", "/empleados", consulta={"desde": str(2 ** 64)})[0] == 400
+    assert pedir(almacen, "DELETE", "/empleados/1", consulta={"version": str(2 ** 64)})[0] == 400
+    assert pedir(almacen, "DELETE", "/empleados/1", cabeceras={"if-match": '"true"'})[0] == 400
+
+
+def test_version_optimista(almacen):
+    _, emp = pedir(almacen, "POST", "/empleados", EMPLEADO)
+    ruta = f"/empleados/{emp['id']}"
+    assert pedir(almacen, "PUT", ruta, {"edad": 31})[0] == 428
+    estado, nuevo = pedir(almacen, "PUT", ruta, {"edad": 31, "version": 1})
+    assert estado == 200 and nuevo["version"] == 2
+    estado, datos = pedir(almacen, "PUT", ruta, {"edad": 32, "version": 1})
+    assert estado == 409 and datos["version"] == 2
+    assert pedir(almacen, "DELETE", ruta, consulta={"version": "1"})[0] == 409
+    assert pedir(almacen, "DELETE", ruta, cabeceras={"if-match": '"2"'}) == (204, None)
+    assert pedir(almacen, "GET", ruta)[0] == 404
+
+
+def test_rutas_y_metodos(almacen):
+    assert pedir(almacen, "GET", "/nada")[0] == 404
+    assert pedir(almacen, "GET", "/informes/nada")[0] == 404
+    assert pedir(almacen, "POST", "/informes/edades")[0] == 405
+    assert pedir(almacen, "PATCH", "/empleados")[0] == 405
+    assert pedir(almacen, "POST", "/empleados", {"nombre": "Ana"})[0] == 400
+
+
+def peticion_cruda(servicio, datos):
+    async def enviar():
+        servidor = await servicio.iniciar(puerto=0)
+        puerto = servidor.sockets[0].getsockname()[1]
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        escritor.write(datos)
+        await escritor.drain()
+        respuesta = await asyncio.wait_for(lector.read(), 5)
+        escritor.close()
+        servidor.close()
+        await servidor.wait_closed()
+        return respuesta
+    return asyncio.run(enviar())
+
+
+@pytest.mark.parametrize("largo", ["abc", "-5"])
+def test_content_length_no_valido_es_400(tmp_path, largo):
+    servicio = ServicioApi(str(tmp_path / "gestor.db"), trabajadores=1)
+    try:
+        respuesta = peticion_cruda(servicio, (
+            f"POST /empleados HTTP/1.1\r\nContent-Length: {largo}\r\n\r\n{{}}").encode("latin-1"))
+    finally:
+        servicio.cerrar()
+    assert respuesta.startswith(b"HTTP/1.1 400 ")
+    assert "Content-Length".encode() in respuesta.split(b"\r\n\r\n", 1)[1]
+
+
+def test_los_post_sin_id_usan_el_asignador_y_no_repiten_borrados(almacen):
+    ids = asignadores(almacen)
+    primero = pedir(almacen, "POST", "/empleados", EMPLEADO, ids=ids)[1]
+    segundo = pedir(almacen, "POST", "/empleados", {**EMPLEADO, "correo": "b@empresa.com"}, ids=ids)[1]
+    assert (primero["id"], segundo["id"]) == (INICIO, INICIO + 1)
+    assert pedir(almacen, "DELETE", f"/empleados/{segundo['id']}", consulta={"version": "1"})[0] == 204
+    # Otra sesión (asignadores nuevos) continúa desde la marca de la base de datos
+    tercero = pedir(almacen, "POST", "/empleados", EMPLEADO)[1]
+    assert tercero["id"] == INICIO + 2
+    # Un id explícito mueve el cursor del asignador
+    assert pedir(almacen, "POST", "/empleados", {**EMPLEADO, "id": 5000}, ids=ids)[0] == 201
+    assert pedir(almacen, "POST", "/empleados", EMPLEADO, ids=ids)[1]["id"] == 5001
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from validacion import ESQUEMA_EMPLEADO, ESQUEMA_DEPARTAMENTO, resumen_errores
+
+
+def empleados(**columnas):
+    n = len(next(iter(columnas.values())))
+    datos = {"id": [str(i + 1) for i in range(n)], "nombre": ["Ana"] * n, "apellidos": ["Pérez"] * n,
+             "edad": ["30"] * n, "correo": ["ana@empresa.com"] * n, "departamento": ["IT"] * n}
+    datos.update(columnas)
+    return pd.DataFrame(datos, dtype=str)
+
+
+def errores_de(validacion):
+    return set(zip(validacion.errores["fila"], validacion.errores["campo"], validacion.errores["error"]))
+
+
+def test_filas_correctas_con_sus_tipos():
+    v = ESQUEMA_EMPLEADO.validar(empleados(edad=["30", " 41 "]))
+    assert v.descartadas == 0 and v.errores.empty
+    assert v.validos["edad"].tolist() == [30, 41]
+    assert str(v.validos["id"].dtype) == "int64"
+
+
+@pytest.mark.parametrize("id_malo", ["99999999999999999999", "-99999999999999999999"])
+def test_id_que_no_cabe_en_int64_es_un_error_de_fila(id_malo):
+    # Solo ese id malo, y con otra fila no numérica (camino lento de conversión)
+    for ids in ([id_malo, "2"], [id_malo, "x"]):
+        v = ESQUEMA_EMPLEADO.validar(empleados(id=ids))
+        assert (0, "id", "no es un número entero") in errores_de(v)
+        assert 0 not in v.validos.index
+        assert (v.validos["id"] > 0).all()
+
+
+@pytest.mark.parametrize("edad", ["1e1", "3.0", "2,5", "diez", ""])
+def test_edad_que_no_es_un_entero_escrito_se_rechaza(edad):
+    v = ESQUEMA_EMPLEADO.validar(empleados(edad=[edad, "x"]))
+    assert (0, "edad", "no es un número entero") in errores_de(v)
+    assert v.validos.empty
+
+
+def test_columna_float_fuera_de_rango_no_se_guarda_como_otro_numero():
+    df = empleados(id=["1", "2", "3"]).assign(id=[1e20, 2.0, 2.5])
+    v = ESQUEMA_EMPLEADO.validar(df)
+    assert (0, "id", "está fuera de rango") in errores_de(v)
+    assert (2, "id", "no es un número entero") in errores_de(v)
+    assert v.validos["id"].tolist() == [2]
+
+
+def test_reglas_de_rango_formato_y_unico():
+    v = ESQUEMA_EMPLEADO.validar(empleados(id=["1", "1", "3", "4"], edad=["0", "30", "121", "30"],
+                                           correo=["a@b.es", "a@b.es", "a@b.es", "sin-arroba"]))
+    assert errores_de(v) == {(0, "edad", "es menor que 1"), (1, "id", "está repetido"),
+                             (2, "edad", "es mayor que 120"), (3, "correo", "no es un correo válido")}
+    assert v.validos.empty and v.descartadas == 4
+
+
+def test_departamento_desconocido_solo_avisa():
+    v = ESQUEMA_EMPLEADO.validar(empleados(departamento=["IT", "Compras"]), departamentos={"it"})
+    assert v.errores["descartada"].tolist() == [False]
+    assert len(v.validos) == 2
+    assert "departamento no está en departamentos: 1" in resumen_errores(v.errores)
+
+
+def test_conjunto_de_nombres_normalizados():
+    df = pd.DataFrame({"id": ["1", "2"], "nombre": ["  Recursos   Humanos", "IT"], "empleados_necesarios": ["3", "1"],
+                       "presupuesto": ["10,5", "3"], "horas_disponibles": ["1", "2"]}, dtype=str)
+    v = ESQUEMA_DEPARTAMENTO.validar(df)
+    assert v.validos["presupuesto"].tolist() == [10.5, 3.0]
+    assert ESQUEMA_DEPARTAMENTO.conjunto(v.validos) == {"recursos humanos", "it"}
+
+
+@pytest.mark.parametrize("presupuesto, horas", [("inf", "10"), ("10", "1e400"), ("-inf", "10"), ("Infinity", "1")])
+def test_decimales_infinitos_se_rechazan(presupuesto, horas):
+    df = pd.DataFrame({"id": ["1", "2"], "nombre": ["IT", "Ventas"], "empleados_necesarios": ["1", "1"],
+                       "presupuesto": [presupuesto, "5"], "horas_disponibles": [horas, "5"]}, dtype=str)
+    v = ESQUEMA_DEPARTAMENTO.validar(df)
+    assert v.validos["id"].tolist() == [2]
+    assert (0, "no es un número finito") in {(f, e) for f, _, e in errores_de(v)}
+
+
+def test_enteros_grandes_en_el_limite_de_int64():
+    ids = ["9223372036854775807", "9223372036854775808", "-9223372036854775809", "00009223372036854775807", "x"]
+    v = ESQUEMA_EMPLEADO.validar(empleados(id=ids))
+    assert v.validos["id"].tolist() == [9223372036854775807]
+    assert {f for f, c, _ in errores_de(v) if c == "id"} == {1, 2, 3, 4}
+
+
+def test_vistos_recuerda_los_unicos_entre_llamadas():
+    vistos = {}
+    ESQUEMA_EMPLEADO.validar(empleados(id=["1", "2", "x"]), vistos)
+    assert vistos == {"id": {1, 2}}
+    v = ESQUEMA_EMPLEADO.validar(empleados(id=["3", "2", "x"]), vistos)
+    assert v.validos["id"].tolist() == [3]
+    assert errores_de(v) == {(1, "id", "está repetido"), (2, "id", "no es un número entero")}
+    assert vistos == {"id": {1, 2, 3}}
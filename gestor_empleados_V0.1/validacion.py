@@ -0,0 +1,288 @@
+# ==========================================================
+# Validación por columnas de empleados y departamentos
+# ==========================================================
+# Empleado.es_valido() y Departamento.es_valido() comprueban un objeto
+# cada vez (los formularios). Para los CSV se usa un esquema declarativo:
+# cada Campo dice su tipo y sus reglas (obligatorio, rango, formato de
+# correo, pertenencia a un conjunto, único) y el Esquema las convierte en
+# comprobaciones sobre columnas enteras de un DataFrame. Validar un millón
+# de filas es una pasada por columna, no un millón de llamadas.
+#
+# validar() devuelve las filas válidas ya con sus tipos y un informe de
+# errores con una fila por problema encontrado:
+#
+#   fila   campo         valor      error                         descartada
+#   17     edad          "abc"      no es un número entero        True
+#   17     correo        "x@"       no es un correo válido        True
+#   40     departamento  "Compras"  no está en departamentos      False
+#
+# Un departamento que no existe solo se avisa (descartada=False): la
+# aplicación deja borrar departamentos con empleados y escribir uno nuevo
+# en el formulario, así que esas filas son datos legítimos.
+#
+# pandas se importa al validar, no al importar el módulo.
+import math
+import re
+
+PATRON_CORREO = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+TIPOS = {"entero": "int64", "decimal": "float64", "texto": str}
+COLUMNAS_INFORME = ["fila", "campo", "valor", "error", "descartada"]
+MIN_INT64, MAX_INT64 = -2 ** 63, 2 ** 63 - 1
+
+
+def normalizar_texto(serie):
+    """Como registro_departamentos.normalizar_nombre, para una columna entera."""
+    return serie.str.split().str.join(" ").str.casefold()
+
+
+def fuera_de(serie, valores):
+    """Máscara de las filas cuyo texto normalizado no está en 'valores'."""
+    import numpy as np
+    import pandas as pd
+    # Hay pocos valores distintos (departamentos): se normalizan solo esos
+    codigos, unicos = pd.factorize(serie)
+    dentro = np.append(normalizar_texto(pd.Series(unicos, dtype=object)).isin(valores).to_numpy(), True)
+    return pd.Series(~dentro[codigos], index=serie.index)
+
+
+def enteros_de(texto):
+    """
+    Columna Int64 de una columna de textos, con <NA> en los que no son un
+    número entero escrito como tal ("3.0" y "1e1" no lo son) o no caben en int64.
+    """
+    import numpy as np
+    import pandas as pd
+    # Casi todos son cifras sin signo; la expresión regular solo se pasa por el resto
+    forma = (texto.str.isascii() & texto.str.isdigit()).fillna(False).astype(bool)
+    resto = ~forma
+    if resto.any():
+        forma[resto] = texto[resto].str.fullmatch(r"[+-]\d+").fillna(False).astype(bool)
+    # Lo que no cabe en int64 se ve en el texto: más de 19 cifras, o 19 y mayor que el límite
+    grandes = forma & (texto.str.len() >= 19)
+    if grandes.any():
+        cifras = texto[grandes].str.lstrip("+-").str.lstrip("0")
+        limite = np.where(texto[grandes].str.startswith("-"), str(-MIN_INT64), str(MAX_INT64))
+        forma[grandes] = (cifras.str.len() < 19) | ((cifras.str.len() == 19) & (cifras <= limite))
+    # Los que no valen se cambian por "0" y el resto se convierte de golpe, sin pasar por float
+    return texto.where(forma, "0").astype("int64").astype("Int64").where(forma, pd.NA)
+
+
+class Campo:
+    """Una columna del esquema y sus reglas."""
+
+    def __init__(self, nombre, tipo, obligatorio=True, minimo=None, maximo=None,
+                 formato=None, en=None, en_estricto=False, unico=False):
+        """
+        tipo: "entero", "decimal" o "texto"
+        formato: expresión regular que tiene que cumplir el texto entero
+        en: nombre del conjunto de valores permitidos (se pasa a validar())
+        en_estricto: si un valor fuera del conjunto descarta la fila o solo se avisa
+        unico: no puede haber dos filas con el mismo valor
+        """
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo desconocido para {nombre}: {tipo}")
+        self.nombre = nombre
+        self.tipo = tipo
+        self.obligatorio = obligatorio
+        self.minimo = minimo
+        self.maximo = maximo
+        self.formato = formato
+        self.en = en
+        self.en_estricto = en_estricto
+        self.unico = unico
+
+    def convertir(self, serie):
+        """Columna con su tipo: números con NaN si no se pueden leer, textos sin espacios sobrantes."""
+        import pandas as pd
+        if self.tipo == "texto":
+            return serie.astype(str).str.strip()
+        if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            return serie  # las reglas de entero y de rango se comprueban fila a fila
+        # Solo se leen textos: un float dentro de una columna object no se trunca al pasarlo a int64
+        texto = serie if pd.api.types.is_string_dtype(serie) else serie.astype(str)
+        # Lo normal es que todos los valores sean números bien escritos: de golpe
+        try:
+            return texto.astype("int64" if self.tipo == "entero" else "float64")
+        except (ValueError, TypeError, OverflowError):
+            pass
+        texto = texto.astype(str).str.strip()
+        if self.tipo == "entero":
+            return enteros_de(texto)
+        # Si no, uno a uno, con NaN en los que no se pueden leer; se acepta la coma decimal ("12,5")
+        return pd.to_numeric(texto.str.replace(",", ".", regex=False), errors="coerce")
+
+    def comprobaciones(self):
+        """
+        Lista de (mensaje, función, descarta) de este campo. Cada función
+        recibe la columna convertida y los conjuntos, y devuelve la máscara
+        de filas que fallan (o None si la regla no se puede aplicar).
+        """
+        reglas = []
+        if self.tipo == "texto":
+            if self.obligatorio:
+                reglas.append(("está vacío", lambda v, c: v == "", True))
+            if self.formato is not None:
+                patron = re.compile(self.formato)
+                reglas.append((self.mensaje_formato(), lambda v, c: (v != "") & ~v.str.fullmatch(patron), True))
+            if self.en is not None:
+                conjunto = self.en
+                reglas.append((f"no está en {conjunto}",
+                               lambda v, c: None if c.get(conjunto) is None
+                               else (v != "") & fuera_de(v, c[conjunto]),
+                               self.en_estricto))
+        else:
+            tipo = "un número entero" if self.tipo == "entero" else "un número"
+            reglas.append((f"no es {tipo}", lambda v, c: v.isna(), True))
+            if self.tipo == "entero":
+                # NaN % 1 es NaN y NaN != 0 es True: se excluye, ya lo cuenta la regla anterior
+                reglas.append((f"no es {tipo}", lambda v, c: v.notna() & (v % 1 != 0), True))
+                # Una columna que ya llega como float puede traer valores que no caben en int64
+                # (las enteras ya caben; compararlas con un float redondearía MAX_INT64 a 2**63)
+                reglas.append(("está fuera de rango",
+                               lambda v, c: v.notna() & ((v < MIN_INT64) | (v >= 2.0 ** 63))
+                               if v.dtype.kind == "f" else None, True))
+            else:
+                # "inf" y "1e400" se leen como infinito: no sirven como presupuesto ni como horas
+                reglas.append(("no es un número finito", lambda v, c: v.abs() == math.inf, True))
+            # Las comparaciones con NaN son False: cada fila se cuenta una sola vez
+            if self.minimo is not None:
+                minimo = self.minimo
+                reglas.append((f"es menor que {minimo}", lambda v, c: v < minimo, True))
+            if self.maximo is not None:
+                maximo = self.maximo
+                reglas.append((f"es mayor que {maximo}", lambda v, c: v > maximo, True))
+        if self.unico:
+            reglas.append(("está repetido", lambda v, c: v.duplicated(keep="first") & v.notna(), True))
+        return reglas
+
+    def mensaje_formato(self):
+        return "no es un correo válido" if self.formato == PATRON_CORREO else "no tiene el formato esperado"
+
+
+class Validacion:
+    """Resultado de Esquema.validar()."""
+
+    def __init__(self, validos, errores, total):
+        self.validos = validos    # DataFrame con las filas no descartadas, ya con sus tipos
+        self.errores = errores    # DataFrame con COLUMNAS_INFORME, una fila por error o aviso
+        self.total = total
+
+    @property
+    def descartadas(self):
+        return self.total - len(self.validos)
+
+    def __repr__(self):
+        return f"Validacion({len(self.validos)} válidas, {self.descartadas} descartadas)"
+
+
+class Esquema:
+    """Campos de una entidad, compilados a comprobaciones por columnas."""
+
+    def __init__(self, entidad, campos, clave_conjunto=None):
+        """
+        entidad: nombre del esquema; también el del conjunto que forman sus
+        valores de 'clave_conjunto' (otro esquema puede pedir en=entidad).
+        """
+        self.entidad = entidad
+        self.campos = list(campos)
+        self.clave_conjunto = clave_conjunto
+        self.columnas = {campo.nombre: TIPOS[campo.tipo] for campo in self.campos}
+        self._comprobaciones = [(campo, *regla) for campo in self.campos for regla in campo.comprobaciones()]
+
+    def conjunto(self, df):
+        """Valores normalizados de clave_conjunto en df (para el 'en' de otro esquema)."""
+        return set(normalizar_texto(df[self.clave_conjunto].astype(str)).tolist())
+
+    def validar(self, df, vistos=None, **conjuntos):
+        """
+        Valida todas las filas de df de una vez.
+        vistos: {campo: set} con los valores de los campos únicos que ya
+        entraron (en bloques anteriores del mismo fichero). Las filas con uno
+        de esos valores también están repetidas; los de las filas válidas de
+        df se añaden a los sets.
+        conjuntos: {nombre: set de valores normalizados} para las reglas 'en';
+        si falta uno, esa regla no se comprueba.
+        """
+        import numpy as np
+        import pandas as pd
+
+        convertidas = {campo.nombre: campo.convertir(df[campo.nombre]) for campo in self.campos}
+        validas = pd.Series(True, index=df.index)
+        informe = []
+
+        def apuntar(campo, mensaje, mal, descarta):
+            informe.append(pd.DataFrame({
+                "fila": df.index[mal.to_numpy()],
+                "campo": campo.nombre,
+                "valor": df[campo.nombre][mal].astype(str).to_numpy(),
+                "error": mensaje,
+                "descartada": descarta,
+            }))
+
+        for campo, mensaje, funcion, descarta in self._comprobaciones:
+            mal = funcion(convertidas[campo.nombre], conjuntos)
+            if mal is None:
+                continue
+            mal = mal.fillna(False).astype(bool)  # <NA> de las columnas Int64: ya lo cuenta "no es un número entero"
+            if not mal.any():
+                continue
+            if descarta:
+                validas &= ~mal
+            apuntar(campo, mensaje, mal, descarta)
+
+        if vistos is not None:
+            for campo in self.campos:
+                if not campo.unico:
+                    continue
+                valores = convertidas[campo.nombre]
+                ya = vistos.setdefault(campo.nombre, set())
+                # Se mira fila a fila en el set: convertirlo entero en cada bloque costaría más
+                mal = pd.Series(np.fromiter(map(ya.__contains__, valores.tolist()), bool, len(valores)),
+                                index=df.index) & valores.notna()
+                if mal.any():
+                    validas &= ~mal
+                    apuntar(campo, "está repetido", mal, True)
+                ya.update(valores[validas].tolist())
+
+        errores = pd.concat(informe, ignore_index=True).sort_values("fila", kind="stable") \
+            if informe else pd.DataFrame(columns=COLUMNAS_INFORME)
+        validos = pd.DataFrame({nombre: columna[validas] for nombre, columna in convertidas.items()})
+        validos = validos.astype(self.columnas)
+        return Validacion(validos, errores.reset_index(drop=True), len(df))
+
+
+def resumen_errores(errores, ejemplos=5, fila="fila"):
+    """
+    Texto con cuántos errores hay de cada tipo y las primeras filas.
+    fila: columna que identifica la fila en los ejemplos ("fila" o "linea").
+    """
+    if errores is None or errores.empty:
+        return "Sin errores."
+    descartadas = errores.loc[errores["descartada"], "fila"].nunique()
+    lineas = [f"{len(errores)} errores en {errores['fila'].nunique()} filas ({descartadas} descartadas):"]
+    for (campo, error), n in errores.groupby(["campo", "error"], sort=False).size().items():
+        lineas.append(f"  {campo} {error}: {n}")
+    for error in errores.head(ejemplos).to_dict("records"):
+        lineas.append(f"  {fila} {error[fila]}: {error['campo']} = {error['valor']!r} {error['error']}")
+    return "\n".join(lineas)
+
+
+# ==========================================================
+# Esquemas
+# ==========================================================
+ESQUEMA_DEPARTAMENTO = Esquema("departamentos", [
+    Campo("id", "entero", minimo=1, unico=True),
+    Campo("nombre", "texto", unico=True),
+    Campo("empleados_necesarios", "entero", minimo=0),
+    Campo("presupuesto", "decimal", minimo=0),
+    Campo("horas_disponibles", "decimal", minimo=0),
+], clave_conjunto="nombre")
+
+ESQUEMA_EMPLEADO = Esquema("empleados", [
+    Campo("id", "entero", minimo=1, unico=True),
+    Campo("nombre", "texto"),
+    Campo("apellidos", "texto"),
+    Campo("edad", "entero", minimo=1, maximo=120),
+    Campo("correo", "texto", formato=PATRON_CORREO),
+    Campo("departamento", "texto", en="departamentos"),
+])